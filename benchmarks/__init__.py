@@ -0,0 +1 @@
+# __init__.py for the benchmarks package
@@ -0,0 +1,43 @@
+"""
+Measure bulk booking throughput on one core.
+
+Run with: python -m benchmarks.bench_bulk --bookings 1000000
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from models.availability_rule import AvailabilityRule
+from models.calendar_owner import CalendarOwner
+from utils.utils import WEEKDAYS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CalendarOwner.bulk_book throughput.")
+    parser.add_argument("--bookings", type=int, default=1000000)
+    parser.add_argument("--owners", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    times = [f"{hour % 12 or 12}:{minute:02d} {'AM' if hour < 12 else 'PM'}" for hour in range(24) for minute in (0, 30)]
+    requests = {}
+    for _ in range(args.bookings):
+        day = (date(2020, 1, 1) + timedelta(days=rng.randrange(3650))).isoformat()
+        start = rng.randrange(16, 34)  # Half hours from 8 AM to 5 PM
+        requests.setdefault(str(rng.randrange(args.owners)), []).append(
+            (f"Invitee {rng.randrange(10000)}", day, times[start], times[start + 1]))
+    owners = {owner_id: CalendarOwner(f"Owner {owner_id}", AvailabilityRule(8, 18, set(WEEKDAYS)), owner_id)
+              for owner_id in requests}
+
+    start = time.perf_counter()
+    results = [result for owner_id, batch in requests.items() for result in owners[owner_id].bulk_book(batch)]
+    elapsed = time.perf_counter() - start
+
+    booked = sum(result.status == "booked" for result in results)
+    print(f"{args.bookings:,} requests ({booked:,} booked) in {elapsed:.2f} s: "
+          f"{args.bookings / elapsed:,.0f} requests/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Measure the memory used per million appointments.
+
+Run with: python -m benchmarks.bench_memory --appointments 1000000
+"""
+import argparse
+import random
+import tracemalloc
+from datetime import date, timedelta
+
+from models.appointment import Appointment
+from models.appointment_store import AppointmentColumns
+
+
+def measure(label: str, build, count: int):
+    """Print the memory retained by build() in MB per million appointments."""
+    tracemalloc.start()
+    result = build()
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{label:<40} {used / count * 1e6 / 2 ** 20:>10,.1f} MB per 1M appointments")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure appointment memory use.")
+    parser.add_argument("--appointments", type=int, default=1000000)
+    args = parser.parse_args()
+
+    def rows():
+        """Yield parse-like inputs: every row brings its own name and date string, as an import would."""
+        rng = random.Random(0)
+        for _ in range(args.appointments):
+            day = (date(2024, 1, 1) + timedelta(days=rng.randrange(730))).isoformat()
+            yield f"Invitee {rng.randrange(10000)}", day, rng.randrange(9, 17)
+
+    # Strings are created inside the measurement, so whatever an appointment keeps alive is counted
+    appointments = measure("Appointment objects",
+                           lambda: [Appointment(name, day, hour, hour + 1) for name, day, hour in rows()],
+                           args.appointments)
+    measure("AppointmentColumns (array columns)", lambda: AppointmentColumns(appointments), args.appointments)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Measure how booking and search throughput scale with the number of shard processes.
+
+Run with: python -m benchmarks.bench_sharding --shards 1,2,4,8 --requests 200000
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from models.availability_rule import AvailabilityRule
+from models.calendar_owner import CalendarOwner
+from services.sharding import ShardedScheduler
+from utils.utils import WEEKDAYS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure ShardedScheduler throughput by shard count.")
+    parser.add_argument("--shards", default="1,2,4", help="Comma-separated shard counts to compare")
+    parser.add_argument("--requests", type=int, default=100000)
+    parser.add_argument("--owners", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=5000, help="Requests sent per scatter")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    times = [f"{hour % 12 or 12}:{minute:02d} {'AM' if hour < 12 else 'PM'}" for hour in range(24) for minute in (0, 30)]
+    owner_ids = [f"owner-{n}" for n in range(args.owners)]
+    bookings = []
+    for _ in range(args.requests):
+        day = (date(2030, 1, 1) + timedelta(days=rng.randrange(3650))).isoformat()
+        start = rng.randrange(16, 34)  # Half hours from 8 AM to 5 PM
+        bookings.append((rng.choice(owner_ids), f"Invitee {rng.randrange(10000)}", day, times[start], times[start + 1]))
+    searches = [(rng.choice(owner_ids), date(2030, 1, 1) + timedelta(days=rng.randrange(3650)), 7, 60)
+                for _ in range(args.requests // 10)]
+
+    baseline = None
+    for shards in (int(n) for n in args.shards.split(",")):
+        with ShardedScheduler(shards) as scheduler:
+            for owner_id in owner_ids:
+                scheduler.add_calendar_owner(
+                    CalendarOwner(owner_id, AvailabilityRule(8, 18, set(WEEKDAYS)), owner_id))
+            book_rate = _rate(scheduler.book_many, bookings, args.batch)
+            search_rate = _rate(scheduler.search_many, searches, args.batch)
+        baseline = baseline or book_rate
+        print(f"{shards:>3} shards: {book_rate:>10,.0f} bookings/s ({book_rate / baseline:.2f}x), "
+              f"{search_rate:>8,.0f} searches/s")
+
+
+def _rate(operation, requests, batch: int) -> float:
+    """Run requests through operation in batches and return requests per second."""
+    start = time.perf_counter()
+    for offset in range(0, len(requests), batch):
+        operation(requests[offset:offset + batch])
+    return len(requests) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
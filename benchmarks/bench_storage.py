@@ -0,0 +1,91 @@
+"""
+Compare the in-memory store with the SQLite backend on a large synthetic calendar set.
+
+Run with: python -m benchmarks.bench_storage --appointments 1000000 --owners 1000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from database.sqlite_database import SQLiteDatabase
+from models.appointment import Appointment
+from models.availability_rule import AvailabilityRule
+from models.calendar_owner import CalendarOwner
+from services.free_busy import FreeBusyEngine
+
+
+def generate(owners: int, appointments: int, seed: int = 0):
+    """Yield (owner_id, Appointment) pairs: one-hour bookings on distinct weekday hours from 2024 on."""
+    rng = random.Random(seed)
+    per_owner = appointments // owners
+    first_day = date(2024, 1, 1)
+    for owner in range(owners):
+        taken = set()
+        while len(taken) < per_owner:
+            taken.add((rng.randrange(730), rng.randrange(9, 17)))  # Two years of days, 9 AM - 5 PM
+        for day, hour in sorted(taken):
+            yield str(owner), Appointment(f"Invitee {rng.randrange(10000)}",
+                                          (first_day + timedelta(days=day)).isoformat(), hour, hour + 1)
+
+
+def timed(label: str, operations, count: int):
+    """Run every operation and print the mean wall time per operation in microseconds."""
+    start = time.perf_counter()
+    for operation in operations:
+        operation()
+    print(f"{label:<32} {(time.perf_counter() - start) / count * 1e6:>12,.2f} us/op")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark in-memory vs SQLite storage.")
+    parser.add_argument("--appointments", type=int, default=1000000)
+    parser.add_argument("--owners", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    owners = {str(n): CalendarOwner(f"Owner {n}", AvailabilityRule(9, 17, {"Monday", "Tuesday", "Wednesday",
+                                                                          "Thursday", "Friday", "Saturday",
+                                                                          "Sunday"}), str(n))
+              for n in range(args.owners)}
+    data = list(generate(args.owners, args.appointments))
+    rng = random.Random(1)
+    probes = [(str(rng.randrange(args.owners)), (date(2024, 1, 1) + timedelta(days=rng.randrange(730))).isoformat(),
+               rng.randrange(9, 17) * 60) for _ in range(args.queries)]
+    engine = FreeBusyEngine()
+    week = (date(2024, 6, 3), date(2024, 6, 9))
+
+    with tempfile.TemporaryDirectory() as directory:
+        db = SQLiteDatabase(os.path.join(directory, "bench.db"))
+        for owner_id, owner in owners.items():
+            db.add_calendar_owner(owner_id, CalendarOwner(owner.name, owner.availability_rule, owner_id))
+        print(f"{len(data):,} appointments across {args.owners:,} owners")
+
+        start = time.perf_counter()
+        for owner_id, appointment in data:
+            owners[owner_id].calendar.try_book(appointment)
+        print(f"{'in-memory load':<32} {time.perf_counter() - start:>12,.2f} s")
+
+        start = time.perf_counter()
+        by_owner = {}
+        for owner_id, appointment in data:
+            by_owner.setdefault(owner_id, []).append(appointment)
+        for owner_id, appointments in by_owner.items():
+            db.bulk_insert_appointments(owner_id, appointments)
+        print(f"{'sqlite bulk load':<32} {time.perf_counter() - start:>12,.2f} s")
+
+        searches = probes[:200]
+        timed("in-memory conflict check", [lambda o=o, d=d, m=m: owners[o].calendar.overlaps(d, m, m + 60)
+                                           for o, d, m in probes], len(probes))
+        timed("sqlite conflict check", [lambda o=o, d=d, m=m: db.overlaps(o, d, m, m + 60)
+                                        for o, d, m in probes], len(probes))
+        timed("in-memory week slot search", [lambda o=o: engine.find_slots(owners[o], *week)
+                                             for o, _, _ in searches], len(searches))
+        timed("sqlite week slot search", [lambda o=o: db.find_slots(o, *week) for o, _, _ in searches], len(searches))
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
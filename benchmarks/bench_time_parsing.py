@@ -0,0 +1,43 @@
+"""
+Compare time parsing against the previous datetime.strptime implementation.
+
+Run with: python -m benchmarks.bench_time_parsing --calls 200000
+"""
+import argparse
+import timeit
+from datetime import datetime
+
+from utils.utils import _parse_time, convert_to_24_hour, convert_to_minutes
+
+TIMES = ("9 AM", "10 AM", "11 AM", "12 PM", "1 PM", "2 PM", "3 PM", "4 PM", "5 PM", "9", "14", "17")
+
+
+def strptime_hour(time_str: str) -> int:
+    """The previous convert_to_24_hour, kept here as the baseline."""
+    if 'AM' in time_str or 'PM' in time_str:
+        return datetime.strptime(time_str, '%I %p').hour
+    return datetime.strptime(time_str, '%H').hour
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure time parsing speed.")
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+
+    rounds = max(1, args.calls // len(TIMES))
+    calls = rounds * len(TIMES)
+    cases = [
+        ("datetime.strptime (before)", strptime_hour),
+        ("hand-written parser, uncached", _parse_time),
+        ("convert_to_minutes (cached)", convert_to_minutes),
+        ("convert_to_24_hour (cached)", convert_to_24_hour),
+    ]
+    baseline = None
+    for label, parse in cases:
+        elapsed = timeit.timeit(lambda: [parse(t) for t in TIMES], number=rounds)
+        baseline = baseline or elapsed
+        print(f"{label:<32} {elapsed / calls * 1e9:>8,.0f} ns/call {baseline / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
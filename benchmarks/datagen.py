@@ -0,0 +1,87 @@
+"""
+Synthetic owners, invitees and appointments for the benchmarks.
+
+Data is drawn from a seeded random generator, so the same arguments always build the same data
+relative to the start date. The distributions loosely follow real calendars:
+- Owners work weekdays with staggered hours, and a few also work weekends.
+- A few popular owners get most of the invitees and bookings (Pareto-distributed weights).
+- Meetings are mostly 30 or 60 minutes, and cluster in the late morning and early afternoon.
+"""
+from collections import namedtuple
+from datetime import date, timedelta
+import random
+
+from models.availability_rule import AvailabilityRule
+from models.calendar_owner import CalendarOwner
+from models.invitee import Invitee
+from utils.utils import WEEKDAYS, format_minutes
+
+Dataset = namedtuple("Dataset", ["owners", "invitees", "booked", "start_date", "days"])
+
+_DURATIONS = (15, 30, 45, 60, 90, 120)  # Meeting lengths in minutes
+_DURATION_WEIGHTS = (5, 35, 5, 40, 10, 5)
+
+
+def generate_dataset(owners: int, invitees: int, appointments: int, days: int = 28, start_date: date = None,
+                     seed: int = 0, id_prefix: str = "") -> Dataset:
+    """
+    Build owners with availability rules, invitees linked to them, and bookings.
+
+    Args:
+        owners (int): Number of CalendarOwners (N).
+        invitees (int): Number of Invitees (M).
+        appointments (int): Number of booking attempts (K). Attempts that clash are dropped.
+        days (int): Bookings fall on this many days from start_date, default is 28.
+        start_date (datetime.date): First day with bookings, defaults to today so slot searches see them.
+        seed (int): Seed for the random generator, default is 0.
+        id_prefix (str): Prepended to owner IDs, so datasets can share one database.
+
+    Returns:
+        Dataset: (owners, invitees, booked, start_date, days), where booked counts the appointments that fit.
+    """
+    rng = random.Random(seed)
+    start_date = start_date or date.today()
+
+    calendar_owners = []
+    for number in range(owners):
+        start_hour = rng.choice((7, 8, 8, 9, 9, 9, 10))
+        end_hour = start_hour + rng.choice((7, 8, 8, 9))
+        working_days = set(WEEKDAYS[:5] if rng.random() < 0.9 else WEEKDAYS)
+        calendar_owners.append(CalendarOwner(f"Owner {number}", AvailabilityRule(start_hour, end_hour, working_days),
+                                             f"{id_prefix}{number}"))
+    popularity = [rng.paretovariate(1.2) for _ in calendar_owners]
+
+    linked = [rng.choices(calendar_owners, popularity)[0] for _ in range(invitees)]
+    people = [Invitee(f"Invitee {number}", owner) for number, owner in enumerate(linked)]
+    for invitee in people:
+        invitee.calendar_owner.invitees.append(invitee)  # Same as add_invitee, without logging each one
+
+    requests = {}
+    for owner in rng.choices(calendar_owners, popularity, k=appointments):
+        rule = owner.availability_rule
+        duration = rng.choices(_DURATIONS, _DURATION_WEIGHTS)[0]
+        latest = rule.end_hour * 60 - duration
+        middle = (rule.start_hour * 60 + latest) // 2
+        start = int(rng.triangular(rule.start_hour * 60, latest, middle)) // 15 * 15
+        day = (start_date + timedelta(days=rng.randrange(days))).isoformat()
+        invitee = rng.choice(owner.invitees).name if owner.invitees else f"Guest {rng.randrange(invitees or 1)}"
+        requests.setdefault(owner.id, []).append((invitee, day, start, start + duration))
+
+    by_id = {owner.id: owner for owner in calendar_owners}
+    booked = sum(result.status == "booked"
+                 for owner_id, batch in requests.items() for result in by_id[owner_id].bulk_book(batch))
+    return Dataset(calendar_owners, people, booked, start_date, days)
+
+
+def random_booking(rng: random.Random, dataset: Dataset):
+    """
+    Pick a random invitee and a plausible booking request for it.
+
+    Returns:
+        tuple: (invitee, date, start_time, end_time, day) as accepted by Invitee.book_slot.
+    """
+    invitee = rng.choice(dataset.invitees)
+    rule = invitee.calendar_owner.availability_rule
+    start = rng.randrange(rule.start_hour * 4, rule.end_hour * 4 - 3) * 15
+    day = dataset.start_date + timedelta(days=rng.randrange(dataset.days))
+    return invitee, day.isoformat(), format_minutes(start), format_minutes(start + 60), WEEKDAYS[day.weekday()]
@@ -0,0 +1,153 @@
+"""
+Benchmark the scheduling hot paths at several scales, with a regression guard.
+
+Run with: python -m benchmarks.suite --scales small,medium --output results.json
+Compare against a stored run with: --baseline baseline.json --threshold 0.25
+The exit status is 1 when any scenario's median got slower than the baseline by more than the threshold.
+"""
+import argparse
+from datetime import timedelta
+import json
+import platform
+import random
+import sys
+import time
+
+from benchmarks.datagen import generate_dataset, random_booking
+from database.in_memory_database import InMemoryDatabase
+from services.group_finder import find_common_slots
+
+SCALES = {  # Scale name -> (owners, invitees, appointments)
+    "small": (10, 100, 1000),
+    "medium": (100, 2000, 20000),
+    "large": (1000, 20000, 200000),
+}
+GROUP_SIZE = 5  # Owners per group-slot search
+
+
+def scenarios(dataset, database, rng: random.Random):
+    """
+    Build the operations to time against one dataset.
+
+    Returns:
+        dict: Scenario name -> function running one operation.
+    """
+    owners = dataset.owners
+    week = (dataset.start_date, dataset.start_date + timedelta(days=6))
+
+    def search():
+        rng.choice(dataset.invitees).search_available_slots()
+
+    def book():
+        invitee, day, start_time, end_time, weekday = random_booking(rng, dataset)
+        invitee.book_slot(day, start_time, end_time, weekday)
+
+    def list_appointments():
+        rng.choice(owners).list_appointments()
+
+    def group():
+        find_common_slots(rng.sample(owners, min(GROUP_SIZE, len(owners))), week)
+
+    def db_lookup():
+        database.get_calendar_owner(rng.choice(owners).id)
+
+    return {"search_available_slots": search, "book_slot": book, "list_appointments": list_appointments,
+            "group_slots": group, "db_lookup": db_lookup}
+
+
+def measure(operation, iterations: int) -> dict:
+    """Time each call of operation and summarize in microseconds."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        operation()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {"iterations": iterations,
+            "mean_us": sum(samples) / iterations * 1e6,
+            "p50_us": samples[iterations // 2] * 1e6,
+            "p99_us": samples[min(iterations - 1, iterations * 99 // 100)] * 1e6}
+
+
+def run_suite(scales, iterations: int = 200, seed: int = 0) -> dict:
+    """
+    Generate a dataset per scale and time every scenario on it.
+
+    Args:
+        scales (dict): Scale name -> (owners, invitees, appointments).
+        iterations (int): Timed calls per scenario, default is 200.
+        seed (int): Seed for the data and the random requests, default is 0.
+
+    Returns:
+        dict: {"environment": {...}, "results": {scale: {scenario: summary}}}, JSON-serializable.
+    """
+    database = InMemoryDatabase.get_instance()
+    results = {}
+    for name, (owners, invitees, appointments) in scales.items():
+        dataset = generate_dataset(owners, invitees, appointments, seed=seed, id_prefix=f"bench-{name}-")
+        for owner in dataset.owners:
+            database.add_calendar_owner(owner.id, owner)
+        rng = random.Random(seed)
+        results[name] = {scenario: measure(operation, iterations)
+                         for scenario, operation in scenarios(dataset, database, rng).items()}
+        results[name]["dataset"] = {"owners": owners, "invitees": invitees, "appointments": appointments,
+                                    "booked": dataset.booked}
+    return {"environment": {"python": platform.python_version(), "machine": platform.machine(),
+                            "iterations": iterations, "seed": seed},
+            "results": results}
+
+
+def find_regressions(current: dict, baseline: dict, threshold: float = 0.25, metric: str = "p50_us"):
+    """
+    Compare two run_suite results.
+
+    Args:
+        current (dict): The new results.
+        baseline (dict): The stored results to compare against.
+        threshold (float): Allowed slowdown as a fraction, default is 0.25 (25% slower).
+        metric (str): Summary field to compare, default is the median "p50_us".
+
+    Returns:
+        list: (scale, scenario, baseline value, current value) for every scenario present in both runs
+            that got slower than allowed.
+    """
+    regressions = []
+    for scale, scenario_results in current["results"].items():
+        for scenario, summary in scenario_results.items():
+            before = baseline["results"].get(scale, {}).get(scenario, {}).get(metric)
+            if before and summary.get(metric, 0) > before * (1 + threshold):
+                regressions.append((scale, scenario, before, summary[metric]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scheduling hot paths.")
+    parser.add_argument("--scales", default="small,medium", help=f"Comma separated, from {', '.join(SCALES)}.")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", help="Fail if slower than the results in this JSON file.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown, default is 0.25 (25%%).")
+    args = parser.parse_args()
+
+    current = run_suite({name: SCALES[name] for name in args.scales.split(",")}, args.iterations, args.seed)
+    for scale, scenario_results in current["results"].items():
+        print(f"{scale}: {scenario_results['dataset']}")
+        for scenario, summary in scenario_results.items():
+            if scenario != "dataset":
+                print(f"  {scenario:<24} p50 {summary['p50_us']:>10,.1f} us   p99 {summary['p99_us']:>10,.1f} us")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = find_regressions(current, json.load(f), args.threshold)
+        for scale, scenario, before, after in regressions:
+            print(f"REGRESSION {scale}/{scenario}: {before:,.1f} us -> {after:,.1f} us")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,9 @@
-from models.calendar_owner import CalendarOwner
+from bisect import bisect_left, bisect_right, insort
+import threading
+
+from services.group_finder import find_common_slots
+from utils.metrics import count, set_gauge, timed
+from utils.utils import iso_to_ordinal
 
 class InMemoryDatabase:
     """
@@ -6,12 +11,36 @@ class InMemoryDatabase:
 
     This class is designed as a singleton, meaning only one instance of it can exist throughout the application.
 
+    Besides the owners by ID, the database keeps secondary indexes of owners by name, invitees by
+    name and ID, and appointments by invitee name and by date. They are updated by observers on
+    every stored owner and its calendar, so invitees added with CalendarOwner.add_invitee and
+    bookings made on a stored owner are found without scanning every calendar. The appointment
+    indexes hold hot appointments only: months a calendar compacts into its archive leave the
+    indexes and are read back from the archives of the few owners that have one.
+
+    Thread safety: creating the singleton is guarded by a lock, and adding or fetching a single
+    CalendarOwner is atomic, so the database can be shared by request threads. Booking consistency
+    is provided per owner by Calendar.try_book, not by the database. The secondary indexes have
+    their own lock, taken after a calendar's lock when a booking is indexed.
+
     Attributes:
         _instance (InMemoryDatabase): The singleton instance of the InMemoryDatabase class.
-        _data (dict): A dictionary holding all stored data. It contains a dictionary for calendar owners.
+        _data (dict): A dictionary holding all stored data: the calendar owners and the secondary indexes.
     """
     _instance = None  # This will hold the single instance of the class
-    _data = {"calendar_owners": {}}  # Simulated in-memory data storage for calendar owners
+    _instance_lock = threading.Lock()  # Ensures concurrent first calls to get_instance create one instance
+    _index_lock = threading.Lock()  # Guards the secondary indexes in _data
+    _data = {
+        "calendar_owners": {},  # Maps an owner ID to its CalendarOwner
+        "owners_by_name": {},  # Maps an owner name to {owner ID: CalendarOwner}
+        "invitees_by_id": {},  # Maps an invitee ID to its Invitee
+        "invitees_by_name": {},  # Maps an invitee name to {invitee ID: Invitee}
+        "appointments_by_invitee": {},  # Maps an invitee name to a set of (owner ID, Appointment)
+        "appointments_by_date": {},  # Maps a date ordinal to a set of (owner ID, Appointment)
+        "appointment_dates": [],  # Sorted date ordinals with at least one appointment
+        "archived_owners": set(),  # IDs of the owners whose calendars have archived months
+    }
+    _subscriptions = {}  # Maps an owner ID to the (owner callback, calendar callback) observing it
 
     @staticmethod
     def get_instance():
@@ -22,7 +51,9 @@ class InMemoryDatabase:
             InMemoryDatabase: The singleton instance of the InMemoryDatabase.
         """
         if InMemoryDatabase._instance is None:
-            InMemoryDatabase._instance = InMemoryDatabase()  # Create the instance if it doesn't exist
+            with InMemoryDatabase._instance_lock:
+                if InMemoryDatabase._instance is None:  # Another thread may have created it while we waited
+                    InMemoryDatabase._instance = InMemoryDatabase()  # Create the instance if it doesn't exist
         return InMemoryDatabase._instance
 
     def __init__(self):
@@ -35,16 +66,26 @@ class InMemoryDatabase:
             raise Exception("This class is a singleton!")  # Raise an error if an attempt is made to instantiate again
         InMemoryDatabase._instance = self  # Set the singleton instance
 
+    @timed("db_add_calendar_owner")
     def add_calendar_owner(self, calendar_owner_id: str, calendar_owner: "CalendarOwner"):
         """
         Adds a new CalendarOwner to the in-memory database.
 
+        Replacing an owner stored under the same ID also drops the old owner from the secondary indexes.
+
         Args:
             calendar_owner_id (str): The unique identifier for the CalendarOwner.
             calendar_owner (CalendarOwner): The CalendarOwner object to add.
         """
+        previous = self._data["calendar_owners"].get(calendar_owner_id)
+        if previous is not None:
+            self._unindex_owner(calendar_owner_id, previous)
         self._data["calendar_owners"][calendar_owner_id] = calendar_owner
+        self._index_owner(calendar_owner_id, calendar_owner)
+        set_gauge("calendar_owners", len(self._data["calendar_owners"]))
+        set_gauge("calendar_appointments", len(calendar_owner.calendar.appointments), owner=calendar_owner_id)
 
+    @timed("db_get_calendar_owner")
     def get_calendar_owner(self, calendar_owner_id: str) -> "CalendarOwner":
         """
         Retrieves a CalendarOwner by its ID.
@@ -55,8 +96,11 @@ class InMemoryDatabase:
         Returns:
             CalendarOwner: The CalendarOwner associated with the provided ID, or None if not found.
         """
-        return self._data["calendar_owners"].get(calendar_owner_id)  # Returns None if not found
+        owner = self._data["calendar_owners"].get(calendar_owner_id)  # None if not found
+        count("owner_lookups_total", outcome="miss" if owner is None else "hit")
+        return owner
 
+    @timed("db_list_calendar_owners")
     def list_calendar_owners(self):
         """
         Lists all the CalendarOwners stored in the in-memory database.
@@ -64,7 +108,203 @@ class InMemoryDatabase:
         Returns:
             list: A list of CalendarOwner objects stored in the database.
         """
-        return self._data["calendar_owners"].values()  # Return all values (CalendarOwner objects)
+        return list(self._data["calendar_owners"].values())  # Snapshot, safe to iterate while owners are added
+
+    def find_calendar_owners_by_name(self, name: str):
+        """
+        Finds the CalendarOwners with a given name.
+
+        Args:
+            name (str): The exact owner name.
+
+        Returns:
+            list: The matching CalendarOwner objects, empty if there are none.
+        """
+        with self._index_lock:
+            return list(self._data["owners_by_name"].get(name, {}).values())
+
+    def get_invitee(self, invitee_id: str):
+        """
+        Retrieves an invitee of any stored CalendarOwner by its ID.
+
+        Args:
+            invitee_id (str): The unique identifier of the Invitee.
+
+        Returns:
+            Invitee: The invitee, or None if not found.
+        """
+        return self._data["invitees_by_id"].get(invitee_id)
+
+    def find_invitees_by_name(self, name: str):
+        """
+        Finds the invitees of the stored CalendarOwners with a given name.
+
+        Args:
+            name (str): The exact invitee name.
+
+        Returns:
+            list: The matching Invitee objects, empty if there are none.
+        """
+        with self._index_lock:
+            return list(self._data["invitees_by_name"].get(name, {}).values())
+
+    def list_invitee_appointments(self, invitee_name: str):
+        """
+        Lists an invitee's appointments across every stored CalendarOwner.
+
+        Args:
+            invitee_name (str): The name the appointments were booked under.
+
+        Returns:
+            list: (calendar_owner_id, Appointment) tuples in chronological order. Archived
+            appointments are read-only AppointmentView objects.
+        """
+        with self._index_lock:
+            bookings = list(self._data["appointments_by_invitee"].get(invitee_name, ()))
+        bookings.extend((owner_id, view) for owner_id, view in self._archived_bookings()
+                        if view.invitee_name == invitee_name)
+        return sorted(bookings, key=_chronological)
+
+    def list_appointments_between(self, start_date: str, end_date: str):
+        """
+        Lists the appointments of every stored CalendarOwner in a date range.
+
+        Args:
+            start_date (str): First date in YYYY-MM-DD format.
+            end_date (str): Last date in YYYY-MM-DD format (inclusive).
+
+        Returns:
+            list: (calendar_owner_id, Appointment) tuples in chronological order. Archived
+            appointments are read-only AppointmentView objects.
+        """
+        first, last = iso_to_ordinal(start_date), iso_to_ordinal(end_date)
+        with self._index_lock:
+            dates = self._data["appointment_dates"]
+            by_date = self._data["appointments_by_date"]
+            bookings = [booking for ordinal in dates[bisect_left(dates, first):bisect_right(dates, last)]
+                        for booking in by_date[ordinal]]
+        bookings.extend(self._archived_bookings(start_date, end_date))
+        return sorted(bookings, key=_chronological)
+
+    def find_common_slots(self, owner_ids, date_range, duration: int = 60, min_attendees: int = None,
+                          timezone: str = None):
+        """
+        Finds slots in which several CalendarOwners are free at the same time.
+
+        Args:
+            owner_ids (list): IDs of the CalendarOwners to schedule together.
+            date_range (tuple): (start_date, end_date), inclusive, as datetime.date or YYYY-MM-DD strings.
+            duration (int): Length of the meeting in minutes, default is 60.
+            min_attendees (int): Accept slots where at least this many owners are free. Defaults to all of them.
+            timezone (str): IANA zone of date_range and the slots, see services.group_finder.find_common_slots.
+
+        Returns:
+            list: GroupSlot tuples in chronological order.
+
+        Raises:
+            ValueError: If an owner ID is not in the database.
+        """
+        owners = []
+        for owner_id in owner_ids:
+            owner = self.get_calendar_owner(owner_id)
+            if owner is None:
+                raise ValueError(f"Unknown CalendarOwner ID: {owner_id}")
+            owners.append(owner)
+        return find_common_slots(owners, date_range, duration, min_attendees, timezone=timezone)
+
+    def _index_owner(self, calendar_owner_id: str, calendar_owner):
+        """Add an owner, its invitees and its appointments to the secondary indexes and keep them updated."""
+        def on_owner_change(event, invitee):
+            if event == "invitee_added":
+                with self._index_lock:
+                    self._index_invitee(invitee)
+
+        def on_calendar_change(event, payload):
+            with self._index_lock:
+                if event == "appointment_added":
+                    self._index_appointment(calendar_owner_id, payload)
+                elif event == "appointment_cancelled":
+                    self._unindex_appointment(calendar_owner_id, payload)
+                elif event == "appointment_rescheduled":
+                    old, new = payload
+                    self._index_appointment(calendar_owner_id, new)
+                    self._unindex_appointment(calendar_owner_id, old)
+                elif event == "appointments_archived":  # Read from the archive from now on
+                    self._data["archived_owners"].add(calendar_owner_id)
+                    for appointment in payload:
+                        self._unindex_appointment(calendar_owner_id, appointment)
+                elif event == "appointments_thawed":
+                    for appointment in payload:
+                        self._index_appointment(calendar_owner_id, appointment)
+
+        # Subscribe before taking the snapshot, so nothing booked in between is missed. A booking seen
+        # by both is indexed once, since the appointment indexes are sets.
+        calendar_owner.add_observer(on_owner_change)
+        calendar_owner.calendar.add_observer(on_calendar_change)
+        self._subscriptions[calendar_owner_id] = (on_owner_change, on_calendar_change)
+        appointments = list(calendar_owner.calendar.list_upcoming_appointments())
+        with self._index_lock:
+            self._data["owners_by_name"].setdefault(calendar_owner.name, {})[calendar_owner_id] = calendar_owner
+            if calendar_owner.calendar.archived_months():
+                self._data["archived_owners"].add(calendar_owner_id)
+            for invitee in list(calendar_owner.invitees):
+                self._index_invitee(invitee)
+            for appointment in appointments:
+                self._index_appointment(calendar_owner_id, appointment)
+
+    def _unindex_owner(self, calendar_owner_id: str, calendar_owner):
+        """Stop observing an owner and remove it, its invitees and its appointments from the secondary indexes."""
+        on_owner_change, on_calendar_change = self._subscriptions.pop(calendar_owner_id)
+        calendar_owner.remove_observer(on_owner_change)
+        calendar_owner.calendar.remove_observer(on_calendar_change)
+        appointments = list(calendar_owner.calendar.list_upcoming_appointments())
+        data = self._data
+        with self._index_lock:
+            _discard(data["owners_by_name"], calendar_owner.name, calendar_owner_id)
+            data["archived_owners"].discard(calendar_owner_id)
+            for invitee in calendar_owner.invitees:
+                if any(other is not calendar_owner and data["calendar_owners"].get(other.id) is other
+                       for other in invitee.calendar_owners):
+                    continue  # Still linked to another stored owner
+                data["invitees_by_id"].pop(invitee.id, None)
+                _discard(data["invitees_by_name"], invitee.name, invitee.id)
+            for appointment in appointments:
+                self._unindex_appointment(calendar_owner_id, appointment)
+
+    def _archived_bookings(self, start_date: str = None, end_date: str = None):
+        """List (owner ID, AppointmentView) of the archived appointments in a date range, across owners."""
+        with self._index_lock:
+            owner_ids = list(self._data["archived_owners"])
+        bookings = []
+        for owner_id in owner_ids:
+            owner = self._data["calendar_owners"].get(owner_id)
+            if owner is not None:
+                bookings.extend((owner_id, view) for view in owner.calendar.archived_appointments(start_date, end_date))
+        return bookings
+
+    def _index_invitee(self, invitee):
+        """Add an invitee to the secondary indexes. Called with _index_lock held."""
+        self._data["invitees_by_id"][invitee.id] = invitee
+        self._data["invitees_by_name"].setdefault(invitee.name, {})[invitee.id] = invitee
+
+    def _index_appointment(self, calendar_owner_id: str, appointment):
+        """Add an appointment to the secondary indexes. Called with _index_lock held."""
+        booking = (calendar_owner_id, appointment)
+        self._data["appointments_by_invitee"].setdefault(appointment.invitee_name, set()).add(booking)
+        by_date = self._data["appointments_by_date"]
+        bookings = by_date.get(appointment.date_ordinal)
+        if bookings is None:
+            bookings = by_date[appointment.date_ordinal] = set()
+            insort(self._data["appointment_dates"], appointment.date_ordinal)
+        bookings.add(booking)
+
+    def _unindex_appointment(self, calendar_owner_id: str, appointment):
+        """Remove an appointment from the secondary indexes. Called with _index_lock held."""
+        booking = (calendar_owner_id, appointment)
+        _discard(self._data["appointments_by_invitee"], appointment.invitee_name, booking)
+        if _discard(self._data["appointments_by_date"], appointment.date_ordinal, booking):
+            dates = self._data["appointment_dates"]
+            del dates[bisect_left(dates, appointment.date_ordinal)]
 
     def log_data(self):
         """
@@ -74,3 +314,29 @@ class InMemoryDatabase:
         """
         for owner_id, owner in self._data["calendar_owners"].items():
             print(f"CalendarOwnerID: {owner_id}, Name: {owner.name}")  # Print out each calendar owner's ID and name
+
+
+def _chronological(booking):
+    """Sort key of an (owner ID, Appointment) tuple: date, start time, then owner ID."""
+    owner_id, appointment = booking
+    return appointment.date_ordinal, appointment.start_minutes, owner_id
+
+
+def _discard(index: dict, key, member) -> bool:
+    """
+    Remove member from the collection stored under key, dropping the key once it is empty.
+
+    Returns:
+        bool: True if the key was dropped.
+    """
+    members = index.get(key)
+    if members is None:
+        return False
+    if isinstance(members, dict):
+        members.pop(member, None)
+    else:
+        members.discard(member)
+    if members:
+        return False
+    del index[key]
+    return True
@@ -0,0 +1,355 @@
+"""
+Read-only calendar snapshots in a fixed binary layout, queried in place through mmap.
+
+A writer exports every owner's availability and booked-slot masks for a window of dates into one
+file. Any number of reader processes map that file and answer slot searches straight from the
+mapped pages, sharing them through the OS page cache instead of each holding its own owners.
+
+Layout (little-endian):
+    header:  magic (8s), generation (Q), first date ordinal (i), days (i), owners (I), ID width (I)
+    owners:  one ID per owner, UTF-8 and NUL-padded to the ID width, sorted bytewise
+    grid:    per owner, per day: the availability mask then the busy mask, MASK_BYTES each
+
+Masks are in each owner's local time, like FreeBusyEngine.free_mask.
+"""
+from collections import namedtuple
+from datetime import date, timedelta
+import mmap
+import os
+import struct
+import threading
+
+from services.free_busy import FreeBusyEngine, FreeSlot, iter_bits, run_starts
+from utils.utils import SLOT_MINUTES, SLOTS_PER_DAY
+
+MAGIC = b"MSCHSNP1"
+HEADER = struct.Struct("<8sQiiII")
+MASK_BYTES = (SLOTS_PER_DAY + 7) // 8  # One day of slots
+ROW_BYTES = 2 * MASK_BYTES  # Availability mask followed by busy mask
+
+
+def write_snapshot(path: str, calendar_owners, start_date: date, days: int, generation: int):
+    """
+    Export the masks of calendar owners to a snapshot file, replacing it atomically.
+
+    The file is written next to path, fsynced and renamed over it with os.replace, so readers see
+    either the old generation or the new one in full.
+
+    Args:
+        path (str): The snapshot file.
+        calendar_owners (list): The CalendarOwner objects to export.
+        start_date (datetime.date): The first date of the window.
+        days (int): Number of dates in the window.
+        generation (int): Generation number stored in the header.
+
+    Raises:
+        ValueError: If days is not positive.
+    """
+    if days <= 0:
+        raise ValueError("A snapshot must cover at least one day.")
+    owners = sorted(((owner.id.encode("utf-8"), owner) for owner in calendar_owners), key=lambda item: item[0])
+    id_width = max((len(owner_id) for owner_id, _ in owners), default=1)
+    dates = [start_date + timedelta(days=offset) for offset in range(days)]
+    iso_dates = [day.isoformat() for day in dates]
+
+    grid = bytearray(len(owners) * days * ROW_BYTES)
+    position = 0
+    for _, owner in owners:
+        rule, calendar = owner.availability_rule, owner.calendar
+        calendar.expire_holds()
+        for day, iso_date in zip(dates, iso_dates):
+            grid[position:position + MASK_BYTES] = rule.date_mask(day).to_bytes(MASK_BYTES, "little")
+            grid[position + MASK_BYTES:position + ROW_BYTES] = calendar.busy_mask(iso_date).to_bytes(MASK_BYTES, "little")
+            position += ROW_BYTES
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, generation, start_date.toordinal(), days, len(owners), id_width))
+        f.write(b"".join(owner_id.ljust(id_width, b"\0") for owner_id, _ in owners))
+        f.write(grid)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+_Mapping = namedtuple("_Mapping", ["map", "view", "file_id", "generation", "first_ordinal", "days", "owners",
+                                   "id_width", "grid_offset"])
+
+
+class CalendarSnapshot:
+    """
+    Answer free/busy queries from a snapshot file without loading it.
+
+    Owner IDs are found with a binary search over the mapped ID table, and masks are read from the
+    mapped grid through a memoryview, so opening a snapshot costs the same however many owners it
+    holds. refresh() switches to a newer generation published at the same path. Queries already
+    running keep the mapping they started with, which stays valid after the file is replaced.
+
+    Thread safety: the current mapping is swapped with a single assignment, so queries may run from
+    any thread while another one refreshes.
+
+    Attributes:
+        path (str): The snapshot file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Map a snapshot file.
+
+        Args:
+            path (str): The snapshot file.
+
+        Raises:
+            ValueError: If the file is not a snapshot.
+        """
+        self.path = path
+        self._refresh_lock = threading.Lock()
+        self._mapping = self._open()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def generation(self) -> int:
+        """int: Generation of the mapped snapshot."""
+        return self._mapping.generation
+
+    @property
+    def date_range(self):
+        """tuple: (first date, last date) covered by the mapped snapshot."""
+        mapping = self._mapping
+        return date.fromordinal(mapping.first_ordinal), date.fromordinal(mapping.first_ordinal + mapping.days - 1)
+
+    def refresh(self) -> bool:
+        """
+        Switch to the file now at path if it was replaced since it was mapped.
+
+        Returns:
+            bool: True if a new snapshot was mapped.
+        """
+        with self._refresh_lock:
+            if _file_id(os.stat(self.path)) == self._mapping.file_id:
+                return False
+            self._mapping = self._open()  # The old map is released once no query uses it
+            return True
+
+    def owner_ids(self):
+        """
+        List the owners in the snapshot.
+
+        Returns:
+            list: Owner IDs, sorted.
+        """
+        mapping = self._mapping
+        return [self._owner_id_at(mapping, index) for index in range(mapping.owners)]
+
+    def available_mask(self, owner_id: str, day: date) -> int:
+        """Get an owner's available slots on a date, see AvailabilityRule.date_mask."""
+        mapping = self._mapping
+        return _read_mask(mapping.view, self._row(mapping, owner_id, day))
+
+    def busy_mask(self, owner_id: str, day: date) -> int:
+        """Get an owner's booked slots on a date, see Calendar.busy_mask."""
+        mapping = self._mapping
+        return _read_mask(mapping.view, self._row(mapping, owner_id, day) + MASK_BYTES)
+
+    def free_mask(self, owner_id: str, day: date) -> int:
+        """
+        Get the free slots of an owner on a date, see FreeBusyEngine.free_mask.
+
+        Raises:
+            LookupError: If the owner is not in the snapshot.
+            ValueError: If the date is outside the snapshot.
+        """
+        return self.free_masks(owner_id, day, day)[0]
+
+    def free_masks(self, owner_id: str, start_date: date, end_date: date):
+        """
+        Get the free slots of an owner for every date in a range, both ends inclusive.
+
+        Returns:
+            list: One free-slot mask per date, in chronological order.
+
+        Raises:
+            LookupError: If the owner is not in the snapshot.
+            ValueError: If a date is outside the snapshot.
+        """
+        mapping = self._mapping
+        owner_offset = mapping.grid_offset + self._owner_index(mapping, owner_id) * mapping.days * ROW_BYTES
+        first = self._row(mapping, owner_id, start_date, owner_offset)
+        last = self._row(mapping, owner_id, end_date, owner_offset)
+        view = mapping.view
+        return [_read_mask(view, row) & ~_read_mask(view, row + MASK_BYTES)
+                for row in range(first, last + 1, ROW_BYTES)]
+
+    def find_slots(self, owner_id: str, start_date: date, end_date: date, duration_minutes: int = 60,
+                   step_minutes: int = None):
+        """
+        Find the free slots of an owner in a date range, see FreeBusyEngine.find_slots.
+
+        Returns:
+            list: FreeSlot tuples in chronological order.
+
+        Raises:
+            LookupError: If the owner is not in the snapshot.
+            ValueError: If a date is outside the snapshot, or the duration or step is invalid.
+        """
+        starts_allowed = FreeBusyEngine.start_mask(duration_minutes, step_minutes)
+        length = duration_minutes // SLOT_MINUTES
+        slots = []
+        for offset, free in enumerate(self.free_masks(owner_id, start_date, end_date)):
+            day = start_date + timedelta(days=offset)
+            slots.extend(FreeSlot(day, slot * SLOT_MINUTES, slot * SLOT_MINUTES + duration_minutes)
+                         for slot in iter_bits(run_starts(free, length) & starts_allowed))
+        return slots
+
+    def close(self):
+        """Unmap the snapshot. Queries must not be running."""
+        mapping = self._mapping
+        mapping.view.release()
+        mapping.map.close()
+
+    def _open(self) -> _Mapping:
+        """Map the file at path and read its header."""
+        with open(self.path, "rb") as f:
+            file_id = _file_id(os.fstat(f.fileno()))
+            snapshot_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)  # Stays valid after the file is closed
+        if len(snapshot_map) < HEADER.size:
+            snapshot_map.close()
+            raise ValueError(f"Not a calendar snapshot: {self.path}")
+        magic, generation, first_ordinal, days, owners, id_width = HEADER.unpack_from(snapshot_map)
+        grid_offset = HEADER.size + owners * id_width
+        if magic != MAGIC or len(snapshot_map) != grid_offset + owners * days * ROW_BYTES:
+            snapshot_map.close()
+            raise ValueError(f"Not a calendar snapshot: {self.path}")
+        return _Mapping(snapshot_map, memoryview(snapshot_map), file_id, generation, first_ordinal, days, owners,
+                        id_width, grid_offset)
+
+    def _row(self, mapping: _Mapping, owner_id: str, day: date, owner_offset: int = None) -> int:
+        """Find the offset of an owner's row for a date. Pass owner_offset to skip the ID lookup."""
+        offset = day.toordinal() - mapping.first_ordinal
+        if not 0 <= offset < mapping.days:
+            raise ValueError(f"{day.isoformat()} is outside the snapshot.")
+        if owner_offset is None:
+            owner_offset = mapping.grid_offset + self._owner_index(mapping, owner_id) * mapping.days * ROW_BYTES
+        return owner_offset + offset * ROW_BYTES
+
+    @staticmethod
+    def _owner_index(mapping: _Mapping, owner_id: str) -> int:
+        """Binary search the ID table for an owner."""
+        key = owner_id.encode("utf-8").ljust(mapping.id_width, b"\0")
+        low, high = 0, mapping.owners
+        while low < high:
+            middle = (low + high) // 2
+            start = HEADER.size + middle * mapping.id_width
+            if mapping.map[start:start + mapping.id_width] < key:  # Copies one ID, not the table
+                low = middle + 1
+            else:
+                high = middle
+        start = HEADER.size + low * mapping.id_width
+        if low == mapping.owners or mapping.map[start:start + mapping.id_width] != key:
+            raise LookupError(f"Unknown CalendarOwner ID: {owner_id}")
+        return low
+
+    @staticmethod
+    def _owner_id_at(mapping: _Mapping, index: int) -> str:
+        """Read the owner ID at a position of the ID table."""
+        start = HEADER.size + index * mapping.id_width
+        return mapping.map[start:start + mapping.id_width].rstrip(b"\0").decode("utf-8")
+
+
+class SnapshotPublisher:
+    """
+    Publish new snapshot generations of a database's owners, on demand or periodically.
+
+    A generation is only written when an owner was added or its calendar or rule changed since the
+    last one, or the window moved to a new day. Readers pick it up with CalendarSnapshot.refresh.
+
+    Attributes:
+        database: The store whose owners are exported, e.g. InMemoryDatabase.
+        path (str): The snapshot file.
+        days (int): Number of dates exported, starting today.
+        generation (int): Generation of the last published snapshot.
+    """
+
+    def __init__(self, database, path: str, days: int = 90):
+        """
+        Initialize the publisher, continuing the generation numbers of an existing snapshot.
+
+        Args:
+            database: The store whose owners are exported.
+            path (str): The snapshot file.
+            days (int): Number of dates exported, starting today. Default is 90.
+        """
+        self.database = database
+        self.path = path
+        self.days = days
+        self.generation = 0
+        if os.path.exists(path):
+            with CalendarSnapshot(path) as existing:
+                self.generation = existing.generation
+        self._published = None  # Change key of the last published snapshot
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def publish(self, start_date: date = None) -> bool:
+        """
+        Write a new generation if anything changed since the last one.
+
+        Args:
+            start_date (datetime.date): First date of the window, defaults to today.
+
+        Returns:
+            bool: True if a snapshot was written.
+        """
+        start_date = start_date or date.today()
+        owners = self.database.list_calendar_owners()
+        # Owners, their calendar generations and their rules identify the exported state
+        key = (start_date, tuple((owner.id, owner.calendar.generation, id(owner.availability_rule),
+                                  owner.availability_rule.generation) for owner in owners))
+        with self._lock:
+            if key == self._published:
+                return False
+            write_snapshot(self.path, owners, start_date, self.days, self.generation + 1)
+            self.generation += 1
+            self._published = key
+            return True
+
+    def start(self, interval: float = 1.0):
+        """
+        Publish from a background thread every interval seconds until stop() is called.
+
+        Args:
+            interval (float): Seconds between checks, default is 1.0.
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="snapshot-publisher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, interval: float):
+        """Publish until stopped."""
+        while True:
+            self.publish()
+            if self._stop.wait(interval):
+                break
+
+
+def _read_mask(view: memoryview, offset: int) -> int:
+    """Read one day mask from the mapped file."""
+    return int.from_bytes(view[offset:offset + MASK_BYTES], "little")
+
+
+def _file_id(stat_result) -> tuple:
+    """Identify a file version: os.replace gives the new file a new inode."""
+    return stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size
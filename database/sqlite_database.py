@@ -0,0 +1,383 @@
+import json
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from models.appointment import Appointment
+from models.availability_rule import AvailabilityRule
+from models.calendar_owner import CalendarOwner
+from models.invitee import Invitee
+from services.free_busy import FreeBusyEngine, FreeSlot, iter_bits, run_starts
+from utils.utils import SLOT_MINUTES, slot_range_mask
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS owners (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    start_hour INTEGER NOT NULL,
+    end_hour INTEGER NOT NULL,
+    days_of_week TEXT NOT NULL,
+    rule TEXT,
+    timezone TEXT
+);
+CREATE TABLE IF NOT EXISTS invitees (
+    owner_id TEXT NOT NULL REFERENCES owners(id),
+    name TEXT NOT NULL,
+    invitee_id TEXT,
+    PRIMARY KEY (owner_id, name)
+);
+CREATE TABLE IF NOT EXISTS appointments (
+    id INTEGER PRIMARY KEY,
+    owner_id TEXT NOT NULL REFERENCES owners(id),
+    date TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    invitee_name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS appointments_owner_date_start ON appointments (owner_id, date, start);
+"""
+
+
+class SQLiteDatabase:
+    """
+    A SQLite store for CalendarOwners with the same API as InMemoryDatabase.
+
+    Owners, availability rules, invitees and appointments are kept in SQLite in WAL journal mode.
+    Appointments are indexed on (owner_id, date, start), so the SQL-level methods try_book,
+    overlaps and find_slots only touch the index entries of the dates involved and never load
+    a whole calendar into Python.
+
+    get_calendar_owner returns a fully loaded CalendarOwner for code written against
+    InMemoryDatabase. Bookings, invitees added and rule updates on it are written through to
+    SQLite, and invitees keep their IDs across loads. Each
+    booking is inserted by a booking guard on the owner's calendar, in the same IMMEDIATE
+    check-and-insert as try_book, so a booking that SQLite finds taken is refused in memory too.
+
+    Thread safety: each thread gets its own connection from a small thread-local pool, and
+    every insert runs its conflict check in one IMMEDIATE transaction, so concurrent bookings,
+    including bookings on separately loaded copies of one owner, cannot double-book across threads
+    or processes.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open or create the database.
+
+        Args:
+            path (str): Path of the SQLite file.
+        """
+        self.path = path
+        self._local = threading.local()  # Holds the calling thread's connection
+        self._connections = []  # Every connection handed out, closed by close()
+        self._pool_lock = threading.Lock()
+        self._engine = FreeBusyEngine()
+        self._subscriptions = weakref.WeakKeyDictionary()  # Maps an owner object to its write-through callbacks
+        connection = self._connection()
+        connection.executescript(_SCHEMA)
+        columns = [column[1] for column in connection.execute("PRAGMA table_info(owners)")]
+        if "rule" not in columns:
+            connection.execute("ALTER TABLE owners ADD COLUMN rule TEXT")  # Files created before rules had windows
+        if "timezone" not in columns:
+            connection.execute("ALTER TABLE owners ADD COLUMN timezone TEXT")  # Files created before time zones
+        if "invitee_id" not in [column[1] for column in connection.execute("PRAGMA table_info(invitees)")]:
+            connection.execute("ALTER TABLE invitees ADD COLUMN invitee_id TEXT")  # Files created before invitee IDs
+
+    def add_calendar_owner(self, calendar_owner_id: str, calendar_owner: "CalendarOwner"):
+        """
+        Adds or replaces a CalendarOwner with its rule, invitees and appointments.
+
+        The owner's later bookings, invitees and rule updates are written through. Adding the same object again
+        replaces its earlier subscription.
+
+        Args:
+            calendar_owner_id (str): The unique identifier for the CalendarOwner.
+            calendar_owner (CalendarOwner): The CalendarOwner object to add.
+        """
+        rule = calendar_owner.availability_rule
+        self._stop_write_through(calendar_owner)  # Its appointments are rewritten below
+        connection = self._connection()
+        with self._transaction(connection):
+            connection.execute(
+                "INSERT INTO owners VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (id) DO UPDATE SET name = excluded.name, "
+                "start_hour = excluded.start_hour, end_hour = excluded.end_hour, days_of_week = excluded.days_of_week, "
+                "rule = excluded.rule, timezone = excluded.timezone",
+                (calendar_owner_id, calendar_owner.name) + self._rule_columns(rule) + (calendar_owner.timezone,))
+            # Replace whatever was stored for this ID, as InMemoryDatabase does
+            connection.execute("DELETE FROM invitees WHERE owner_id = ?", (calendar_owner_id,))
+            connection.execute("DELETE FROM appointments WHERE owner_id = ?", (calendar_owner_id,))
+            connection.executemany("INSERT OR IGNORE INTO invitees (owner_id, name, invitee_id) VALUES (?, ?, ?)",
+                                   [(calendar_owner_id, invitee.name, invitee.id) for invitee in calendar_owner.invitees])
+        calendar = calendar_owner.calendar
+        self.bulk_insert_appointments(calendar_owner_id,
+                                      calendar.archived_appointments() + list(calendar.list_upcoming_appointments()))
+        self._write_through(calendar_owner_id, calendar_owner)
+
+    def get_calendar_owner(self, calendar_owner_id: str) -> "CalendarOwner":
+        """
+        Loads a CalendarOwner by its ID.
+
+        Args:
+            calendar_owner_id (str): The unique identifier for the CalendarOwner to fetch.
+
+        Returns:
+            CalendarOwner: A loaded copy whose bookings and rule updates are saved, or None if not found.
+        """
+        connection = self._connection()
+        row = connection.execute("SELECT name, start_hour, end_hour, days_of_week, rule, timezone FROM owners "
+                                 "WHERE id = ?", (calendar_owner_id,)).fetchone()
+        if row is None:
+            return None
+        owner = CalendarOwner(row[0], self._rule_from_row(row[1:5]), calendar_owner_id, row[5])
+        for name, invitee_id in connection.execute("SELECT name, invitee_id FROM invitees WHERE owner_id = ?",
+                                                   (calendar_owner_id,)):
+            owner.invitees.append(Invitee(name, owner, invitee_id=invitee_id))  # Rows from before IDs get a new one
+        for appointment in self.list_appointments(calendar_owner_id):
+            owner.calendar.try_book(appointment)
+        self._write_through(calendar_owner_id, owner)
+        return owner
+
+    def list_calendar_owners(self):
+        """
+        Lists all the CalendarOwners in the database.
+
+        Returns:
+            list: A list of loaded CalendarOwner objects.
+        """
+        ids = [owner_id for (owner_id,) in self._connection().execute("SELECT id FROM owners ORDER BY id")]
+        return [self.get_calendar_owner(owner_id) for owner_id in ids]
+
+    def try_book(self, calendar_owner_id: str, appointment) -> bool:
+        """
+        Atomically insert an appointment unless it overlaps an existing one.
+
+        Args:
+            calendar_owner_id (str): The CalendarOwner ID.
+            appointment (Appointment): The appointment to book.
+
+        Returns:
+            bool: True if the appointment was added, False if the slot was already taken.
+        """
+        return self._claim(self._connection(), calendar_owner_id, appointment)
+
+    def overlaps(self, calendar_owner_id: str, date_str: str, start_minutes: int, end_minutes: int) -> bool:
+        """
+        Check whether a time range intersects an existing appointment, using the index.
+
+        Args:
+            calendar_owner_id (str): The CalendarOwner ID.
+            date_str (str): The date in YYYY-MM-DD format.
+            start_minutes (int): Start of the range in minutes since midnight.
+            end_minutes (int): End of the range in minutes since midnight (exclusive).
+
+        Returns:
+            bool: True if an appointment overlaps the range.
+        """
+        return self._overlaps(self._connection(), calendar_owner_id, date_str, start_minutes, end_minutes)
+
+    def find_slots(self, calendar_owner_id: str, start_date: date, end_date: date, duration_minutes: int = 60):
+        """
+        Find an owner's free slots, reading only the appointments inside the date range.
+
+        Args:
+            calendar_owner_id (str): The CalendarOwner ID.
+            start_date (datetime.date): The first date of the range.
+            end_date (datetime.date): The last date of the range (inclusive).
+            duration_minutes (int): Length of the meeting in minutes, default is 60.
+
+        Returns:
+            list: FreeSlot tuples in chronological order, or an empty list if the owner does not exist.
+        """
+        connection = self._connection()
+        row = connection.execute("SELECT start_hour, end_hour, days_of_week, rule FROM owners WHERE id = ?",
+                                 (calendar_owner_id,)).fetchone()
+        if row is None:
+            return []
+        rule = self._rule_from_row(row)
+
+        busy = {}  # Maps a date to its busy-slot mask
+        for date_str, start, end in connection.execute(
+                "SELECT date, start, end FROM appointments WHERE owner_id = ? AND date BETWEEN ? AND ?",
+                (calendar_owner_id, start_date.isoformat(), end_date.isoformat())):
+            busy[date_str] = busy.get(date_str, 0) | slot_range_mask(start, end)
+
+        starts_allowed = self._engine.start_mask(duration_minutes)
+        slots = []
+        for offset in range((end_date - start_date).days + 1):
+            day = start_date + timedelta(days=offset)
+            free = rule.date_mask(day) & ~busy.get(day.isoformat(), 0)
+            for slot in iter_bits(run_starts(free, duration_minutes // SLOT_MINUTES) & starts_allowed):
+                slots.append(FreeSlot(day, slot * SLOT_MINUTES, slot * SLOT_MINUTES + duration_minutes))
+        return slots
+
+    def list_appointments(self, calendar_owner_id: str, start_date: str = None, end_date: str = None):
+        """
+        List an owner's appointments, optionally limited to a date range.
+
+        Args:
+            calendar_owner_id (str): The CalendarOwner ID.
+            start_date (str): First date to include (YYYY-MM-DD), default is no limit.
+            end_date (str): Last date to include (YYYY-MM-DD), default is no limit.
+
+        Returns:
+            list: Appointment objects ordered by date and start time.
+        """
+        rows = self._connection().execute(
+            "SELECT invitee_name, date, start, end FROM appointments "
+            "WHERE owner_id = ? AND date BETWEEN ? AND ? ORDER BY date, start",
+            (calendar_owner_id, start_date or "", end_date or "9999-12-31"))
+        return [Appointment(name, day, start // 60, end // 60, start % 60, end % 60) for name, day, start, end in rows]
+
+    def bulk_insert_appointments(self, calendar_owner_id: str, appointments, batch_size: int = 10000):
+        """
+        Insert many appointments without conflict checks, for imports.
+
+        Args:
+            calendar_owner_id (str): The CalendarOwner ID.
+            appointments (iterable): Appointment objects to insert.
+            batch_size (int): Rows per transaction, default is 10000.
+        """
+        connection = self._connection()
+        batch = []
+        for appointment in appointments:
+            batch.append(appointment)
+            if len(batch) >= batch_size:
+                with self._transaction(connection):
+                    self._insert(connection, calendar_owner_id, batch)
+                batch = []
+        if batch:
+            with self._transaction(connection):
+                self._insert(connection, calendar_owner_id, batch)
+
+    def close(self):
+        """Close every pooled connection."""
+        with self._pool_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")  # Readers never block the writer
+            connection.execute("PRAGMA synchronous=NORMAL")  # fsync at checkpoints, safe in WAL mode
+            connection.execute("PRAGMA foreign_keys=ON")
+            self._local.connection = connection
+            with self._pool_lock:
+                self._connections.append(connection)
+        return connection
+
+    def _write_through(self, calendar_owner_id: str, owner):
+        """Save bookings, invitees and rule updates made on a loaded CalendarOwner."""
+        def guard(appointment, replaces):
+            return self._claim(self._connection(), calendar_owner_id, appointment, replaces)  # Bookings and moves
+
+        def on_booking(event, payload):
+            if event == "appointment_cancelled":
+                connection = self._connection()
+                with self._transaction(connection):
+                    self._delete(connection, calendar_owner_id, payload)
+            elif event == "appointments_dropped":  # Deleted by the retention policy. Archived rows stay in SQLite
+                self._connection().execute("DELETE FROM appointments WHERE owner_id = ? AND date < ?",
+                                           (calendar_owner_id, payload + "-01"))
+
+        def on_owner_change(event, invitee):
+            if event == "invitee_added":
+                self._connection().execute("INSERT OR IGNORE INTO invitees (owner_id, name, invitee_id) VALUES (?, ?, ?)",
+                                           (calendar_owner_id, invitee.name, invitee.id))
+
+        def on_rule_update(event, rule):
+            self._connection().execute("UPDATE owners SET start_hour = ?, end_hour = ?, days_of_week = ?, rule = ? "
+                                       "WHERE id = ?", self._rule_columns(rule) + (calendar_owner_id,))
+
+        owner.calendar.add_booking_guard(guard)
+        owner.calendar.add_observer(on_booking)
+        owner.add_observer(on_owner_change)
+        owner.availability_rule.add_observer(on_rule_update)
+        self._subscriptions[owner] = (guard, on_booking, on_owner_change, on_rule_update)
+
+    def _stop_write_through(self, owner):
+        """Remove the write-through callbacks of an owner object, if it has any."""
+        callbacks = self._subscriptions.pop(owner, None)
+        if callbacks is not None:
+            guard, on_booking, on_owner_change, on_rule_update = callbacks
+            owner.calendar.remove_booking_guard(guard)
+            owner.calendar.remove_observer(on_booking)
+            owner.remove_observer(on_owner_change)
+            owner.availability_rule.remove_observer(on_rule_update)
+
+    def _claim(self, connection, calendar_owner_id: str, appointment, replaces=None) -> bool:
+        """Insert an appointment unless it overlaps another row, replacing the row of replaces if given."""
+        with self._transaction(connection, "IMMEDIATE"):  # Take the write lock before checking
+            replaced = None if replaces is None else self._row_id(connection, calendar_owner_id, replaces)
+            if self._overlaps(connection, calendar_owner_id, appointment.date,
+                              appointment.start_minutes, appointment.end_minutes, replaced):
+                return False
+            self._insert(connection, calendar_owner_id, [appointment])
+            if replaced is not None:
+                connection.execute("DELETE FROM appointments WHERE id = ?", (replaced,))
+            return True
+
+    @staticmethod
+    @contextmanager
+    def _transaction(connection, mode: str = "DEFERRED"):
+        """Run the block in one transaction, committing on success and rolling back on error."""
+        connection.execute(f"BEGIN {mode}")
+        try:
+            yield
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    @staticmethod
+    def _rule_columns(rule) -> tuple:
+        """Serialize an AvailabilityRule as (start_hour, end_hour, days_of_week, rule) column values."""
+        return (rule.start_hour, rule.end_hour, ",".join(sorted(rule.days_of_week)),
+                json.dumps(rule.to_dict(), separators=(",", ":")))
+
+    @staticmethod
+    def _rule_from_row(row) -> AvailabilityRule:
+        """Build an AvailabilityRule from (start_hour, end_hour, days_of_week, rule) columns."""
+        if row[3]:
+            return AvailabilityRule.from_dict(json.loads(row[3]))  # Includes windows, overrides and recurrence
+        return AvailabilityRule(row[0], row[1], set(row[2].split(",")) - {""})
+
+    @staticmethod
+    def _overlaps(connection, calendar_owner_id, date_str, start_minutes, end_minutes, ignore_id=None) -> bool:
+        """
+        Check the last appointment starting before end_minutes. Bookings are disjoint, so it is the only candidate.
+        The row ignore_id, an appointment being moved, is left out.
+        """
+        row = connection.execute(
+            "SELECT end FROM appointments WHERE owner_id = ? AND date = ? AND start < ? AND id IS NOT ? "
+            "ORDER BY start DESC LIMIT 1", (calendar_owner_id, date_str, end_minutes, ignore_id)).fetchone()
+        return row is not None and row[0] > start_minutes
+
+    @staticmethod
+    def _insert(connection, calendar_owner_id, appointments):
+        """Insert appointment rows. The caller manages the transaction."""
+        connection.executemany(
+            "INSERT INTO appointments (owner_id, date, start, end, invitee_name) VALUES (?, ?, ?, ?, ?)",
+            [(calendar_owner_id, a.date, a.start_minutes, a.end_minutes, a.invitee_name) for a in appointments])
+
+    @staticmethod
+    def _row_id(connection, calendar_owner_id, appointment):
+        """Return the row ID of an appointment, or None if it is not stored."""
+        row = connection.execute(
+            "SELECT id FROM appointments WHERE owner_id = ? AND date = ? AND start = ? AND end = ? "
+            "AND invitee_name = ? LIMIT 1",
+            (calendar_owner_id, appointment.date, appointment.start_minutes, appointment.end_minutes,
+             appointment.invitee_name)).fetchone()
+        return None if row is None else row[0]
+
+    @staticmethod
+    def _delete(connection, calendar_owner_id, appointment):
+        """Delete one appointment row. The caller manages the transaction."""
+        row_id = SQLiteDatabase._row_id(connection, calendar_owner_id, appointment)
+        if row_id is not None:
+            connection.execute("DELETE FROM appointments WHERE id = ?", (row_id,))
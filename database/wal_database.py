@@ -0,0 +1,311 @@
+import json
+import os
+import threading
+import time
+from datetime import date, timedelta
+
+from models.appointment import Appointment
+from models.availability_rule import AvailabilityRule
+from models.calendar_owner import CalendarOwner
+
+SYNC_POLICIES = ("always", "batch", "never")  # When appended WAL records are fsynced to disk
+
+
+class WriteAheadLogDatabase:
+    """
+    A persistent store for CalendarOwners with the same API as InMemoryDatabase.
+
+    Owners live in memory as usual. Every change is also appended as one JSON line to a write-ahead
+    log: new owners, bookings, cancellations, moves, months deleted by a retention policy and
+    availability rule updates. The changes are picked up through the
+    Calendar and AvailabilityRule observers. Every snapshot_every records the whole state is written
+    to a compact snapshot and the log is truncated. On startup the snapshot is loaded and the log
+    tail after it is replayed. Replaying is idempotent, so records already in the snapshot are skipped.
+
+    Durability is controlled by sync_policy. "always" fsyncs every record. "batch" fsyncs once
+    sync_batch_size records are pending or sync_interval seconds have passed since the oldest pending
+    one; a timer thread syncs the tail when appends stop. "never" leaves flushing to the OS. Records are always handed to the OS on append, so a process crash loses nothing; the
+    policy only bounds what a power loss can take.
+
+    Thread safety: appends are serialized by a lock and records from one calendar are appended in
+    booking order. Owners are only fetched and added atomically, as in InMemoryDatabase.
+    """
+
+    SNAPSHOT_FILE = "snapshot.json"
+    LOG_FILE = "wal.log"
+
+    def __init__(self, directory: str, sync_policy: str = "batch", sync_batch_size: int = 256,
+                 sync_interval: float = 0.05, snapshot_every: int = 100000):
+        """
+        Open the store in a directory, recovering any state saved there.
+
+        Args:
+            directory (str): Directory holding the snapshot and log, created if missing.
+            sync_policy (str): One of "always", "batch" or "never". Default is "batch".
+            sync_batch_size (int): Records per fsync under the "batch" policy, default is 256.
+            sync_interval (float): Longest time in seconds a record waits for fsync under "batch", default is 0.05.
+            snapshot_every (int): Log records between automatic snapshots, default is 100000.
+
+        Raises:
+            ValueError: If sync_policy is unknown.
+        """
+        if sync_policy not in SYNC_POLICIES:
+            raise ValueError(f"Unknown sync policy: {sync_policy}. Expected one of {SYNC_POLICIES}.")
+        self.directory = directory
+        self.sync_policy = sync_policy
+        self.sync_batch_size = sync_batch_size
+        self.sync_interval = sync_interval
+        self.snapshot_every = snapshot_every
+
+        self._owners = {}  # Maps an owner ID to its CalendarOwner
+        self._observers = {}  # Maps an owner ID to its (calendar, rule) observer callbacks
+        self._lock = threading.Lock()  # Serializes log appends, syncs and snapshots
+        self._seq = 0  # Sequence number of the last record written or recovered
+        self._records_since_snapshot = 0
+        self._unsynced = 0  # Records appended since the last fsync
+        self._last_sync = time.monotonic()
+        self._sync_timer = None  # Pending threading.Timer that syncs the tail under "batch"
+
+        os.makedirs(directory, exist_ok=True)
+        self._recover()
+        self._log = open(self._path(self.LOG_FILE), "a", encoding="utf-8")
+        for owner_id, owner in self._owners.items():
+            self._observe(owner_id, owner)  # Subscribe only after replay so recovery is not logged again
+
+    def add_calendar_owner(self, calendar_owner_id: str, calendar_owner: "CalendarOwner"):
+        """
+        Adds a new CalendarOwner and logs it, including its rule and existing appointments.
+
+        Args:
+            calendar_owner_id (str): The unique identifier for the CalendarOwner.
+            calendar_owner (CalendarOwner): The CalendarOwner object to add.
+        """
+        self._unobserve(calendar_owner_id)  # Re-adding must not log every change twice
+        self._owners[calendar_owner_id] = calendar_owner
+        self._append({"op": "owner", "id": calendar_owner_id, "owner": _owner_to_dict(calendar_owner)})
+        self._observe(calendar_owner_id, calendar_owner)
+
+    def get_calendar_owner(self, calendar_owner_id: str) -> "CalendarOwner":
+        """
+        Retrieves a CalendarOwner by its ID.
+
+        Args:
+            calendar_owner_id (str): The unique identifier for the CalendarOwner to fetch.
+
+        Returns:
+            CalendarOwner: The CalendarOwner associated with the provided ID, or None if not found.
+        """
+        return self._owners.get(calendar_owner_id)
+
+    def list_calendar_owners(self):
+        """
+        Lists all the CalendarOwners in the store.
+
+        Returns:
+            list: A list of CalendarOwner objects.
+        """
+        return list(self._owners.values())
+
+    def snapshot(self):
+        """
+        Write the full state to a new snapshot and truncate the log.
+
+        The snapshot is written to a temporary file, fsynced and atomically renamed over the old one,
+        so a crash at any point leaves a usable snapshot and log behind.
+        """
+        with self._lock:
+            self._write_snapshot()
+
+    def sync(self):
+        """Force every appended record to disk."""
+        with self._lock:
+            self._sync()
+
+    def close(self):
+        """Sync the log and stop recording changes."""
+        with self._lock:
+            if self._sync_timer is not None:
+                self._sync_timer.cancel()
+                self._sync_timer = None
+            self._sync()
+            self._log.close()
+        for owner_id in list(self._observers):
+            self._unobserve(owner_id)
+
+    def _observe(self, owner_id: str, owner):
+        """Subscribe to the owner's bookings and rule updates."""
+        def on_booking(event, payload):
+            if event == "appointment_added":
+                self._append({"op": "book", "id": owner_id, "appointment": _appointment_to_list(payload)})
+            elif event == "appointment_cancelled":
+                self._append({"op": "cancel", "id": owner_id, "appointment": _appointment_to_list(payload)})
+            elif event == "appointment_rescheduled":
+                old, new = payload
+                self._append({"op": "move", "id": owner_id, "appointment": _appointment_to_list(old),
+                              "to": _appointment_to_list(new)})
+            elif event == "appointments_dropped":  # Archiving and thawing keep every appointment, so only drops are logged
+                self._append({"op": "drop", "id": owner_id, "before": payload})
+
+        def on_rule_update(event, rule):
+            self._append({"op": "rule", "id": owner_id, "rule": rule.to_dict()})
+
+        owner.calendar.add_observer(on_booking)
+        owner.availability_rule.add_observer(on_rule_update)
+        self._observers[owner_id] = (owner, on_booking, on_rule_update)
+
+    def _unobserve(self, owner_id: str):
+        """Unsubscribe from the owner stored under an ID, if it is observed."""
+        observed = self._observers.pop(owner_id, None)
+        if observed is not None:
+            owner, on_booking, on_rule_update = observed
+            owner.calendar.remove_observer(on_booking)
+            owner.availability_rule.remove_observer(on_rule_update)
+
+    def _append(self, record: dict):
+        """Append one record to the log, syncing and snapshotting as the policies require."""
+        with self._lock:
+            self._seq += 1
+            record["seq"] = self._seq
+            self._log.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self._log.flush()  # Hand the record to the OS so a process crash cannot lose it
+            self._unsynced += 1
+            self._records_since_snapshot += 1
+
+            if self.sync_policy == "always" or (
+                    self.sync_policy == "batch" and (self._unsynced >= self.sync_batch_size
+                                                     or time.monotonic() - self._last_sync >= self.sync_interval)):
+                self._sync()
+            elif self.sync_policy == "batch" and self._sync_timer is None:
+                # Sync the tail even if no further record arrives to trigger it
+                self._sync_timer = threading.Timer(self.sync_interval, self._sync_when_due)
+                self._sync_timer.daemon = True
+                self._sync_timer.start()
+            if self._records_since_snapshot >= self.snapshot_every:
+                self._write_snapshot()
+
+    def _sync_when_due(self):
+        """Timer callback: fsync the records still pending sync_interval after the first of them."""
+        with self._lock:
+            self._sync_timer = None
+            self._sync()
+
+    def _sync(self):
+        """fsync the log. The caller must hold the lock."""
+        if self._unsynced and not self._log.closed:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _write_snapshot(self):
+        """Write a snapshot and start an empty log. The caller must hold the lock."""
+        state = {"seq": self._seq, "owners": {owner_id: _owner_to_dict(owner) for owner_id, owner in self._owners.items()}}
+        temp_path = self._path(self.SNAPSHOT_FILE + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self._path(self.SNAPSHOT_FILE))
+
+        # Records up to seq are in the snapshot now, so the log can start over
+        self._log.close()
+        self._log = open(self._path(self.LOG_FILE), "w", encoding="utf-8")
+        self._unsynced = 0
+        self._records_since_snapshot = 0
+
+    def _recover(self):
+        """Load the snapshot, replay the log records written after it and cut off a torn final record."""
+        snapshot_path = self._path(self.SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, encoding="utf-8") as f:
+                state = json.load(f)
+            self._seq = state["seq"]
+            for owner_id, data in state["owners"].items():
+                self._owners[owner_id] = _owner_from_dict(owner_id, data)
+
+        log_path = self._path(self.LOG_FILE)
+        if not os.path.exists(log_path):
+            return
+        valid_bytes = 0  # Length of the log up to the end of the last complete record
+        with open(log_path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # A torn final record from a crash mid-write
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                valid_bytes += len(line)
+                if record["seq"] <= self._seq:
+                    continue  # Already part of the snapshot
+                self._replay(record)
+                self._seq = record["seq"]
+                self._records_since_snapshot += 1
+        if valid_bytes < os.path.getsize(log_path):
+            with open(log_path, "r+b") as f:
+                f.truncate(valid_bytes)  # Or the next record would be appended to the torn one
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _replay(self, record: dict):
+        """Apply one log record to the in-memory state."""
+        if record["op"] == "owner":
+            self._owners[record["id"]] = _owner_from_dict(record["id"], record["owner"])
+            return
+        owner = self._owners.get(record["id"])
+        if owner is None:
+            return
+        if record["op"] == "book":
+            owner.calendar.try_book(_appointment_from_list(record["appointment"]))  # No-op if already booked
+        elif record["op"] in ("cancel", "move"):
+            appointment = _find_appointment(owner.calendar, record["appointment"])
+            if appointment is None:
+                return  # Already applied
+            if record["op"] == "cancel":
+                owner.calendar.cancel(appointment.id)
+            else:
+                owner.calendar.reschedule(appointment.id, record["to"][1:])
+        elif record["op"] == "drop":
+            last_day = date.fromisoformat(record["before"] + "-01") - timedelta(days=1)
+            for appointment in owner.calendar.appointments_between("0001-01-01", last_day.isoformat()):
+                owner.calendar.cancel(appointment.id)
+        elif record["op"] == "rule":
+            owner.availability_rule.restore(record["rule"])
+
+    def _path(self, name: str) -> str:
+        """Return the path of a file in the store directory."""
+        return os.path.join(self.directory, name)
+
+
+def _appointment_to_list(appointment) -> list:
+    """Serialize an Appointment as [invitee_name, date, start_minutes, end_minutes]."""
+    return [appointment.invitee_name, appointment.date, appointment.start_minutes, appointment.end_minutes]
+
+
+def _appointment_from_list(data: list) -> Appointment:
+    """Rebuild an Appointment serialized by _appointment_to_list."""
+    invitee_name, date, start, end = data
+    return Appointment(invitee_name, date, start // 60, end // 60, start % 60, end % 60)
+
+
+def _find_appointment(calendar, data: list):
+    """Find the appointment serialized by _appointment_to_list in a calendar, or None."""
+    for appointment in calendar.appointments_on(data[1]):
+        if _appointment_to_list(appointment) == data:
+            return appointment
+    return None
+
+
+def _owner_to_dict(owner) -> dict:
+    """Serialize a CalendarOwner with its rule and appointments."""
+    return {"name": owner.name, "timezone": owner.timezone, "rule": owner.availability_rule.to_dict(),
+            "appointments": [_appointment_to_list(a) for a in owner.calendar.archived_appointments()]
+            + [_appointment_to_list(a) for a in owner.calendar.list_upcoming_appointments()]}
+
+
+def _owner_from_dict(owner_id: str, data: dict) -> CalendarOwner:
+    """Rebuild a CalendarOwner serialized by _owner_to_dict."""
+    owner = CalendarOwner(data["name"], AvailabilityRule.from_dict(data["rule"]), owner_id, data.get("timezone"))
+    for appointment in data["appointments"]:
+        owner.calendar.try_book(_appointment_from_list(appointment))
+    return owner
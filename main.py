@@ -2,6 +2,7 @@ from database.in_memory_database import InMemoryDatabase
 from models.calendar_owner import CalendarOwner
 from models.invitee import Invitee
 from models.availability_rule import AvailabilityRule
+from utils.log import configure_logging  # Prints booking and availability events
 from utils.utils import convert_to_24_hour, generate_uuid  # Utility for converting time to 24-hour format
 
 
@@ -22,15 +23,25 @@ def create_invitee(name, calendar_owner):
     """
     return Invitee(name, calendar_owner)
 
+def find_invitee(db, name):
+    """
+    Look up an invitee by name, printing a message if there is none.
+    """
+    matches = db.find_invitees_by_name(name)
+    if not matches:
+        print(f"No invitee named {name}.")
+        return None
+    return matches[0]
+
 def CLIInterface():
     """
     Main CLI interface for managing calendar scheduling.
     """
-    # Initialize lists for calendar owners and invitees
+    # Calendar owners and invitees are looked up through the database's name indexes
+    db = InMemoryDatabase.get_instance()
     noOfOwners = int(input("Enter number of Calendar owners: "))
     noOfInvitees = int(input("Enter number of Invitees: "))
     owners = []
-    invitees = []
     
     # Collect data for calendar owners
     print("Creating calendar owners...")
@@ -41,14 +52,16 @@ def CLIInterface():
             end_hour=int(convert_to_24_hour(input(f"Enter end hour for {owner_name}'s availability (1 PM, or 13): "))),
             days_of_week=set(input(f"Enter days of week for {owner_name} (comma separated, e.g., Monday,Tuesday): ").split(","))
         )
-        owners.append(create_calendar_owner(owner_name, availability_rule))
+        owner = create_calendar_owner(owner_name, availability_rule)
+        db.add_calendar_owner(owner.id, owner)
+        owners.append(owner)
     
     # Collect data for invitees
     print("Creating invitees...")
     for i in range(noOfInvitees):
         invitee_name = input(f"Enter name for invitee {i + 1}: ")
         owner_idx = int(input(f"Select a calendar owner for {invitee_name} (1-{noOfOwners}): ")) - 1
-        invitees.append(create_invitee(invitee_name, owners[owner_idx]))
+        owners[owner_idx].add_invitee(create_invitee(invitee_name, owners[owner_idx]))
     
     # Command options for scheduling operations
     while True:
@@ -62,8 +75,9 @@ def CLIInterface():
 
         if action == "1":
             # Search available slots for an invitee
-            invitee_name = input("Enter your name: ")
-            invitee = next(i for i in invitees if i.name == invitee_name)
+            invitee = find_invitee(db, input("Enter your name: "))
+            if invitee is None:
+                continue
             available_slots = invitee.search_available_slots()
             if available_slots:
                 print("Available slots:")
@@ -74,8 +88,9 @@ def CLIInterface():
         
         elif action == "2":
             # Book a time slot for an invitee
-            invitee_name = input("Enter your name: ")
-            invitee = next(i for i in invitees if i.name == invitee_name)
+            invitee = find_invitee(db, input("Enter your name: "))
+            if invitee is None:
+                continue
             date = input("Enter the date (e.g., 2024-12-31): ")
             day = input("Enter the day (e.g., Monday): ")
             start_time = input("Enter start time (e.g., 9 AM or 14): ")
@@ -86,11 +101,11 @@ def CLIInterface():
         elif action == "3":
             # List appointments for a calendar owner
             owner_name = input("Enter calendar owner's name: ")
-            owner_class = None
-            for owner in owners:
-                if owner.name == owner_name:
-                    owner_class = owner
-            appointments = owner_class.list_appointments()
+            matches = db.find_calendar_owners_by_name(owner_name)
+            if not matches:
+                print(f"No calendar owner named {owner_name}.")
+                continue
+            appointments = [appointment for owner in matches for appointment in owner.list_appointments()]
             if appointments:
                 for appointment in appointments:
                     print(appointment)
@@ -112,6 +127,9 @@ if __name__ == "__main__":
     # Run with this for CLI
     # main()
 
+    # Print booking, invitee and availability events, which the library keeps silent by default
+    configure_logging()
+
     # Initialize the singleton InMemoryDatabase instance
     db = InMemoryDatabase.get_instance()
 
@@ -200,4 +218,9 @@ if __name__ == "__main__":
     for appointment in owner2.list_appointments():
         print(appointment)
 
+    # Show Eve's bookings across every owner, found through the database's appointment index
+    print("\nAll bookings of Invitee5 (Eve):")
+    for owner_id, appointment in db.list_invitee_appointments("Eve"):
+        print(f"{db.get_calendar_owner(owner_id).name}: {appointment}")
+
 
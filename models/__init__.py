@@ -3,4 +3,5 @@ from .appointment import Appointment
 from .calendar import Calendar
 from .calendar_owner import CalendarOwner
 from .invitee import Invitee
-from .availability_rule import AvailabilityRule
\ No newline at end of file
+from .availability_rule import AvailabilityRule
+from .appointment_store import AppointmentColumns
\ No newline at end of file
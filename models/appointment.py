@@ -1,5 +1,98 @@
-class Appointment:
-    def __init__(self, invitee_name: str, date: str, start_hour: int, end_hour: int):
+import itertools
+import threading
+
+from utils.utils import format_minutes, iso_to_ordinal, ordinal_to_iso
+
+_invitee_ids = {}  # Maps an invitee name to its interned integer ID
+_invitee_names = []  # Maps an interned integer ID back to the invitee name
+_intern_lock = threading.Lock()
+_MINUTE_VALUES = tuple(range(24 * 60 + 1))  # Shared int objects for every minute of the day, so slots hold no private ints
+_appointment_ids = itertools.count(1)  # Source of appointment IDs; next() on a count is atomic under the GIL
+
+
+def intern_invitee(name: str) -> int:
+    """
+    Get the integer ID of an invitee name, assigning the next free ID on first use.
+
+    Args:
+        name (str): The invitee name.
+
+    Returns:
+        int: The interned ID. Every appointment of the same invitee shares it.
+    """
+    invitee_id = _invitee_ids.get(name)
+    if invitee_id is None:
+        with _intern_lock:
+            invitee_id = _invitee_ids.get(name)
+            if invitee_id is None:  # Another thread may have interned it while we waited
+                invitee_id = len(_invitee_names)
+                _invitee_names.append(name)
+                _invitee_ids[name] = invitee_id
+    return invitee_id
+
+
+class AppointmentFields:
+    """
+    Read-only appointment fields derived from four integers.
+
+    Subclasses provide invitee_id, date_ordinal, start_minutes and end_minutes, either as slots
+    (Appointment) or as reads from a column store (AppointmentView).
+    """
+    __slots__ = ()
+
+    @property
+    def invitee_name(self) -> str:
+        """str: The name of the invitee."""
+        return _invitee_names[self.invitee_id]
+
+    @property
+    def date(self) -> str:
+        """str: The appointment date in YYYY-MM-DD format."""
+        return ordinal_to_iso(self.date_ordinal)
+
+    @property
+    def start_hour(self) -> int:
+        """int: The starting hour of the appointment (24-hour format)."""
+        return self.start_minutes // 60
+
+    @property
+    def end_hour(self) -> int:
+        """int: The ending hour of the appointment (24-hour format)."""
+        return self.end_minutes // 60
+
+    @property
+    def start_minute(self) -> int:
+        """int: Minutes past the starting hour."""
+        return self.start_minutes % 60
+
+    @property
+    def end_minute(self) -> int:
+        """int: Minutes past the ending hour."""
+        return self.end_minutes % 60
+
+    def __str__(self):
+        """
+        String representation of the appointment.
+
+        Returns:
+            str: Formatted string with appointment details.
+        """
+        return (f"Date: {self.date}, Time: {format_minutes(self.start_minutes)} - {format_minutes(self.end_minutes)}, "
+                f"Invitee: {self.invitee_name}")
+
+
+class Appointment(AppointmentFields):
+    """
+    A booked time range.
+
+    Stored compactly in five slots: the appointment ID, the interned invitee ID, the date as an
+    ordinal and the start and end in minutes since midnight. Names, date strings and hours are
+    derived on access. The ID addresses the booking in Calendar.cancel and Calendar.reschedule.
+    """
+    __slots__ = ("id", "invitee_id", "date_ordinal", "start_minutes", "end_minutes")
+
+    def __init__(self, invitee_name: str, date: str, start_hour: int, end_hour: int,
+                 start_minute: int = 0, end_minute: int = 0):
         """
         Initialize an Appointment.
 
@@ -8,17 +101,19 @@ class Appointment:
             date (str): The date of the appointment in YYYY-MM-DD format.
             start_hour (int): The starting hour of the appointment (24-hour format).
             end_hour (int): The ending hour of the appointment (24-hour format).
-        """
-        self.invitee_name = invitee_name  # Name of the person who booked the appointment
-        self.date = date  # Appointment date in the format YYYY-MM-DD
-        self.start_hour = start_hour  # Start time in 24-hour format (e.g., 10 for 10 AM)
-        self.end_hour = end_hour  # End time in 24-hour format (e.g., 11 for 11 AM)
-
-    def __str__(self):
-        """
-        String representation of the appointment.
+            start_minute (int): Minutes past the starting hour, default is 0.
+            end_minute (int): Minutes past the ending hour, default is 0.
 
-        Returns:
-            str: Formatted string with appointment details.
+        Raises:
+            ValueError: If an hour is not between 0 and 24, a minute not between 0 and 59, or a time is after 24:00.
         """
-        return f"Date: {self.date}, Time: {self.start_hour}:00 - {self.end_hour}:00, Invitee: {self.invitee_name}"
+        start = start_hour * 60 + start_minute
+        end = end_hour * 60 + end_minute
+        if not (0 <= start_hour <= 24 and 0 <= end_hour <= 24 and 0 <= start_minute < 60 and 0 <= end_minute < 60
+                and start <= 24 * 60 and end <= 24 * 60):
+            raise ValueError(f"Invalid appointment time: {start_hour}:{start_minute:02d} - {end_hour}:{end_minute:02d}.")
+        self.id = next(_appointment_ids)  # Stable ID of the booking, kept when it is rescheduled
+        self.invitee_id = intern_invitee(invitee_name)  # Interned ID of the person who booked the appointment
+        self.date_ordinal = iso_to_ordinal(date)  # Appointment date as a proleptic Gregorian ordinal
+        self.start_minutes = _MINUTE_VALUES[start]  # Start in minutes since midnight (e.g., 630 for 10:30)
+        self.end_minutes = _MINUTE_VALUES[end]  # End in minutes since midnight (e.g., 690 for 11:30)
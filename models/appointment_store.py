@@ -0,0 +1,154 @@
+from array import array
+import zlib
+
+from models.appointment import Appointment, AppointmentFields
+
+
+class AppointmentView(AppointmentFields):
+    """
+    A lightweight, read-only view of one row of an AppointmentColumns store.
+
+    It behaves like an Appointment but holds only a reference to the store and a row index.
+    """
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "AppointmentColumns", row: int):
+        self._store = store
+        self._row = row
+
+    @property
+    def id(self) -> int:
+        """int: The appointment ID."""
+        return self._store.ids[self._row]
+
+    @property
+    def invitee_id(self) -> int:
+        """int: The interned invitee ID."""
+        return self._store.invitee_ids[self._row]
+
+    @property
+    def date_ordinal(self) -> int:
+        """int: The appointment date as a proleptic Gregorian ordinal."""
+        return self._store.dates[self._row]
+
+    @property
+    def start_minutes(self) -> int:
+        """int: Start of the appointment in minutes since midnight."""
+        return self._store.starts[self._row]
+
+    @property
+    def end_minutes(self) -> int:
+        """int: End of the appointment in minutes since midnight."""
+        return self._store.ends[self._row]
+
+    def to_appointment(self) -> Appointment:
+        """Copy the row into a standalone Appointment with the same ID."""
+        appointment = Appointment.__new__(Appointment)  # Skip parsing: the fields are already integers
+        appointment.id = self.id
+        appointment.invitee_id = self.invitee_id
+        appointment.date_ordinal = self.date_ordinal
+        appointment.start_minutes = self.start_minutes
+        appointment.end_minutes = self.end_minutes
+        return appointment
+
+
+class AppointmentColumns:
+    """
+    A columnar appointment store: one array per field, 24 bytes per appointment.
+
+    Iterating or indexing yields AppointmentView objects created on demand, so the store itself
+    holds no per-appointment Python objects.
+
+    Attributes:
+        ids (array): Appointment IDs, array('q') since they count up for the life of the process.
+        invitee_ids (array): Interned invitee IDs.
+        dates (array): Dates as proleptic Gregorian ordinals.
+        starts (array): Start times in minutes since midnight.
+        ends (array): End times in minutes since midnight.
+    """
+
+    def __init__(self, appointments=()):
+        """
+        Initialize the store.
+
+        Args:
+            appointments (iterable): Appointment objects to copy in, default is none.
+        """
+        self.ids = array("q")
+        self.invitee_ids = array("i")
+        self.dates = array("i")
+        self.starts = array("i")
+        self.ends = array("i")
+        self.extend(appointments)
+
+    def append(self, appointment):
+        """
+        Copy an appointment into the store.
+
+        Args:
+            appointment (Appointment): The appointment to store.
+        """
+        self.ids.append(appointment.id)
+        self.invitee_ids.append(appointment.invitee_id)
+        self.dates.append(appointment.date_ordinal)
+        self.starts.append(appointment.start_minutes)
+        self.ends.append(appointment.end_minutes)
+
+    def extend(self, appointments):
+        """
+        Copy many appointments into the store.
+
+        Args:
+            appointments (iterable): Appointment objects to store.
+        """
+        for appointment in appointments:
+            self.append(appointment)
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __getitem__(self, row: int) -> AppointmentView:
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("appointment index out of range")
+        return AppointmentView(self, row)
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield AppointmentView(self, row)
+
+    def compress(self, level: int = 6) -> bytes:
+        """
+        Pack the columns into one zlib-compressed blob.
+
+        Appointment and invitee IDs are per process, so the blob is only meaningful in the process that wrote it.
+
+        Args:
+            level (int): zlib compression level, default is 6.
+
+        Returns:
+            bytes: The five columns back to back, compressed.
+        """
+        return zlib.compress(b"".join(column.tobytes() for column in
+                                      (self.ids, self.invitee_ids, self.dates, self.starts, self.ends)), level)
+
+    @classmethod
+    def decompress(cls, data: bytes) -> "AppointmentColumns":
+        """
+        Rebuild a store packed by compress.
+
+        Args:
+            data (bytes): The compressed blob.
+
+        Returns:
+            AppointmentColumns: A new store with the same rows.
+        """
+        store = cls()
+        raw = zlib.decompress(data)
+        rows = len(raw) // (store.ids.itemsize + 4 * store.dates.itemsize)
+        offset = 0
+        for column in (store.ids, store.invitee_ids, store.dates, store.starts, store.ends):
+            column.frombytes(raw[offset:offset + rows * column.itemsize])
+            offset += rows * column.itemsize
+        return store
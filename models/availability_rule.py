@@ -1,6 +1,27 @@
-class AvailabilityRule:
+from datetime import date
+
+from models.observable import Observable
+from utils.log import get_logger
+from utils.utils import SLOT_MINUTES, WEEKDAYS, convert_to_minutes, iso_to_ordinal, slot_range_mask
+
+_log = get_logger("availability_rule")
+
+
+class AvailabilityRule(Observable):
     """
     A class to define and manage availability rules for specific days and time slots.
+
+    The weekly pattern is one start_hour - end_hour window on each of days_of_week. set_windows
+    gives chosen weekdays several windows instead (e.g. 9-12 and 13-17), set_override replaces the
+    pattern on a specific date (e.g. a holiday with no windows), and set_recurrence makes the weekly
+    pattern apply only every n-th week. Date overrides apply in every week.
+
+    Every change compiles the rule into one slot bitmask per weekday plus a map of date overrides,
+    so slot_mask and is_valid_slot are a dictionary lookup and a bitwise AND however many windows
+    and exceptions the rule has.
+
+    Observers added with add_observer receive ("rule_updated", rule) after every change, which
+    also bumps generation so cached searches know to start over.
     """
 
     def __init__(self, start_hour: int = 10, end_hour: int = 17, days_of_week=None):
@@ -16,11 +37,20 @@ class AvailabilityRule:
         self.start_hour = start_hour
         self.end_hour = end_hour
         self.days_of_week = days_of_week
+        self.windows = {}  # Maps a weekday to its (start_minutes, end_minutes) windows, in place of start_hour - end_hour
+        self.overrides = {}  # Maps a YYYY-MM-DD date to its windows, in place of the weekly pattern
+        self.every_weeks = 1  # The weekly pattern applies every n-th week
+        self.anchor = None  # A YYYY-MM-DD date in a week where the pattern applies, used when every_weeks > 1
+        self.generation = 0  # Incremented by every change
+        self._compile()
 
     def update_rule(self, start_hour: int, end_hour: int, days_of_week: set):
         """
         Update the availability rule with new time and days.
 
+        This replaces the whole weekly pattern, including windows set with set_windows. Date
+        overrides and the recurrence are kept.
+
         :param start_hour: New start hour in 24-hour format.
         :param end_hour: New end hour in 24-hour format.
         :param days_of_week: A new set of days on which the rule applies.
@@ -28,14 +58,68 @@ class AvailabilityRule:
         """
         # Validate time slot
         if start_hour >= end_hour:
-            print(f"Invalid slot: {start_hour}:00 - {end_hour}:00")
+            _log.warning("Invalid slot: %d:00 - %d:00", start_hour, end_hour, extra={"event": "rule_rejected"})
             raise ValueError("Start hour must be less than end hour.")
 
         # Update rule properties
         self.start_hour = start_hour
         self.end_hour = end_hour
         self.days_of_week = days_of_week
-        print(f"Updated availability: {start_hour}:00 - {end_hour}:00 on {days_of_week}")
+        self.windows = {}
+        _log.info("Updated availability: %d:00 - %d:00 on %s", start_hour, end_hour, days_of_week,
+                  extra={"event": "rule_updated"})
+        self._changed()
+
+    def set_windows(self, days_of_week, windows):
+        """
+        Give weekdays their own availability windows, replacing start_hour - end_hour on those days.
+
+        :param days_of_week: The days to change (e.g. {"Monday", "Friday"}).
+        :param windows: (start, end) pairs as minutes since midnight or time strings (e.g. [("9 AM", "12 PM"),
+            ("1 PM", "5 PM")]). An empty list makes the days unavailable.
+        :raises ValueError: If a window is empty, reversed, outside the day or not on quarter hours.
+        """
+        windows = _normalize_windows(windows)
+        self.windows = {**self.windows, **{day: windows for day in days_of_week}}
+        self._changed()
+
+    def set_override(self, on_date, windows=()):
+        """
+        Replace the weekly pattern on one date.
+
+        :param on_date: The date, as a datetime.date or YYYY-MM-DD string.
+        :param windows: (start, end) pairs as for set_windows. Defaults to none, e.g. for a holiday.
+        :raises ValueError: If a window is empty, reversed, outside the day or not on quarter hours.
+        """
+        key = on_date if isinstance(on_date, str) else on_date.isoformat()
+        self.overrides = {**self.overrides, key: _normalize_windows(windows)}
+        self._changed()
+
+    def remove_override(self, on_date):
+        """
+        Go back to the weekly pattern on a date with an override.
+
+        :param on_date: The date, as a datetime.date or YYYY-MM-DD string.
+        """
+        key = on_date if isinstance(on_date, str) else on_date.isoformat()
+        self.overrides = {day: windows for day, windows in self.overrides.items() if day != key}
+        self._changed()
+
+    def set_recurrence(self, every_weeks: int = 1, anchor=None):
+        """
+        Apply the weekly pattern only every n-th week.
+
+        :param every_weeks: 1 for every week, 2 for every other week and so on.
+        :param anchor: A date in a week where the pattern applies, as a datetime.date or YYYY-MM-DD
+            string. Defaults to today.
+        :raises ValueError: If every_weeks is less than 1.
+        """
+        if every_weeks < 1:
+            raise ValueError("every_weeks must be at least 1.")
+        anchor = anchor or date.today()
+        self.every_weeks = every_weeks
+        self.anchor = anchor if isinstance(anchor, str) else anchor.isoformat()
+        self._changed()
 
     def is_valid_slot(self, day: str, start_hour: int, end_hour: int) -> bool:
         """
@@ -46,13 +130,130 @@ class AvailabilityRule:
         :param end_hour: End hour in 24-hour format.
         :return: True if the slot is valid, otherwise False.
         """
-        # Ensure the availability rule itself is valid
-        if self.start_hour >= self.end_hour:
-            return False
+        return self.is_available(day, start_hour * 60, end_hour * 60)
+
+    def is_available(self, day: str, start_minutes: int, end_minutes: int, on_date=None) -> bool:
+        """
+        Check if a time range falls entirely within the rule's windows.
+
+        :param day: The day of the week (e.g., "Monday").
+        :param start_minutes: Start of the range in minutes since midnight.
+        :param end_minutes: End of the range in minutes since midnight.
+        :param on_date: The date, to apply overrides and the recurrence (datetime.date or YYYY-MM-DD).
+        :return: True if every slot of the range is available, otherwise False.
+        """
+        needed = slot_range_mask(start_minutes, end_minutes)
+        return start_minutes < end_minutes and self.slot_mask(day, on_date) & needed == needed
+
+    def slot_mask(self, day: str, on_date=None) -> int:
+        """
+        Build the availability of a day as a bitmask of booking slots.
+
+        :param day: The day of the week (e.g., "Monday").
+        :param on_date: The date, to apply overrides and the recurrence (datetime.date or YYYY-MM-DD).
+            Without it only the weekly pattern is used.
+        :return: An int with bit i set when slot i of the day is available (see utils.SLOT_MINUTES).
+        """
+        if on_date is not None:
+            if isinstance(on_date, str):
+                override = self._override_masks.get(on_date)
+                ordinal = iso_to_ordinal(on_date) if override is None and self.every_weeks > 1 else 0
+            else:
+                override = self._override_masks.get(on_date.isoformat()) if self._override_masks else None
+                ordinal = on_date.toordinal()
+            if override is not None:
+                return override
+            if self.every_weeks > 1 and (ordinal - self._first_monday) // 7 % self.every_weeks:
+                return 0  # An off week of the recurrence
+        return self._masks.get(day, 0)
+
+    def date_mask(self, on_date: date) -> int:
+        """
+        Build the availability of a date as a bitmask of booking slots.
+
+        :param on_date: The date.
+        :return: An int with bit i set when slot i of the date is available.
+        """
+        return self.slot_mask(WEEKDAYS[on_date.weekday()], on_date)
+
+    def to_dict(self) -> dict:
+        """
+        Serialize the rule as plain JSON-compatible data.
+
+        :return: A dict accepted by from_dict and restore.
+        """
+        return {"start_hour": self.start_hour, "end_hour": self.end_hour, "days_of_week": sorted(self.days_of_week),
+                "windows": {day: [list(window) for window in windows] for day, windows in self.windows.items()},
+                "overrides": {day: [list(window) for window in windows] for day, windows in self.overrides.items()},
+                "every_weeks": self.every_weeks, "anchor": self.anchor}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AvailabilityRule":
+        """
+        Build a rule serialized by to_dict. Keys other than the hours and days are optional.
+
+        :param data: The serialized rule.
+        :return: A new AvailabilityRule.
+        """
+        rule = cls(data["start_hour"], data["end_hour"], set(data["days_of_week"]))
+        rule._load(data)
+        return rule
+
+    def restore(self, data: dict):
+        """
+        Replace the whole rule with one serialized by to_dict, notifying observers once.
+
+        :param data: The serialized rule.
+        """
+        self.start_hour, self.end_hour, self.days_of_week = data["start_hour"], data["end_hour"], set(data["days_of_week"])
+        self._load(data)
+        self._changed()
+
+    def _load(self, data: dict):
+        """Set the windows, overrides and recurrence from serialized data and compile."""
+        self.windows = {day: _normalize_windows(windows) for day, windows in data.get("windows", {}).items()}
+        self.overrides = {day: _normalize_windows(windows) for day, windows in data.get("overrides", {}).items()}
+        self.every_weeks = data.get("every_weeks", 1)
+        self.anchor = data.get("anchor")
+        self._compile()
+
+    def _changed(self):
+        """Recompile after a change and tell the observers."""
+        self._compile()
+        self.generation += 1
+        self._notify("rule_updated", self)
+
+    def _compile(self):
+        """Precompute the slot mask of every weekday and overridden date."""
+        weekly = slot_range_mask(self.start_hour * 60, self.end_hour * 60) if self.start_hour < self.end_hour else 0
+        masks = {day: weekly for day in self.days_of_week}
+        masks.update((day, _windows_mask(windows)) for day, windows in self.windows.items())
+        self._masks = masks
+        self._override_masks = {day: _windows_mask(windows) for day, windows in self.overrides.items()}
+        anchor = iso_to_ordinal(self.anchor) if self.anchor else 0
+        self._first_monday = anchor - (anchor - 1) % 7  # Ordinal 1 (0001-01-01) is a Monday
+
+
+def _normalize_windows(windows) -> tuple:
+    """
+    Convert (start, end) pairs to sorted (start_minutes, end_minutes) tuples, checking each one.
+
+    Both ends must fall on a utils.SLOT_MINUTES boundary: the masks work in whole slots, so a
+    window such as 9:10 - 10:50 would otherwise offer the partly covered slots at either end.
+    """
+    result = []
+    for start, end in windows:
+        start = start if isinstance(start, int) else convert_to_minutes(start)
+        end = end if isinstance(end, int) else convert_to_minutes(end)
+        if not 0 <= start < end <= 24 * 60 or start % SLOT_MINUTES or end % SLOT_MINUTES:
+            raise ValueError(f"Invalid availability window: {start} - {end} minutes.")
+        result.append((start, end))
+    return tuple(sorted(result))
+
 
-        # Check if the day and hours fall within the rule's constraints
-        return (
-            day in self.days_of_week
-            and self.start_hour <= start_hour
-            and self.end_hour >= end_hour
-        )
+def _windows_mask(windows) -> int:
+    """OR together the slot masks of (start_minutes, end_minutes) windows."""
+    mask = 0
+    for start, end in windows:
+        mask |= slot_range_mask(start, end)
+    return mask
@@ -1,11 +1,213 @@
-class Calendar:
+from bisect import bisect_left, bisect_right, insort
+from collections import namedtuple
+import datetime
+import threading
+import time
+
+from models.appointment import Appointment
+from models.appointment_store import AppointmentColumns
+from models.observable import Observable
+from utils.log import get_logger
+from utils.timer_wheel import TimerWheel
+from utils.utils import SLOT_MINUTES, slot_range_mask
+
+_log = get_logger("calendar")
+HOLD_TICK_SECONDS = 1.0  # Resolution of hold expiry
+
+
+class RetentionPolicy(namedtuple("RetentionPolicy", ["hot_months", "retention_months"], defaults=(0, None))):
+    """
+    How long a Calendar keeps months hot, and how long it keeps them at all.
+
+    Attributes:
+        hot_months (int): Past months kept hot besides the current one and the future, default is 0.
+        retention_months (int): Months before the current one kept in the archive; older months
+            are dropped. None, the default, keeps every archived month.
+    """
+    __slots__ = ()
+
+
+_ArchivedMonth = namedtuple("_ArchivedMonth", ["data", "count", "busy_masks"])  # Compressed columns, rows, date -> busy mask
+
+
+class _DaySchedule:
+    """
+    The appointments of a single date, kept sorted by start time.
+
+    Start minutes, end minutes and appointments are stored in parallel lists so that
+    overlap queries are a single binary search over plain integers. add_appointment does not
+    check for conflicts, so bookings may nest (e.g. 10:00-10:30 inside 9:00-12:00). reach keeps
+    the running maximum of the end minutes, so the booking that ends latest among those starting
+    before the query end is found without scanning them.
+    """
+    __slots__ = ("starts", "ends", "reach", "appointments")
+
+    def __init__(self):
+        self.starts = []  # Start minutes, ascending
+        self.ends = []  # End minutes, parallel to starts
+        self.reach = []  # reach[i] is the latest end among appointments 0..i
+        self.appointments = []  # Appointment objects, parallel to starts
+
+    def insert(self, appointment):
+        """Insert an appointment at its sorted position."""
+        index = bisect_right(self.starts, appointment.start_minutes)
+        self.starts.insert(index, appointment.start_minutes)
+        self.ends.insert(index, appointment.end_minutes)
+        self.appointments.insert(index, appointment)
+        self._update_reach(index)
+
+    def remove(self, appointment) -> bool:
+        """Remove an appointment, found by binary search on its start. Returns False if it is not here."""
+        index = bisect_left(self.starts, appointment.start_minutes)
+        while index < len(self.starts) and self.starts[index] == appointment.start_minutes:
+            if self.appointments[index] is appointment:
+                del self.starts[index], self.ends[index], self.appointments[index]
+                self._update_reach(index)
+                return True
+            index += 1
+        return False
+
+    def overlaps(self, start_minutes: int, end_minutes: int, ignore=None) -> bool:
+        """Return True if any appointment but ignore intersects [start_minutes, end_minutes)."""
+        index = bisect_left(self.starts, end_minutes)  # Appointments before index start before the query ends
+        if not index or self.reach[index - 1] <= start_minutes:
+            return False
+        if ignore is None:
+            return True
+        for i in range(index - 1, -1, -1):  # Moving: look past the appointment being moved
+            if self.reach[i] <= start_minutes:
+                return False
+            if self.ends[i] > start_minutes and self.appointments[i] is not ignore:
+                return True
+        return False
+
+    def _update_reach(self, index: int):
+        """Recompute the running maximum of the end minutes from index on."""
+        reach = self.reach[index - 1] if index else 0
+        del self.reach[index:]
+        for end in self.ends[index:]:
+            if end > reach:
+                reach = end
+            self.reach.append(reach)
+
+    def busy_mask(self) -> int:
+        """OR together the slot masks of the appointments."""
+        mask = 0
+        for start, end in zip(self.starts, self.ends):
+            mask |= slot_range_mask(start, end)
+        return mask
+
+
+class AppointmentLog:
+    """
+    The hot appointments of a calendar in booking order, addressable by appointment ID.
+
+    Backed by an insertion-ordered dict, so appending and removing by ID are O(1). Otherwise it
+    reads like a list: len, iteration, indexing and comparison with lists. Iteration works on a
+    copy, so other threads may book while it runs.
+    """
+    __slots__ = ("_by_id", "_list")
+
+    def __init__(self, appointments=()):
+        self._by_id = {appointment.id: appointment for appointment in appointments}
+        self._list = None  # Cached list for indexing, dropped on every change
+
+    def append(self, appointment):
+        """Add an appointment at the end, or in place of the appointment with the same ID."""
+        self._by_id[appointment.id] = appointment
+        self._list = None
+
+    def get(self, appointment_id: int):
+        """Return the appointment with an ID, or None."""
+        return self._by_id.get(appointment_id)
+
+    def pop(self, appointment_id: int):
+        """Remove and return the appointment with an ID, or None."""
+        self._list = None
+        return self._by_id.pop(appointment_id, None)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        return iter(list(self._by_id.values()))
+
+    def __getitem__(self, index):
+        items = self._list
+        if items is None:
+            items = self._list = list(self._by_id.values())
+        return items[index]
+
+    def __eq__(self, other):
+        if isinstance(other, (AppointmentLog, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"AppointmentLog({list(self)!r})"
+
+
+class Calendar(Observable):
+    """
+    The appointments of one calendar owner, indexed by date for fast conflict checks.
+
+    Observers added with add_observer receive ("appointment_added", appointment) after every booking,
+    ("appointment_cancelled", appointment) after a cancellation and ("appointment_rescheduled",
+    (old, new)) after a move. Tiering moves are announced too: ("appointments_archived", appointments)
+    when compaction moves hot appointments to the archive, ("appointments_thawed", appointments)
+    when a booking brings an archived month back, and ("appointments_dropped", month) when
+    retention deletes the archived months before month (YYYY-MM). Every appointment keeps its ID, so cancel and reschedule address
+    bookings by ID and removal is a dict pop plus a binary search in the date's schedule.
+
+    Every change bumps the calendar's generation and records it as the generation of the changed
+    date, so caches can tell which dates changed since they last looked (see day_generation).
+
+    Appointments are partitioned by month into two tiers. Hot months live in the appointment list
+    and the per-date indexes. With a RetentionPolicy set, the first booking of each new month
+    compacts older months into a cold archive: one zlib-compressed AppointmentColumns blob per
+    month, plus the busy mask of each booked date, so conflict checks on archived dates still work
+    without decompressing. list_upcoming_appointments and the indexes then only hold hot months.
+    Archived rows keep their appointment IDs, so booking into an archived month moves that month
+    back to the hot tier with the same IDs, until the next compaction.
+
+    hold reserves a slot for a few minutes without booking it. A held slot is in the per-date
+    indexes and busy masks, so it blocks searches and bookings, but it is not an appointment until
+    confirm. Expiry deadlines sit in a TimerWheel that is advanced lazily: booking paths, holds and
+    free/busy searches (through expire_holds) release whatever expired since the last call, with
+    no timer threads or scans of outstanding holds. A hold may block searches up to
+    HOLD_TICK_SECONDS past its TTL, but confirm always refuses it once the TTL has passed.
+
+    Stores that must agree to a booking, such as a SQL database shared between processes, register
+    a guard with add_booking_guard. Guards run under the calendar lock after the calendar's own
+    conflict check and can refuse the booking before anything changes.
+
+    Thread safety: every Calendar carries its own lock, so bookings for different owners never
+    contend while bookings for the same owner are serialized. try_book is an atomic
+    check-and-book; add_appointment only guarantees the indexes stay consistent and does not
+    check for conflicts. Queries may be called from any thread.
+    """
+
     def __init__(self):
         """
         Initialize the Calendar.
 
-        The calendar starts with an empty list of appointments.
+        The calendar starts with an empty list of appointments and an empty per-date interval index.
         """
-        self.appointments = []  # List of Appointment objects, initially empty.
+        self._lock = threading.Lock()  # Guards the appointment list and the indexes below.
+        self.appointments = AppointmentLog()  # Hot Appointment objects by ID, in booking order.
+        self._days = {}  # Maps a date (YYYY-MM-DD) to the _DaySchedule of its appointments.
+        self._dates = []  # Sorted list of dates that have at least one appointment.
+        self._busy_masks = {}  # Maps a date (YYYY-MM-DD) to a bitmask of its booked slots.
+        self.generation = 0  # Incremented on every change to the calendar.
+        self._day_generations = {}  # Maps a date (YYYY-MM-DD) to the generation of its last change.
+        self.retention_policy = None  # RetentionPolicy, None keeps every month hot.
+        self._archive = {}  # Maps a month (YYYY-MM) to its _ArchivedMonth. Replaced, never mutated, so reads need no lock.
+        self._compacted_month = None  # The month (YYYY-MM) during which compact last ran.
+        self._holds = {}  # Maps a held appointment ID to (Appointment, expiry time on time.monotonic).
+        self._hold_wheel = None  # TimerWheel of hold expiries, created by the first hold.
+        self._guards = ()  # Booking guards, replaced on every change like the observers.
 
     def add_appointment(self, appointment):
         """
@@ -13,16 +215,611 @@ class Calendar:
 
         Args:
             appointment (Appointment): The appointment object to be added.
+
+        Raises:
+            ValueError: If a booking guard refuses the appointment.
+        """
+        with self._lock:
+            if self._archive:
+                self._thaw(appointment.date)
+            if self._guards and not self._guarded(appointment):
+                raise ValueError(f"Appointment refused by a booking guard: {appointment}")
+            self.appointments.append(appointment)  # Add the provided appointment to the list
+            self._index_appointment(appointment)  # Keep the interval index in sync
+            self._notify("appointment_added", appointment)  # Under the lock so observers see bookings in order
+        _log.info("Appointment added: %s", appointment, extra={"event": "appointment_added"})  # Formatted only if emitted
+        if self.retention_policy is not None:
+            self._compact_monthly()
+
+    def try_book(self, appointment) -> bool:
+        """
+        Atomically add an appointment unless it overlaps an existing one.
+
+        The conflict check and the insert happen under the calendar lock, so two threads racing
+        for the same slot can never both succeed.
+
+        Args:
+            appointment (Appointment): The appointment to book.
+
+        Returns:
+            bool: True if the appointment was added, False if the slot was already taken.
+        """
+        with self._lock:
+            if self._archive:
+                self._thaw(appointment.date)
+            if self._holds:
+                self._expire_holds(time.monotonic())
+            day = self._days.get(appointment.date)
+            if day is not None and day.overlaps(appointment.start_minutes, appointment.end_minutes):
+                return False
+            if self._guards and not self._guarded(appointment):
+                return False
+            self.appointments.append(appointment)
+            self._index_appointment(appointment)
+            self._notify("appointment_added", appointment)
+        _log.info("Appointment added: %s", appointment, extra={"event": "appointment_added"})
+        if self.retention_policy is not None:
+            self._compact_monthly()
+        return True
+
+    def bulk_try_book(self, appointments):
+        """
+        Atomically book many appointments, skipping any that overlap.
+
+        The whole batch is checked and applied under a single acquisition of the calendar lock.
+        Appointments are checked against existing bookings and against earlier ones in the batch.
+
+        Args:
+            appointments (list): The Appointment objects to book.
+
+        Returns:
+            list: One bool per appointment, True if it was added.
+        """
+        results = []
+        with self._lock:
+            if self._holds:
+                self._expire_holds(time.monotonic())
+            for appointment in appointments:
+                date = appointment.date  # Derived from the ordinal, so look it up once
+                if self._archive:
+                    self._thaw(date)
+                day = self._days.get(date)
+                if day is not None and day.overlaps(appointment.start_minutes, appointment.end_minutes) \
+                        or self._guards and not self._guarded(appointment):
+                    results.append(False)
+                    continue
+                self.appointments.append(appointment)
+                self._index_appointment(appointment, date)
+                self._notify("appointment_added", appointment)
+                results.append(True)
+        _log.info("%d of %d appointments added in bulk.", results.count(True), len(results),
+                  extra={"event": "bulk_booked"})
+        if self.retention_policy is not None:
+            self._compact_monthly()
+        return results
+
+    def hold(self, appointment, ttl_seconds: float = 300, now: float = None) -> bool:
+        """
+        Tentatively reserve a slot unless it overlaps a booking or another hold.
+
+        The hold blocks the slot until it is confirmed, released or ttl_seconds pass. It is not an
+        appointment yet: it is not listed, observers are not told and stores do not persist it.
+
+        Args:
+            appointment (Appointment): The appointment to hold. Its ID addresses the hold.
+            ttl_seconds (float): Seconds until the hold expires, default is 300.
+            now (float): The current time on time.monotonic, defaults to now.
+
+        Returns:
+            bool: True if the slot is now held, False if it was taken.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._archive:
+                self._thaw(appointment.date)
+            if self._holds:
+                self._expire_holds(now)
+            day = self._days.get(appointment.date)
+            if day is not None and day.overlaps(appointment.start_minutes, appointment.end_minutes):
+                return False
+            if self._hold_wheel is None:
+                self._hold_wheel = TimerWheel(HOLD_TICK_SECONDS, now=now)
+            self._index_appointment(appointment)
+            self._holds[appointment.id] = (appointment, now + ttl_seconds)
+            self._hold_wheel.add(appointment.id, now + ttl_seconds)
+        return True
+
+    def confirm(self, appointment_id: int, now: float = None) -> bool:
+        """
+        Turn a hold into a booked appointment, keeping its ID.
+
+        Args:
+            appointment_id (int): The ID of the held Appointment.
+            now (float): The current time on time.monotonic, defaults to now.
+
+        Returns:
+            bool: True if it was booked, False if there is no such hold or it expired.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._holds:
+                self._expire_holds(now)
+            held = self._holds.get(appointment_id)
+            if held is None:
+                return False
+            appointment, expires_at = held
+            if now >= expires_at or self._guards and not self._guarded(appointment):  # Expired, or a store refused
+                self._drop_hold(appointment_id)
+                return False
+            del self._holds[appointment_id]
+            self._hold_wheel.cancel(appointment_id)
+            self.appointments.append(appointment)  # Already indexed when it was held
+            self._notify("appointment_added", appointment)
+        _log.info("Appointment added: %s", appointment, extra={"event": "appointment_added"})
+        if self.retention_policy is not None:
+            self._compact_monthly()
+        return True
+
+    def release(self, appointment_id: int) -> bool:
+        """
+        Give up a hold, freeing its slot.
+
+        Args:
+            appointment_id (int): The ID of the held Appointment.
+
+        Returns:
+            bool: True if the hold was released, False if there is no such hold.
+        """
+        with self._lock:
+            if appointment_id not in self._holds:
+                return False
+            self._drop_hold(appointment_id)
+        return True
+
+    def expire_holds(self, now: float = None) -> int:
         """
-        self.appointments.append(appointment)  # Add the provided appointment to the list
-        print(f"Appointment added for {appointment.invitee_name} on {appointment.date} "
-              f"from {appointment.start_hour}:00 to {appointment.end_hour}:00.")  # Print confirmation message
+        Release the holds whose TTL passed. Costs one attribute check when there are no holds.
+
+        Args:
+            now (float): The current time on time.monotonic, defaults to now.
+
+        Returns:
+            int: Number of holds released.
+        """
+        if not self._holds:
+            return 0
+        now = time.monotonic() if now is None else now
+        if not self._hold_wheel.due(now):
+            return 0  # Nothing can have expired since the last tick
+        with self._lock:
+            return self._expire_holds(now)
+
+    def add_booking_guard(self, guard):
+        """
+        Let a store veto bookings before the calendar makes them.
+
+        The guard is called as guard(appointment, replaces) under the calendar lock, once the calendar
+        found no conflict of its own, for every booking, confirmed hold and move. replaces is the
+        appointment being moved by reschedule, otherwise None. Returning False refuses the booking
+        and leaves the calendar unchanged; the booking call then reports the slot as taken.
+
+        Args:
+            guard (callable): Called as guard(appointment, replaces), returning a bool.
+        """
+        self._guards = self._guards + (guard,)
+
+    def remove_booking_guard(self, guard):
+        """
+        Remove a guard previously passed to add_booking_guard.
+
+        Args:
+            guard (callable): The guard to remove.
+        """
+        self._guards = tuple(other for other in self._guards if other is not guard)
+
+    def get_appointment(self, appointment_id: int):
+        """
+        Look up a hot appointment by ID.
+
+        Args:
+            appointment_id (int): The Appointment.id.
+
+        Returns:
+            Appointment: The appointment, or None if there is none with that ID (or it was archived).
+        """
+        return self.appointments.get(appointment_id)
+
+    def cancel(self, appointment_id: int) -> bool:
+        """
+        Cancel an appointment, freeing its slot.
+
+        Args:
+            appointment_id (int): The Appointment.id.
+
+        Returns:
+            bool: True if it was cancelled, False if there is no hot appointment with that ID.
+        """
+        with self._lock:
+            appointment = self.appointments.pop(appointment_id)
+            if appointment is None:
+                return False
+            self._unindex_appointment(appointment)
+            self._notify("appointment_cancelled", appointment)
+        _log.info("Appointment cancelled: %s", appointment, extra={"event": "appointment_cancelled"})
+        return True
+
+    def reschedule(self, appointment_id: int, new_slot) -> bool:
+        """
+        Atomically move an appointment to another slot, keeping its ID and invitee.
+
+        Under the calendar lock the new slot is checked and claimed first and the old one released
+        after, so there is no moment when the booking holds neither. The new slot may overlap the
+        old one. Like try_book, only conflicts are checked, not availability.
+
+        Args:
+            appointment_id (int): The Appointment.id.
+            new_slot (tuple): (date, start_minutes, end_minutes), the date as YYYY-MM-DD or a
+                datetime.date, e.g. a FreeSlot.
+
+        Returns:
+            bool: True if it was moved, False if the new slot is taken.
+
+        Raises:
+            ValueError: If the new slot is empty, reversed, outside the day or not on utils.SLOT_MINUTES boundaries.
+            LookupError: If there is no hot appointment with that ID.
+        """
+        day, start_minutes, end_minutes = new_slot
+        if not 0 <= start_minutes < end_minutes <= 24 * 60 or start_minutes % SLOT_MINUTES or end_minutes % SLOT_MINUTES:
+            raise ValueError(f"Invalid slot: {start_minutes} - {end_minutes} minutes.")
+        date = day if isinstance(day, str) else day.isoformat()
+        with self._lock:
+            old = self.appointments.get(appointment_id)
+            if old is None:
+                raise LookupError(f"Unknown appointment ID: {appointment_id}")
+            if self._archive:
+                self._thaw(date)
+            if self._holds:
+                self._expire_holds(time.monotonic())
+            schedule = self._days.get(date)
+            if schedule is not None and schedule.overlaps(start_minutes, end_minutes, ignore=old):
+                return False
+            new = Appointment(old.invitee_name, date, start_minutes // 60, end_minutes // 60,
+                              start_minutes % 60, end_minutes % 60)
+            new.id = old.id
+            if self._guards and not self._guarded(new, old):
+                return False
+            self._index_appointment(new)  # Claim the new slot
+            self.appointments.append(new)  # Same ID: replaces the old one in place
+            self._unindex_appointment(old)  # Then release the old slot
+            self._notify("appointment_rescheduled", (old, new))
+        _log.info("Appointment rescheduled: %s", new, extra={"event": "appointment_rescheduled"})
+        return True
+
+    def overlaps(self, date: str, start_minutes: int, end_minutes: int) -> bool:
+        """
+        Check whether a time range on a given date intersects an existing appointment.
+
+        Args:
+            date (str): The date to check in YYYY-MM-DD format.
+            start_minutes (int): Start of the range in minutes since midnight.
+            end_minutes (int): End of the range in minutes since midnight (exclusive).
+
+        Returns:
+            bool: True if an appointment overlaps the range, False otherwise.
+        """
+        with self._lock:
+            if self._holds:
+                self._expire_holds(time.monotonic())
+            day = self._days.get(date)
+            if day is not None:
+                return day.overlaps(start_minutes, end_minutes)
+        if self._archive:
+            return bool(self._archived_busy_mask(date) & slot_range_mask(start_minutes, end_minutes))
+        return False
+
+    def is_booked(self, date: str, hour: int) -> bool:
+        """
+        Check whether any part of an hour on a given date is already booked.
+
+        Args:
+            date (str): The date to check in YYYY-MM-DD format.
+            hour (int): The hour to check (24-hour format).
+
+        Returns:
+            bool: True if an appointment covers part of the hour, False otherwise.
+        """
+        return self.overlaps(date, hour * 60, hour * 60 + 60)
+
+    def busy_mask(self, date: str) -> int:
+        """
+        Get the booked slots of a date as a bitmask.
+
+        Args:
+            date (str): The date in YYYY-MM-DD format.
+
+        Returns:
+            int: Bit i is set when slot i of the day (see utils.SLOT_MINUTES) is at least partly booked.
+        """
+        mask = self._busy_masks.get(date)
+        if mask is None:
+            return self._archived_busy_mask(date) if self._archive else 0
+        return mask
+
+    def day_generation(self, date: str) -> int:
+        """
+        Get the generation of the last change on a date.
+
+        Args:
+            date (str): The date in YYYY-MM-DD format.
+
+        Returns:
+            int: The calendar generation when the date last changed, 0 if it never did.
+        """
+        return self._day_generations.get(date, 0)
+
+    def appointments_on(self, date: str):
+        """
+        List the appointments on a given date.
+
+        Args:
+            date (str): The date in YYYY-MM-DD format.
+
+        Returns:
+            list: Appointment objects on that date, ordered by start time.
+        """
+        with self._lock:
+            day = self._days.get(date)
+            if day is not None:
+                return [appointment for appointment in day.appointments if appointment.id not in self._holds]
+        return self.archived_appointments(date, date)
+
+    def appointments_between(self, start_date: str, end_date: str):
+        """
+        List the appointments between two dates, both inclusive.
+
+        Args:
+            start_date (str): The first date in YYYY-MM-DD format.
+            end_date (str): The last date in YYYY-MM-DD format.
+
+        Returns:
+            list: Appointment objects in the range, ordered by date and start time.
+        """
+        with self._lock:
+            first = bisect_left(self._dates, start_date)
+            last = bisect_right(self._dates, end_date)
+            hot = [appointment for date in self._dates[first:last] for appointment in self._days[date].appointments
+                   if appointment.id not in self._holds]
+        if not self._archive:
+            return hot
+        return sorted(hot + self.archived_appointments(start_date, end_date), key=_chronological)
 
     def list_upcoming_appointments(self):
         """
-        List all upcoming appointments.
+        List the appointments of the hot months.
+
+        Without a retention policy that is every appointment, past ones included.
+
+        Returns:
+            list: The hot Appointment objects in booking order.
+        """
+        return self.appointments
+
+    def archived_appointments(self, start_date: str = None, end_date: str = None):
+        """
+        List the appointments of the archived months, decompressing them.
+
+        Takes no lock, so it is safe to call from observers and while holding other locks.
+
+        Args:
+            start_date (str): The first date in YYYY-MM-DD format, default is the oldest.
+            end_date (str): The last date in YYYY-MM-DD format, default is the newest.
+
+        Returns:
+            list: Read-only AppointmentView objects ordered by date and start time.
+        """
+        archive = self._archive
+        first = start_date[:7] if start_date else ""
+        last = end_date[:7] if end_date else "~"  # Sorts after every YYYY-MM
+        views = []
+        for month in sorted(month for month in archive if first <= month <= last):
+            views.extend(view for view in AppointmentColumns.decompress(archive[month].data)
+                         if (start_date is None or view.date >= start_date) and (end_date is None or view.date <= end_date))
+        return views
+
+    def archived_months(self):
+        """
+        List the months held in the archive. Takes no lock.
+
+        Returns:
+            list: Months in YYYY-MM format, oldest first.
+        """
+        return sorted(self._archive)
+
+    def set_retention_policy(self, policy: RetentionPolicy = None):
+        """
+        Set how long months stay hot and archived, and compact right away.
+
+        Args:
+            policy (RetentionPolicy): The policy, None to stop compacting. Archived months stay archived.
+        """
+        self.retention_policy = policy
+        self._compacted_month = None
+        if policy is not None:
+            self._compact_monthly()
+
+    def compact(self, today: datetime.date = None):
+        """
+        Archive the hot months before the policy's hot window and drop archived months past retention.
+
+        Args:
+            today (datetime.date): The date the months are counted from, defaults to today.
 
         Returns:
-            list: A list of all Appointment objects currently in the calendar.
+            tuple: (appointments archived, appointments dropped).
+        """
+        policy = self.retention_policy or RetentionPolicy()
+        today = today or datetime.date.today()
+        month_index = today.year * 12 + today.month - 1
+        hot_from = _month_start(month_index - policy.hot_months)
+        with self._lock:
+            archived = self._archive_before(hot_from)
+            if archived:
+                self._notify("appointments_archived", archived)
+            dropped = 0
+            if policy.retention_months is not None:
+                keep_from = _month_start(month_index - policy.retention_months)[:7]
+                dropped = self._drop_before(keep_from)
+                if dropped:
+                    self._notify("appointments_dropped", keep_from)
+            self._compacted_month = today.isoformat()[:7]
+            archived = len(archived)
+        if archived or dropped:
+            _log.info("%d appointments archived and %d dropped.", archived, dropped,
+                      extra={"event": "appointments_compacted"})
+        return archived, dropped
+
+    def _index_appointment(self, appointment, date: str = None):
+        """
+        Insert the appointment into the per-date interval index and busy-slot mask.
+        The caller must hold the calendar lock.
+
+        Args:
+            appointment (Appointment): The appointment being added.
+            date (str): The appointment's date, if the caller already has it.
+        """
+        date = date or appointment.date
+        day = self._days.get(date)
+        if day is None:
+            day = self._days[date] = _DaySchedule()
+            insort(self._dates, date)  # ISO dates sort chronologically as strings
+        day.insert(appointment)
+        self._busy_masks[date] = self._busy_masks.get(date, 0) | \
+            slot_range_mask(appointment.start_minutes, appointment.end_minutes)
+        self.generation += 1
+        self._day_generations[date] = self.generation
+
+    def _unindex_appointment(self, appointment):
+        """
+        Remove an appointment from the per-date interval index and busy-slot mask.
+        The caller must hold the calendar lock.
+
+        Args:
+            appointment (Appointment): The appointment being removed.
+        """
+        date = appointment.date
+        day = self._days.get(date)
+        if day is None or not day.remove(appointment):
+            return
+        if day.starts:
+            self._busy_masks[date] = day.busy_mask()  # Recomputed: minute-granular bookings may share a slot
+        else:
+            del self._days[date]
+            del self._busy_masks[date]
+            del self._dates[bisect_left(self._dates, date)]
+        self.generation += 1
+        self._day_generations[date] = self.generation
+
+    def _guarded(self, appointment, replaces=None) -> bool:
+        """Ask every booking guard to accept an appointment. The caller must hold the calendar lock."""
+        return all(guard(appointment, replaces) for guard in self._guards)
+
+    def _expire_holds(self, now: float) -> int:
+        """Release the holds the wheel reports expired. The caller must hold the calendar lock."""
+        if not self._hold_wheel.due(now):
+            return 0
+        expired = self._hold_wheel.advance(now)
+        for appointment_id in expired:
+            appointment, _ = self._holds.pop(appointment_id)
+            self._unindex_appointment(appointment)
+        return len(expired)
+
+    def _drop_hold(self, appointment_id: int):
+        """Remove a hold and free its slot. The caller must hold the calendar lock."""
+        appointment, _ = self._holds.pop(appointment_id)
+        self._hold_wheel.cancel(appointment_id)
+        self._unindex_appointment(appointment)
+
+    def _compact_monthly(self):
+        """Run compact once per calendar month."""
+        if self._compacted_month != datetime.date.today().isoformat()[:7]:
+            self.compact()
+
+    def _archive_before(self, hot_from: str) -> list:
+        """
+        Move the hot dates before hot_from (YYYY-MM-DD) to the archive and return the appointments moved.
+        The caller must hold the calendar lock.
         """
-        return self.appointments  # Return the list of appointments, including past and future ones
+        for appointment_id, (held, _) in list(self._holds.items()):
+            if held.date < hot_from:
+                self._drop_hold(appointment_id)  # Holds on past dates are never confirmed
+        end = bisect_left(self._dates, hot_from)
+        if not end:
+            return []
+        months = {}
+        for date in self._dates[:end]:
+            months.setdefault(date[:7], []).append(date)
+        archive = dict(self._archive)
+        for month, dates in months.items():
+            rows = [appointment for date in dates for appointment in self._days[date].appointments]
+            busy_masks = {date: self._busy_masks[date] for date in dates}
+            previous = archive.get(month)
+            if previous is not None:  # Defensive: booking thaws a month, so this should not happen
+                rows = sorted(rows + list(AppointmentColumns.decompress(previous.data)), key=_chronological)
+                busy_masks.update((date, mask | busy_masks.get(date, 0)) for date, mask in previous.busy_masks.items())
+            columns = AppointmentColumns(rows)
+            archive[month] = _ArchivedMonth(columns.compress(), len(columns), busy_masks)
+        self._archive = archive  # Published before the hot entries go, so lock-free readers always find a date
+        for date in self._dates[:end]:
+            del self._days[date]
+            del self._busy_masks[date]
+        del self._dates[:end]
+        cutoff = datetime.date.fromisoformat(hot_from).toordinal()
+        archived = [appointment for appointment in self.appointments if appointment.date_ordinal < cutoff]
+        self.appointments = AppointmentLog(appointment for appointment in self.appointments
+                                           if appointment.date_ordinal >= cutoff)
+        return archived
+
+    def _drop_before(self, month: str) -> int:
+        """Delete the archived months before month (YYYY-MM). The caller must hold the calendar lock."""
+        expired = [key for key in self._archive if key < month]
+        if not expired:
+            return 0
+        archive = dict(self._archive)
+        dropped = 0
+        for key in expired:
+            entry = archive.pop(key)
+            dropped += entry.count
+            self.generation += 1  # The busy masks go away, so cached searches of these dates are stale
+            for date in entry.busy_masks:
+                self._day_generations[date] = self.generation
+        self._archive = archive
+        return dropped
+
+    def _thaw(self, date: str):
+        """Move the archived month of a date back to the hot tier. The caller must hold the calendar lock."""
+        entry = self._archive.get(date[:7])
+        if entry is None:
+            return
+        thawed = [view.to_appointment() for view in AppointmentColumns.decompress(entry.data)]
+        for appointment in thawed:
+            self.appointments.append(appointment)
+            self._index_appointment(appointment)
+        archive = dict(self._archive)
+        del archive[date[:7]]
+        self._archive = archive  # Only after the hot indexes hold the month
+        self._notify("appointments_thawed", thawed)
+
+    def _archived_busy_mask(self, date: str) -> int:
+        """Get the busy mask of an archived date, 0 if it is not archived."""
+        entry = self._archive.get(date[:7])
+        return entry.busy_masks.get(date, 0) if entry is not None else 0
+
+
+def _month_start(month_index: int) -> str:
+    """Return the first day (YYYY-MM-DD) of a month counted as year * 12 + month - 1."""
+    return f"{month_index // 12:04d}-{month_index % 12 + 1:02d}-01"
+
+
+def _chronological(appointment):
+    """Sort key of an appointment: date, then start time."""
+    return appointment.date_ordinal, appointment.start_minutes
@@ -1,14 +1,39 @@
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+from models.appointment import Appointment  # For building bulk bookings
 from models.calendar import Calendar  # For managing the owner's calendar
 from models.invitee import Invitee  # To link invitees to the calendar owner
 from models.availability_rule import AvailabilityRule  # For defining availability rules
-from utils.utils import convert_to_24_hour, generate_uuid  # Utility functions for time conversion and ID generation
+from models.observable import Observable  # Lets databases index invitees as they are added
+from utils.log import get_logger  # Event logging, silent unless configured
+from utils.metrics import count, timed  # Instrumentation, a no-op unless enabled
+from utils.timezones import get_zone  # IANA time zones for owners in different regions
+from utils.utils import SLOT_MINUTES, convert_to_24_hour, convert_to_minutes, gc_paused, generate_uuid, slot_range_mask  # Utility functions for time conversion and ID generation
+
+BookingResult = namedtuple("BookingResult", ["status", "appointment"])  # status: booked, conflict, unavailable or invalid
+_CONFLICT = BookingResult("conflict", None)  # Shared results for the statuses that carry no appointment
+_UNAVAILABLE = BookingResult("unavailable", None)
+_INVALID = BookingResult("invalid", None)
+
+_log = get_logger("calendar_owner")
+
+
+class CalendarOwner(Observable):
+    def __init__(self, name: str, availability_rule: AvailabilityRule, ownerId: str = generate_uuid(), timezone: str = None):
+        """
+        Initialize a CalendarOwner with a name, availability rule, and optional unique ID and time zone.
 
+        The availability rule and the appointments are in the owner's local time. timezone is an IANA
+        name such as 'America/New_York'; None keeps the server's local time, as before time zones.
 
-class CalendarOwner:
-    def __init__(self, name: str, availability_rule: AvailabilityRule, ownerId: str = generate_uuid()):
-        """Initialize a CalendarOwner with a name, availability rule, and optional unique ID."""
+        Observers added with add_observer receive ("invitee_added", invitee) from add_invitee.
+        """
+        if timezone is not None:
+            get_zone(timezone)  # Raises ValueError for an unknown zone
         self.id = ownerId  # Unique identifier for the calendar owner
         self.name = name  # Name of the calendar owner
+        self.timezone = timezone  # IANA time zone of the owner's calendar, or None for the server's
         self.calendar = Calendar()  # Associated calendar object for managing appointments
         self.invitees = []  # List of invitees linked to this calendar owner
         self.availability_rule = availability_rule  # Availability rules for this calendar owner
@@ -19,13 +44,16 @@ class CalendarOwner:
 
     def add_invitee(self, invitee: Invitee):
         """
-        Add an invitee to this calendar owner.
+        Add an invitee to this calendar owner, linking the owner to the invitee as well.
 
         Args:
             invitee (Invitee): The invitee to be added.
         """
         self.invitees.append(invitee)
-        print(f"Invitee {invitee.name} added for CalendarOwner {self.name}.")
+        if self not in invitee.calendar_owners:
+            invitee.calendar_owners.append(self)  # The invitee can now book with this owner
+        self._notify("invitee_added", invitee)
+        _log.info("Invitee %s added for CalendarOwner %s.", invitee.name, self.name, extra={"event": "invitee_added"})
 
     def list_invitees(self):
         """
@@ -55,6 +83,7 @@ class CalendarOwner:
         # Update the availability rule
         self.availability_rule.update_rule(start_hour, end_hour, days_of_week)
 
+    @timed("validate_slot_booking")
     def validate_slot_booking(self, day: str, start_time: str, end_time: str) -> bool:
         """
         Validate if a booking falls within the availability rules.
@@ -70,7 +99,9 @@ class CalendarOwner:
         start_hour = convert_to_24_hour(start_time)  # Convert start time to 24-hour format
         end_hour = convert_to_24_hour(end_time)  # Convert end time to 24-hour format
 
-        return self.availability_rule.is_valid_slot(day, start_hour, end_hour)
+        is_valid = self.availability_rule.is_valid_slot(day, start_hour, end_hour)
+        count("slot_validations_total", outcome="valid" if is_valid else "invalid")
+        return is_valid
 
     def get_availability(self):
         """
@@ -92,9 +123,104 @@ class CalendarOwner:
         Returns:
             list: List of upcoming appointments, or an empty list if no appointments are available.
         """
-        print(f"\nUpcoming Appointments for {self.name}:")
         appointments = self.calendar.list_upcoming_appointments()  # Get upcoming appointments from the calendar
+        _log.debug("%d upcoming appointments for %s.", len(appointments), self.name, extra={"event": "appointments_listed"})
         if not appointments:
-            print("No upcoming appointments.")
             return []  # Return an empty list when no appointments
         return appointments  # Return the list of appointments
+
+    def appointment_times(self, appointment, timezone: str = "UTC"):
+        """
+        Get the start and end of an appointment as aware datetimes.
+
+        Args:
+            appointment (Appointment): One of this owner's appointments.
+            timezone (str): IANA zone to express the times in, default is 'UTC'.
+
+        Returns:
+            tuple: (start, end) datetimes in the given zone.
+
+        Raises:
+            ValueError: If the owner has no time zone or the zone is unknown.
+        """
+        if self.timezone is None:
+            raise ValueError(f"CalendarOwner {self.name} has no time zone.")
+        day = date.fromordinal(appointment.date_ordinal)
+        midnight = datetime(day.year, day.month, day.day, tzinfo=get_zone(self.timezone))
+        zone = get_zone(timezone)
+        return ((midnight + timedelta(minutes=appointment.start_minutes)).astimezone(zone),
+                (midnight + timedelta(minutes=appointment.end_minutes)).astimezone(zone))
+
+    def bulk_book(self, requests):
+        """
+        Validate and book a batch of requests in one pass.
+
+        Each request is checked against the availability rule and the calendar. The accepted ones
+        are applied together with Calendar.bulk_try_book. Times are parsed once per distinct string,
+        the availability of each distinct date is computed once, and the cyclic garbage collector is
+        paused for the batch.
+
+        Args:
+            requests (iterable): (invitee_name, date, start_time, end_time) tuples. Dates are YYYY-MM-DD
+                strings. Times are strings such as '9:30 AM' or ints in minutes since midnight.
+
+        Returns:
+            list: One BookingResult(status, appointment) per request, in order. status is "booked",
+            "conflict" (overlaps an existing or earlier booking), "unavailable" (outside the rule)
+            or "invalid" (unparseable or not aligned to utils.SLOT_MINUTES). appointment is None
+            unless booked.
+        """
+        with gc_paused():  # The batch allocates many acyclic objects; skip the repeated GC scans
+            spans = {}  # Memo of (start_time, end_time) -> (start, end, slot mask), or None if invalid
+            available = {}  # Memo of each date's availability mask, or None if the date is invalid
+            results = []
+            candidates = []  # (result index, Appointment) of requests that passed validation
+
+            for invitee_name, day, start_time, end_time in requests:
+                span = spans.get((start_time, end_time), False)
+                if span is False:
+                    span = spans[(start_time, end_time)] = _parse_span(start_time, end_time)
+                mask = available.get(day, False)
+                if mask is False:
+                    try:
+                        mask = self.availability_rule.date_mask(date.fromisoformat(day))
+                    except ValueError:
+                        mask = None
+                    available[day] = mask
+
+                if span is None or mask is None:
+                    results.append(_INVALID)
+                    continue
+                start, end, needed = span
+                if mask & needed != needed:
+                    results.append(_UNAVAILABLE)
+                    continue
+                candidates.append((len(results), Appointment(invitee_name, day, start // 60, end // 60, start % 60, end % 60)))
+                results.append(None)  # Filled in once the calendar has decided
+
+            booked = self.calendar.bulk_try_book([appointment for _, appointment in candidates])
+            for (index, appointment), ok in zip(candidates, booked):
+                results[index] = BookingResult("booked", appointment) if ok else _CONFLICT
+            return results
+
+
+def _parse_span(start_time, end_time):
+    """
+    Parse a booking's start and end for bulk_book.
+
+    Args:
+        start_time (str | int): Start as a time string or minutes since midnight.
+        end_time (str | int): End as a time string or minutes since midnight.
+
+    Returns:
+        tuple: (start, end, slot mask), or None if a time is unparseable, outside the day or not
+        aligned to utils.SLOT_MINUTES.
+    """
+    try:
+        start = start_time if isinstance(start_time, int) else convert_to_minutes(start_time)
+        end = end_time if isinstance(end_time, int) else convert_to_minutes(end_time)
+    except ValueError:
+        return None
+    if not 0 <= start < end <= 24 * 60 or start % SLOT_MINUTES or end % SLOT_MINUTES:
+        return None
+    return start, end, slot_range_mask(start, end)
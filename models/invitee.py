@@ -1,115 +1,296 @@
 from models.appointment import Appointment
-from utils.utils import convert_to_24_hour
-from datetime import datetime, timedelta
+from utils.utils import SLOT_MINUTES, WEEKDAYS, convert_to_minutes, generate_uuid, iso_to_ordinal, ordinal_to_iso
+from services.free_busy import FreeBusyEngine, FreeSlot, parse_cursor
+from services.owner_search import search_across_owners
+from utils.log import get_logger
+from utils.metrics import count, set_gauge, timed
+from utils.timezones import convert, get_zone, today_in
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+SEARCH_CACHE_SIZE = 4096  # Slot searches cached by the engine shared by all invitees
+
+_free_busy = FreeBusyEngine(cache_size=SEARCH_CACHE_SIZE)
+_render_slot = lru_cache(maxsize=SEARCH_CACHE_SIZE * 8)(FreeSlot.__str__)  # Cached searches return the same slots
+_log = get_logger("invitee")
 
 class Invitee:
-    def __init__(self, name, calendar_owner):
+    def __init__(self, name, calendar_owner, timezone=None, invitee_id=None):
         """
         Initialize the Invitee.
 
         Args:
             name (str): The name of the invitee.
-            calendar_owner (CalendarOwner): The calendar owner that the invitee is linked to.
+            calendar_owner (CalendarOwner): The primary calendar owner that the invitee is linked to.
+                More owners are linked with link_owner or CalendarOwner.add_invitee.
+            timezone (str): IANA time zone the invitee searches and books in. Defaults to the owner's.
+            invitee_id (str): Unique identifier of the invitee. A new UUID is generated if omitted.
         """
+        if timezone is not None:
+            get_zone(timezone)  # Raises ValueError for an unknown zone
+        self.id = invitee_id or generate_uuid()  # Unique identifier for the invitee
         self.name = name  # The name of the invitee
         self.calendar_owner = calendar_owner  # Link the invitee to a calendar owner
+        self.calendar_owners = [calendar_owner]  # Every owner the invitee can book with, the primary one first
+        self.timezone = timezone  # The invitee's time zone, or None to use the owner's
+
+    @property
+    def zone(self):
+        """
+        str: The time zone the invitee sees slots in: its own, else the owner's. An owner without a time
+        zone keeps server local time for everyone, so the invitee's zone only applies to owners with one.
+        """
+        return self._zone_for(self.calendar_owner)
+
+    def link_owner(self, calendar_owner):
+        """
+        Let the invitee book with another calendar owner. Linking an owner twice has no effect.
+
+        Args:
+            calendar_owner (CalendarOwner): The owner to link, who also lists the invitee from now on.
+        """
+        if calendar_owner not in self.calendar_owners:
+            calendar_owner.add_invitee(self)  # Records the link on both sides
     
-    def search_available_slots(self):
+    @timed("search_available_slots")
+    def search_available_slots(self, duration_minutes: int = 60, horizon_days: int = 7):
         """
         Search for available slots in the linked calendar owner's calendar.
 
-        Loops through each day of the week and checks available time slots within the calendar owner's availability.
+        Free time is computed day by day as a bitmask by the FreeBusyEngine, and slots are only
+        formatted once the search is finished. The engine caches searches, so repeated searches of
+        an owner only redo the dates booked since the last one.
+
+        Slots are given in the invitee's time zone, and the horizon starts today in that zone. When
+        it differs from the owner's, the owner's slots are converted through cached UTC offset tables.
+
+        Args:
+            duration_minutes (int): Length of the requested meeting in minutes, default is 60.
+            horizon_days (int): Number of days to search starting today, default is 7 (one week).
 
         Returns:
             list: A list of available time slots in string format (e.g., '2024-12-09 Monday Time: 9:00 - 10:00').
         """
-        available_slots = []  # Initialize an empty list to hold available slots
-        
-        # Loop through all days in availability and check available time slots
-        for day_name in self.calendar_owner.availability_rule.days_of_week:
-            current_date = datetime.today()  # Get the current date
-            
-            # Map weekdays to corresponding integer values (Monday = 0, Tuesday = 1, etc.)
-            weekday_map = {'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3, 'Friday': 4, 'Saturday': 5, 'Sunday': 6}
-            day_of_week = weekday_map[day_name]
-            
-            # Calculate the number of days ahead to reach the next occurrence of the given day
-            days_ahead = (day_of_week - current_date.weekday()) % 7
-            target_date = current_date + timedelta(days=days_ahead)  # Calculate the target date
-            
-            # Format the target date as YYYY-MM-DD
-            day_str = target_date.strftime('%Y-%m-%d')
-            
-            # Loop through available hours for that day
-            for hour in range(self.calendar_owner.availability_rule.start_hour, self.calendar_owner.availability_rule.end_hour):
-                # Assume the slot is available until proven otherwise
-                is_available = True
-                
-                # Check if there is any existing appointment for that date and hour
-                for appointment in self.calendar_owner.calendar.appointments:
-                    if (appointment.date == day_str and appointment.start_hour == hour):
-                        is_available = False  # Slot is already booked
-                        break
-                
-                # Check if the slot is within the owner's availability
-                if not self._is_within_availability(hour, hour+1, day_name):
-                    is_available = False  # Slot is outside of available hours
-
-                if is_available:
-                    available_slots.append(f"{day_str} {day_name} Time: {hour}:00 - {hour+1}:00")  # Add the available slot to the list
-
-        return available_slots  # Return the list of available slots
-
-    def book_slot(self, date: str, start_time: str, end_time: str, day: str): 
-        """
-        Book a slot for the invitee in the linked calendar owner's calendar.
+        owner_zone = self.calendar_owner.timezone
+        zone = self.zone
+        today = today_in(zone)
+        last_day = today + timedelta(days=horizon_days - 1)
+        if zone == owner_zone:
+            slots = _free_busy.find_slots(self.calendar_owner, today, last_day, duration_minutes)
+        else:
+            # Search the owner's days overlapping the horizon, one day wider on each side
+            slots = []
+            first, last = today.toordinal(), last_day.toordinal()
+            for slot in _free_busy.find_slots(self.calendar_owner, today - timedelta(days=1),
+                                              last_day + timedelta(days=1), duration_minutes):
+                ordinal, start = convert(owner_zone, zone, slot.date.toordinal(), slot.start_minutes)
+                if first <= ordinal <= last:
+                    slots.append(FreeSlot(date.fromordinal(ordinal), start, start + duration_minutes))
+        return [_render_slot(slot) for slot in slots]  # Render the slots as strings
+
+    def iter_available_slots(self, duration_minutes: int = 60, not_before=None, limit: int = None, cursor: str = None,
+                             horizon_days: int = None):
+        """
+        Yield the free slots of the linked calendar owner in chronological order.
+
+        Slots are computed one date at a time as they are taken, so asking for the next few slots
+        never searches the whole horizon. To page, pass the cursor of the last slot of a page to
+        get the slots after it; earlier dates are not searched again.
+
+        Args:
+            duration_minutes (int): Length of the requested meeting in minutes, default is 60.
+            not_before (datetime.date | datetime.datetime): Earliest start, on the invitee's clock
+                unless timezone-aware. Defaults to the start of today.
+            limit (int): Stop after this many slots. Defaults to no limit.
+            cursor (str): FreeSlot.cursor of the last slot already seen. Only later slots are yielded.
+            horizon_days (int): Number of days to search from the first date. Defaults to an open-ended
+                search, see services.free_busy.MAX_SEARCH_DAYS.
+
+        Yields:
+            FreeSlot: Free slots on the invitee's clock.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        zone, owner_zone = self.zone, self.calendar_owner.timezone
+        first = self._search_start(zone, not_before, cursor)
+        if limit is not None and limit <= 0:
+            return
+        last_ordinal = None if horizon_days is None else first[0] + horizon_days - 1
+        converting = zone != owner_zone
+        if converting:  # Search the owner's dates from the one holding the first instant, one day beyond the horizon
+            owner_start = date.fromordinal(convert(zone, owner_zone, *first)[0])
+            owner_end = None if last_ordinal is None else date.fromordinal(last_ordinal + 1)
+        else:
+            owner_start = date.fromordinal(first[0])
+            owner_end = None if last_ordinal is None else date.fromordinal(last_ordinal)
+
+        taken = 0
+        for slot in _free_busy.iter_slots(self.calendar_owner, owner_start, owner_end, duration_minutes):
+            if converting:
+                ordinal, start = convert(owner_zone, zone, slot.date.toordinal(), slot.start_minutes)
+                slot = FreeSlot(date.fromordinal(ordinal), start, start + duration_minutes)
+            position = (slot.date.toordinal(), slot.start_minutes)
+            if position < first:
+                continue
+            if last_ordinal is not None and position[0] > last_ordinal:
+                return
+            yield slot
+            taken += 1
+            if taken == limit:
+                return
+
+    def search_across_owners(self, duration_minutes: int = 60, horizon_days: int = 7, calendar_owners=None,
+                             max_workers: int = None):
+        """
+        Stream the free slots of every linked calendar owner, merged in chronological order.
+
+        Owners are searched in parallel one date at a time and merged lazily, so the first slots
+        arrive without computing every owner's whole horizon. Stop iterating, or close the generator,
+        once enough slots were seen.
+
+        Args:
+            duration_minutes (int): Length of the requested meeting in minutes, default is 60.
+            horizon_days (int): Number of days to search starting today, default is 7 (one week).
+            calendar_owners (list): Owners to search, default is every linked owner.
+            max_workers (int): Threads evaluating owners at once, see services.owner_search.MAX_WORKERS.
+
+        Returns:
+            generator: OwnerSlot tuples (calendar_owner, date, start_minutes, end_minutes). With an
+                invitee time zone they are on the invitee's clock, else in each owner's local time.
+        """
+        today = today_in(self.timezone or self.zone)
+        extra = {} if max_workers is None else {"max_workers": max_workers}
+        return search_across_owners(self.calendar_owners if calendar_owners is None else calendar_owners,
+                                    (today, today + timedelta(days=horizon_days - 1)), duration_minutes,
+                                    engine=_free_busy, timezone=self.timezone, **extra)
+
+    @timed("book_slot")
+    def book_slot(self, date: str, start_time: str, end_time: str, day: str, calendar_owner=None):
+        """
+        Book a slot for the invitee in a linked calendar owner's calendar.
+
+        The date and times are in the invitee's time zone. When it differs from the owner's, they are
+        converted to the owner's local time before checking and booking, and day is ignored.
 
         Args:
             date (str): The date to book the slot (format: 'YYYY-MM-DD').
-            start_time (str): The start time in 12-hour format (e.g., '9 AM').
-            end_time (str): The end time in 12-hour format (e.g., '10 AM').
+            start_time (str): The start time (e.g., '9 AM', '9:30 AM' or '14:15').
+            end_time (str): The end time (e.g., '10 AM', '10:30 AM' or '15:45').
             day (str): The day of the week (e.g., 'Monday').
+            calendar_owner (CalendarOwner): The linked owner to book with, default is the primary owner.
 
         Returns:
             str: Confirmation message about the booking attempt (success or failure).
+
+        Raises:
+            ValueError: If a time cannot be parsed, the slot is not a positive number of quarter hours,
+                or calendar_owner is not linked to the invitee.
         """
+        owner = self.calendar_owner if calendar_owner is None else calendar_owner
+        if owner is not self.calendar_owner and owner not in self.calendar_owners:
+            raise ValueError(f"Invitee {self.name} is not linked to CalendarOwner {owner.name}.")
         try:
-            start_hour = convert_to_24_hour(start_time)  # Convert start time to 24-hour format
-            end_hour = convert_to_24_hour(end_time)  # Convert end time to 24-hour format
+            start = convert_to_minutes(start_time)  # Convert start time to minutes since midnight
+            end = convert_to_minutes(end_time)  # Convert end time to minutes since midnight
         except ValueError as e:
-            print(f"Invalid time format: {start_time}. {str(e)}")
+            _log.warning("Invalid time format: %s - %s. %s", start_time, end_time, e, extra={"event": "booking_rejected"})
+            count("bookings_total", outcome="invalid")
+            raise
         
-        # Ensure the slot duration is valid (1-hour slots only)
-        if end_hour - start_hour != 1:
-            print(f"Invalid slot duration: {start_time} - {end_time}. Slots must be 1 hour.")
+        # Ensure the slot is a positive whole number of quarter hours (e.g. 15, 30 or 90 minutes)
+        if end <= start or start % SLOT_MINUTES or end % SLOT_MINUTES:
+            _log.warning("Invalid slot duration: %s - %s. Slots must align to %d minutes.", start_time, end_time, SLOT_MINUTES,
+                         extra={"event": "booking_rejected"})
+            count("bookings_total", outcome="invalid")
             raise ValueError("Invalid slot duration.")
+
+        requested = date
+        if self._zone_for(owner) != owner.timezone:
+            date, start, end, day = self._to_owner_time(owner, date, start, end)
+            if date is None:
+                count("bookings_total", outcome="unavailable")
+                return f"Invalid availability: The owner is unavailable at this time."  # Spans the owner's midnight
         
         # Check for duplicate or overlapping bookings
-        for appointment in self.calendar_owner.calendar.appointments:
-            if appointment.date == date and appointment.start_hour == start_hour:
-                return f"Slot already booked for {date} {start_time} - {end_time}."  # Return if slot is already booked
+        if owner.calendar.overlaps(date, start, end):
+            count("bookings_total", outcome="conflict")
+            return f"Slot already booked for {requested} {start_time} - {end_time}."  # Return if slot is already booked
 
         # Ensure that the booking is within the calendar owner's available hours
-        if not self._is_within_availability(start_hour, end_hour, day):
+        if not self._is_within_availability(start, end, day, date, owner):
+            count("bookings_total", outcome="unavailable")
             return f"Invalid availability: The owner is unavailable at this time."  # Return if outside of available hours
 
-        # If the slot is available, add the appointment
-        self.calendar_owner.calendar.add_appointment(Appointment(self.name, date, start_hour, end_hour))
-        return f"Successfully booked slot: {date} {start_time} - {end_time}."  # Return success message
+        # Atomically re-check and claim the slot, another thread may have booked it since the check above
+        appointment = Appointment(self.name, date, start // 60, end // 60, start % 60, end % 60)
+        if not owner.calendar.try_book(appointment):
+            count("bookings_total", outcome="conflict")
+            return f"Slot already booked for {requested} {start_time} - {end_time}."
+        count("bookings_total", outcome="booked")
+        set_gauge("calendar_appointments", len(owner.calendar.appointments), owner=owner.id)
+        return f"Successfully booked slot: {requested} {start_time} - {end_time}."  # Return success message
+
+    @staticmethod
+    def _search_start(zone, not_before, cursor):
+        """Return the (date ordinal, minutes) of the earliest start a search may yield, on the invitee's clock."""
+        if isinstance(not_before, datetime):
+            if not_before.tzinfo is not None and zone is not None:
+                not_before = not_before.astimezone(get_zone(zone))
+            partial_minute = bool(not_before.second or not_before.microsecond)  # Round up to a whole minute
+            first = (not_before.toordinal(), not_before.hour * 60 + not_before.minute + partial_minute)
+        elif not_before is not None:
+            first = (not_before.toordinal(), 0)
+        else:
+            first = (today_in(zone).toordinal(), 0)
+        if cursor is not None:
+            ordinal, minutes = parse_cursor(cursor)
+            first = max(first, (ordinal, minutes + 1))
+        return first
+
+    def _zone_for(self, calendar_owner):
+        """Return the zone the invitee's times are in when dealing with an owner: its own, else the owner's."""
+        owner_zone = calendar_owner.timezone
+        return (self.timezone or owner_zone) if owner_zone is not None else None
+
+    def _to_owner_time(self, calendar_owner, date, start_minutes, end_minutes):
+        """
+        Convert a slot from the invitee's time zone to an owner's.
+
+        Args:
+            calendar_owner (CalendarOwner): The owner whose local time is wanted.
+            date (str): The date in YYYY-MM-DD format, in the invitee's zone.
+            start_minutes (int): The start in minutes since the invitee's midnight.
+            end_minutes (int): The end in minutes since the invitee's midnight.
+
+        Returns:
+            tuple: (date, start_minutes, end_minutes, day) in the owner's zone, or four Nones if the
+                slot crosses the owner's midnight.
+        """
+        ordinal = iso_to_ordinal(date)
+        zone, owner_zone = self._zone_for(calendar_owner), calendar_owner.timezone
+        start_ordinal, start = convert(zone, owner_zone, ordinal, start_minutes)
+        end_ordinal, end = convert(zone, owner_zone, ordinal, end_minutes)
+        if end == 0 and end_ordinal == start_ordinal + 1:  # Ends exactly at the owner's midnight
+            end_ordinal, end = start_ordinal, 24 * 60
+        if end_ordinal != start_ordinal:
+            return None, None, None, None
+        return ordinal_to_iso(start_ordinal), start, end, WEEKDAYS[start_ordinal % 7 - 1]  # Ordinal 1 is a Monday
 
-    def _is_within_availability(self, start_hour, end_hour, day):
+    def _is_within_availability(self, start_minutes, end_minutes, day, on_date=None, calendar_owner=None):
         """
-        Check if the booking is within the available hours of the calendar owner.
+        Check if the booking is within the available hours of a calendar owner.
 
         Args:
-            start_hour (int): The start hour of the booking in 24-hour format.
-            end_hour (int): The end hour of the booking in 24-hour format.
+            start_minutes (int): The start of the booking in minutes since midnight.
+            end_minutes (int): The end of the booking in minutes since midnight.
             day (str): The day of the week (e.g., 'Monday').
+            on_date (str): The date in YYYY-MM-DD format, so date overrides and recurrence apply.
+            calendar_owner (CalendarOwner): The owner to check, default is the primary owner.
 
         Returns:
             bool: True if the booking is within the available hours, False otherwise.
         """
-        # Check if the start and end hours are within the owner's availability
-        return self.calendar_owner.availability_rule.start_hour <= start_hour < self.calendar_owner.availability_rule.end_hour and \
-               self.calendar_owner.availability_rule.start_hour < end_hour <= self.calendar_owner.availability_rule.end_hour and \
-               day in self.calendar_owner.availability_rule.days_of_week
+        # Check if the start and end times are within the owner's availability
+        owner = self.calendar_owner if calendar_owner is None else calendar_owner
+        return owner.availability_rule.is_available(day, start_minutes, end_minutes, on_date)
@@ -0,0 +1,31 @@
+class Observable:
+    """
+    Mixin that lets other components subscribe to changes of a model object.
+
+    Observers are callables invoked as callback(event, payload). They are kept in a tuple that is
+    replaced on every subscription change, so notifying never races with add_observer.
+    """
+    _observers = ()
+
+    def add_observer(self, callback):
+        """
+        Subscribe to change events.
+
+        Args:
+            callback (callable): Called as callback(event, payload) after every change.
+        """
+        self._observers = self._observers + (callback,)
+
+    def remove_observer(self, callback):
+        """
+        Unsubscribe a callback previously passed to add_observer.
+
+        Args:
+            callback (callable): The callback to remove.
+        """
+        self._observers = tuple(observer for observer in self._observers if observer is not callback)
+
+    def _notify(self, event: str, payload):
+        """Invoke every observer with the event name and its payload."""
+        for observer in self._observers:
+            observer(event, payload)
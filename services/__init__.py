@@ -0,0 +1,3 @@
+# __init__.py for the services package
+from .free_busy import FreeBusyEngine, FreeSlot
+from .group_finder import GroupSlot, find_common_slots
\ No newline at end of file
@@ -0,0 +1,101 @@
+import asyncio
+from datetime import date, timedelta
+
+from database.in_memory_database import InMemoryDatabase
+from models.invitee import SEARCH_CACHE_SIZE, Invitee
+from services.free_busy import FreeBusyEngine
+from utils.utils import WEEKDAYS
+
+
+class AsyncSchedulingService:
+    """
+    An asyncio facade for searching, booking and listing appointments.
+
+    Operations run to completion on the event loop without awaiting, and Calendar.try_book checks
+    and books atomically under the calendar's own lock, so bookings need no further locking. A
+    semaphore bounds how many operations run at once so a burst of requests queues instead of
+    piling up work.
+
+    Attributes:
+        database: The store owners are looked up in, InMemoryDatabase by default.
+    """
+
+    def __init__(self, database=None, max_concurrency: int = 256):
+        """
+        Initialize the service.
+
+        Args:
+            database: Any object with get_calendar_owner(owner_id). Defaults to the InMemoryDatabase singleton.
+            max_concurrency (int): Maximum number of operations in flight at once, default is 256.
+        """
+        self.database = database if database is not None else InMemoryDatabase.get_instance()
+        self._engine = FreeBusyEngine(cache_size=SEARCH_CACHE_SIZE)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def search_slots(self, owner_id: str, start_date: date = None, days: int = 7, duration_minutes: int = 60):
+        """
+        Search an owner's free slots.
+
+        Args:
+            owner_id (str): The CalendarOwner ID.
+            start_date (datetime.date): First date to search, defaults to today.
+            days (int): Number of days to search, default is 7.
+            duration_minutes (int): Length of the meeting in minutes, default is 60.
+
+        Returns:
+            list: FreeSlot tuples in chronological order.
+
+        Raises:
+            LookupError: If the owner does not exist.
+        """
+        async with self._semaphore:
+            owner = self._get_owner(owner_id)
+            start_date = start_date or date.today()
+            return self._engine.find_slots(owner, start_date, start_date + timedelta(days=days - 1), duration_minutes)
+
+    async def book(self, owner_id: str, invitee_name: str, date_str: str, start_time: str, end_time: str):
+        """
+        Book a slot with an owner.
+
+        Args:
+            owner_id (str): The CalendarOwner ID.
+            invitee_name (str): Name of the person booking.
+            date_str (str): The date in YYYY-MM-DD format.
+            start_time (str): The start time (e.g. '9 AM' or '9:30').
+            end_time (str): The end time (e.g. '10 AM' or '10:30').
+
+        Returns:
+            dict: {"booked": bool, "message": str} as reported by Invitee.book_slot.
+
+        Raises:
+            LookupError: If the owner does not exist.
+            ValueError: If the date or times are invalid.
+        """
+        async with self._semaphore:
+            owner = self._get_owner(owner_id)
+            day = WEEKDAYS[date.fromisoformat(date_str).weekday()]
+            message = Invitee(invitee_name, owner).book_slot(date_str, start_time, end_time, day)  # Atomic via try_book
+            return {"booked": message.startswith("Successfully"), "message": message}
+
+    async def list_appointments(self, owner_id: str):
+        """
+        List an owner's appointments.
+
+        Args:
+            owner_id (str): The CalendarOwner ID.
+
+        Returns:
+            list: Appointment objects.
+
+        Raises:
+            LookupError: If the owner does not exist.
+        """
+        async with self._semaphore:
+            return list(self._get_owner(owner_id).calendar.list_upcoming_appointments())
+
+    def _get_owner(self, owner_id: str):
+        """Fetch an owner or raise LookupError."""
+        owner = self.database.get_calendar_owner(owner_id)
+        if owner is None:
+            raise LookupError(f"Unknown CalendarOwner ID: {owner_id}")
+        return owner
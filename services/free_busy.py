@@ -0,0 +1,285 @@
+from collections import OrderedDict, namedtuple
+from datetime import date, timedelta
+from functools import lru_cache
+import threading
+
+from utils.utils import SLOT_MINUTES, SLOTS_PER_DAY, WEEKDAYS, convert_to_minutes, format_minutes
+
+MAX_SEARCH_DAYS = 3660  # Open-ended searches give up after about ten years without another slot
+
+
+class FreeSlot(namedtuple("FreeSlot", ["date", "start_minutes", "end_minutes"])):
+    """
+    A free time slot in a calendar owner's calendar.
+
+    Attributes:
+        date (datetime.date): The date of the slot.
+        start_minutes (int): Start of the slot in minutes since midnight.
+        end_minutes (int): End of the slot in minutes since midnight.
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        """Render the slot as e.g. '2024-12-09 Monday Time: 9:00 - 10:00'."""
+        return (f"{self.date.isoformat()} {WEEKDAYS[self.date.weekday()]} "
+                f"Time: {format_minutes(self.start_minutes)} - {format_minutes(self.end_minutes)}")
+
+    @property
+    def cursor(self) -> str:
+        """str: Opaque position of the slot, e.g. '2024-12-09T9:00'. Searches resumed from it start after this slot."""
+        return f"{self.date.isoformat()}T{format_minutes(self.start_minutes)}"
+
+
+def parse_cursor(cursor: str):
+    """
+    Read a FreeSlot.cursor back.
+
+    Returns:
+        tuple: (date ordinal, start minutes) of the slot the cursor was taken from.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    day, _, start = cursor.partition("T")
+    try:
+        return date.fromisoformat(day).toordinal(), convert_to_minutes(start)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor!r}.") from None
+
+
+_CachedSearch = namedtuple("_CachedSearch", ["rule", "rule_generation", "calendar_generation",
+                                             "day_generations", "day_slots", "slots"])
+
+
+def run_starts(mask: int, length: int) -> int:
+    """
+    Find where runs of consecutive set bits begin.
+
+    Args:
+        mask (int): A day mask of free slots.
+        length (int): The number of consecutive free slots required.
+
+    Returns:
+        int: Bit i is set when bits i .. i + length - 1 of mask are all set.
+    """
+    covered = 1
+    while covered < length:
+        # Doubling: each step extends the run that every set bit is known to start
+        shift = min(covered, length - covered)
+        mask &= mask >> shift
+        covered += shift
+    return mask
+
+
+@lru_cache(maxsize=None)
+def step_mask(step_slots: int) -> int:
+    """Return a day mask with every step_slots-th slot set, starting from midnight."""
+    mask = 0
+    for slot in range(0, SLOTS_PER_DAY, step_slots):
+        mask |= 1 << slot
+    return mask
+
+
+def iter_bits(mask: int):
+    """Yield the positions of the set bits of mask in ascending order."""
+    while mask:
+        low = mask & -mask  # Isolate the lowest set bit
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class FreeBusyEngine:
+    """
+    Computes free/busy time for calendar owners using one integer bitmask per owner-day.
+
+    A day is split into utils.SLOTS_PER_DAY slots of utils.SLOT_MINUTES minutes each. An owner's
+    free time on a date is the availability mask of its AvailabilityRule AND NOT the busy mask of
+    its Calendar, so a search over any date range is a handful of bitwise operations per day.
+    Slots are returned as FreeSlot tuples and only formatted when rendered.
+
+    With a cache_size, find_slots keeps its results per (owner, date range, duration, step) in an
+    LRU cache. A cached search is reused while the owner's calendar and rule generations are
+    unchanged. After a booking only the dates whose generation moved are searched again, and after
+    a rule update (or a new rule object) the owner's whole range is.
+    """
+
+    def __init__(self, cache_size: int = 0):
+        """
+        Initialize the engine.
+
+        Args:
+            cache_size (int): Number of searches kept by find_slots, default is 0 (no caching).
+        """
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # Maps (owner, start, end, duration, step) to a _CachedSearch, oldest first
+        self._cache_lock = threading.Lock()
+
+    def free_mask(self, calendar_owner, day: date) -> int:
+        """
+        Get the free slots of an owner on a date.
+
+        Args:
+            calendar_owner (CalendarOwner): The owner whose calendar is checked.
+            day (datetime.date): The date to check.
+
+        Returns:
+            int: Bit i is set when slot i of the day is available and not booked.
+        """
+        available = calendar_owner.availability_rule.date_mask(day)
+        if not available:
+            return 0  # Skip the calendar lookup on days the owner never works
+        calendar = calendar_owner.calendar
+        calendar.expire_holds()  # Free expired holds before reading the mask
+        return available & ~calendar.busy_mask(day.isoformat())
+
+    def free_masks(self, calendar_owner, start_date: date, end_date: date):
+        """
+        Get the free slots of an owner for every date in a range, both ends inclusive.
+
+        Args:
+            calendar_owner (CalendarOwner): The owner whose calendar is checked.
+            start_date (datetime.date): The first date of the range.
+            end_date (datetime.date): The last date of the range.
+
+        Returns:
+            list: One free-slot mask per date, in chronological order.
+        """
+        days = (end_date - start_date).days + 1
+        return [self.free_mask(calendar_owner, start_date + timedelta(days=offset)) for offset in range(days)]
+
+    def find_slots(self, calendar_owner, start_date: date, end_date: date, duration_minutes: int = 60,
+                   step_minutes: int = None):
+        """
+        Find the free slots of an owner in a date range.
+
+        Args:
+            calendar_owner (CalendarOwner): The owner whose calendar is searched.
+            start_date (datetime.date): The first date of the range.
+            end_date (datetime.date): The last date of the range (inclusive).
+            duration_minutes (int): Length of the meeting, a multiple of utils.SLOT_MINUTES. Default is 60.
+            step_minutes (int): Spacing of candidate start times from midnight. Defaults to the
+                meeting length, capped at one hour.
+
+        Returns:
+            list: FreeSlot tuples in chronological order.
+        """
+        if not self.cache_size:
+            starts_allowed = self.start_mask(duration_minutes, step_minutes)
+            return [slot for offset in range((end_date - start_date).days + 1)
+                    for slot in self._day_slots(calendar_owner, start_date + timedelta(days=offset), starts_allowed,
+                                                duration_minutes)]
+
+        key = (calendar_owner, start_date, end_date, duration_minutes, step_minutes)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+
+        # Read the generations before the masks: a booking racing with the search leaves a stale
+        # generation behind, so the next search redoes that date instead of trusting it
+        rule, calendar = calendar_owner.availability_rule, calendar_owner.calendar
+        calendar.expire_holds()  # Expired holds bump the generation, so the cache sees them
+        calendar_generation = calendar.generation
+        reusable = cached is not None and cached.rule is rule and cached.rule_generation == rule.generation
+        if reusable and cached.calendar_generation == calendar_generation:
+            return list(cached.slots)  # Nothing changed: the common case for popular owners
+
+        starts_allowed = self.start_mask(duration_minutes, step_minutes)
+        days = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+        if reusable:
+            rule_generation = cached.rule_generation
+            day_generations = tuple(calendar.day_generation(day.isoformat()) for day in days)
+            day_slots = tuple(
+                slots if generation == cached_generation
+                else self._day_slots(calendar_owner, day, starts_allowed, duration_minutes)
+                for day, slots, generation, cached_generation
+                in zip(days, cached.day_slots, day_generations, cached.day_generations))
+        else:
+            rule_generation = rule.generation
+            day_generations = tuple(calendar.day_generation(day.isoformat()) for day in days)
+            day_slots = tuple(self._day_slots(calendar_owner, day, starts_allowed, duration_minutes) for day in days)
+
+        slots = tuple(slot for slots_of_day in day_slots for slot in slots_of_day)
+        with self._cache_lock:
+            self._cache[key] = _CachedSearch(rule, rule_generation, calendar_generation, day_generations, day_slots, slots)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)  # Evict the least recently used search
+        return list(slots)
+
+    def iter_slots(self, calendar_owner, start_date: date, end_date: date = None, duration_minutes: int = 60,
+                   step_minutes: int = None):
+        """
+        Yield the free slots of an owner one date at a time, bypassing the cache.
+
+        Nothing is computed beyond the date of the last slot taken, so callers can stop after the
+        first few slots of an open-ended search.
+
+        Args:
+            calendar_owner (CalendarOwner): The owner whose calendar is searched.
+            start_date (datetime.date): The first date to search.
+            end_date (datetime.date): The last date to search (inclusive). If None the search is
+                open-ended, and ends after MAX_SEARCH_DAYS dates in a row without a slot.
+            duration_minutes (int): Length of the meeting, a multiple of utils.SLOT_MINUTES. Default is 60.
+            step_minutes (int): Spacing of candidate start times, see start_mask.
+
+        Yields:
+            FreeSlot: Free slots in chronological order.
+        """
+        starts_allowed = self.start_mask(duration_minutes, step_minutes)
+        day, empty_days = start_date, 0
+        while (day <= end_date) if end_date is not None else (empty_days < MAX_SEARCH_DAYS):
+            slots = self._day_slots(calendar_owner, day, starts_allowed, duration_minutes)
+            empty_days = 0 if slots else empty_days + 1
+            yield from slots
+            day += timedelta(days=1)
+
+    def day_slots(self, calendar_owner, day: date, duration_minutes: int = 60, step_minutes: int = None) -> tuple:
+        """
+        Find the free slots of an owner on one date, bypassing the cache.
+
+        Args:
+            calendar_owner (CalendarOwner): The owner whose calendar is searched.
+            day (datetime.date): The date to search.
+            duration_minutes (int): Length of the meeting, a multiple of utils.SLOT_MINUTES. Default is 60.
+            step_minutes (int): Spacing of candidate start times, see start_mask.
+
+        Returns:
+            tuple: FreeSlot tuples in chronological order.
+        """
+        return self._day_slots(calendar_owner, day, self.start_mask(duration_minutes, step_minutes), duration_minutes)
+
+    def clear_cache(self):
+        """Drop every cached search."""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _day_slots(self, calendar_owner, day: date, starts_allowed: int, duration_minutes: int) -> tuple:
+        """Find the free slots of an owner on one date."""
+        starts = run_starts(self.free_mask(calendar_owner, day), duration_minutes // SLOT_MINUTES) & starts_allowed
+        return tuple(FreeSlot(day, slot * SLOT_MINUTES, slot * SLOT_MINUTES + duration_minutes)
+                     for slot in iter_bits(starts))
+
+    @staticmethod
+    def start_mask(duration_minutes: int, step_minutes: int = None) -> int:
+        """
+        Build the mask of slots a meeting may start on.
+
+        Args:
+            duration_minutes (int): Length of the meeting, a multiple of utils.SLOT_MINUTES.
+            step_minutes (int): Spacing of candidate start times. Defaults to min(duration, 60).
+
+        Returns:
+            int: Bit i is set when the meeting may start at slot i and still end by midnight.
+
+        Raises:
+            ValueError: If the duration or step is not a positive multiple of utils.SLOT_MINUTES.
+        """
+        if step_minutes is None:
+            step_minutes = min(duration_minutes, 60)
+        if duration_minutes <= 0 or duration_minutes % SLOT_MINUTES or step_minutes <= 0 or step_minutes % SLOT_MINUTES:
+            raise ValueError(f"Durations and steps must be positive multiples of {SLOT_MINUTES} minutes.")
+        last_start = SLOTS_PER_DAY - duration_minutes // SLOT_MINUTES
+        if last_start < 0:
+            return 0  # Longer than a day: no slot fits
+        return step_mask(step_minutes // SLOT_MINUTES) & ((1 << (last_start + 1)) - 1)
@@ -0,0 +1,171 @@
+from collections import namedtuple
+from datetime import date, timedelta
+
+from services.free_busy import FreeBusyEngine, iter_bits, run_starts
+from utils.timezones import from_utc_masks, to_utc_masks
+from utils.utils import SLOT_MINUTES, SLOTS_PER_DAY, WEEKDAYS, format_minutes
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional: fall back to intersecting the integer day masks
+    np = None
+
+_MASK_BYTES = (SLOTS_PER_DAY + 7) // 8  # Bytes needed to hold one day mask
+
+
+class GroupSlot(namedtuple("GroupSlot", ["date", "start_minutes", "end_minutes", "owner_ids"])):
+    """
+    A slot in which several calendar owners are free at the same time.
+
+    Attributes:
+        date (datetime.date): The date of the slot.
+        start_minutes (int): Start of the slot in minutes since midnight.
+        end_minutes (int): End of the slot in minutes since midnight.
+        owner_ids (tuple): IDs of the owners free for the whole slot.
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        """Render the slot as e.g. '2024-12-09 Monday Time: 9:00 - 10:00 (3 attendees)'."""
+        return (f"{self.date.isoformat()} {WEEKDAYS[self.date.weekday()]} "
+                f"Time: {format_minutes(self.start_minutes)} - {format_minutes(self.end_minutes)} "
+                f"({len(self.owner_ids)} attendees)")
+
+
+def find_common_slots(calendar_owners, date_range, duration_minutes: int = 60, min_attendees: int = None,
+                      step_minutes: int = None, engine: FreeBusyEngine = None, timezone: str = None):
+    """
+    Find slots in which several calendar owners are free together.
+
+    Every owner's free/busy grid for the range is stacked into one owner x day x slot boolean
+    matrix and intersected in a single vectorized pass. Without NumPy the same result is computed
+    from the integer day masks.
+
+    Owners in different time zones are compared on the days of one output zone: each owner's day
+    masks are re-sliced through UTC with the cached offset tables of utils.timezones, shifting
+    whole masks instead of converting every slot.
+
+    Args:
+        calendar_owners (list): The CalendarOwner objects to schedule together.
+        date_range (tuple): (start_date, end_date), inclusive, as datetime.date or YYYY-MM-DD strings.
+        duration_minutes (int): Length of the meeting, a multiple of utils.SLOT_MINUTES. Default is 60.
+        min_attendees (int): Accept slots where at least this many owners are free. Defaults to all of them.
+        step_minutes (int): Spacing of candidate start times, see FreeBusyEngine.start_mask.
+        engine (FreeBusyEngine): Engine used to compute free masks. A new one is used if omitted.
+        timezone (str): IANA zone of date_range and of the returned slots. Defaults to 'UTC' when any
+            owner has a time zone. Owners without one are taken to be in this zone.
+
+    Returns:
+        list: GroupSlot tuples in chronological order.
+
+    Raises:
+        ValueError: If min_attendees is not between 1 and the number of owners.
+    """
+    engine = engine or FreeBusyEngine()
+    start_date, end_date = (d if isinstance(d, date) else date.fromisoformat(d) for d in date_range)
+    grid = [owner_free_masks(owner, start_date, end_date, timezone, engine) for owner in calendar_owners]
+    return common_slots(grid, [owner.id for owner in calendar_owners], start_date, duration_minutes, min_attendees,
+                        step_minutes)
+
+
+def common_slots(grid, owner_ids, start_date: date, duration_minutes: int = 60, min_attendees: int = None,
+                 step_minutes: int = None):
+    """
+    Find common slots in free masks that were already computed, e.g. gathered from several processes.
+
+    Args:
+        grid (list): One list of day masks per owner, as returned by owner_free_masks for the same dates.
+        owner_ids (list): The owner ID of each row of the grid.
+        start_date (datetime.date): The date of the first mask of each row.
+        duration_minutes (int): Length of the meeting, a multiple of utils.SLOT_MINUTES. Default is 60.
+        min_attendees (int): Accept slots where at least this many owners are free. Defaults to all of them.
+        step_minutes (int): Spacing of candidate start times, see FreeBusyEngine.start_mask.
+
+    Returns:
+        list: GroupSlot tuples in chronological order.
+
+    Raises:
+        ValueError: If min_attendees is not between 1 and the number of owners.
+    """
+    required = len(owner_ids) if min_attendees is None else min_attendees
+    if not 1 <= required <= len(owner_ids):
+        raise ValueError(f"min_attendees must be between 1 and {len(owner_ids)}.")
+
+    length = duration_minutes // SLOT_MINUTES
+    if length > SLOTS_PER_DAY:
+        return []  # Meetings never span midnight, so nothing longer than a day fits
+    starts_allowed = FreeBusyEngine.start_mask(duration_minutes, step_minutes)
+    find = _find_with_numpy if np is not None else _find_with_bitmasks
+    hits = find(grid, length, starts_allowed, required)
+    return [GroupSlot(start_date + timedelta(days=day), slot * SLOT_MINUTES, slot * SLOT_MINUTES + duration_minutes,
+                      tuple(owner_ids[i] for i in attendees))
+            for day, slot, attendees in hits]
+
+
+def owner_free_masks(calendar_owner, start_date: date, end_date: date, timezone: str = None,
+                     engine: FreeBusyEngine = None):
+    """
+    Get an owner's free masks for the dates start_date .. end_date of a time zone.
+
+    Args:
+        calendar_owner (CalendarOwner): The owner whose calendar is checked.
+        start_date (datetime.date): The first date, in timezone.
+        end_date (datetime.date): The last date (inclusive), in timezone.
+        timezone (str): IANA zone of the dates, default is 'UTC'. Only used when the owner has a zone
+            of its own: an owner without one is taken to be in this zone.
+        engine (FreeBusyEngine): Engine used to compute free masks. A new one is used if omitted.
+
+    Returns:
+        list: One free-slot mask per date, in chronological order.
+    """
+    engine = engine or FreeBusyEngine()
+    owner_zone = calendar_owner.timezone
+    timezone = timezone or "UTC"
+    if owner_zone is None or owner_zone == timezone:
+        return engine.free_masks(calendar_owner, start_date, end_date)
+    # Offsets are under a day, so the owner's days two either side of the range cover it
+    first_local = start_date - timedelta(days=2)
+    local_masks = engine.free_masks(calendar_owner, first_local, end_date + timedelta(days=2))
+    first_utc, utc_masks = to_utc_masks(local_masks, first_local, owner_zone)
+    return from_utc_masks(utc_masks, first_utc, timezone, start_date, (end_date - start_date).days + 1)
+
+
+def _find_with_numpy(grid, length, starts_allowed, required):
+    """Yield (day, slot, owner indexes) hits by intersecting the grid as a NumPy matrix."""
+    owners, days = len(grid), len(grid[0])
+    packed = b"".join(mask.to_bytes(_MASK_BYTES, "little") for masks in grid for mask in masks)
+    free = np.unpackbits(np.frombuffer(packed, dtype=np.uint8), bitorder="little")
+    free = free.reshape(owners, days, _MASK_BYTES * 8)[:, :, :SLOTS_PER_DAY]
+
+    # A meeting fits at slot s when the slots s .. s + length - 1 are all free: compare window sums
+    totals = np.zeros((owners, days, SLOTS_PER_DAY + 1), dtype=np.int32)
+    np.cumsum(free, axis=2, out=totals[:, :, 1:])
+    fits = np.zeros((owners, days, SLOTS_PER_DAY), dtype=bool)
+    fits[:, :, :SLOTS_PER_DAY - length + 1] = (totals[:, :, length:] - totals[:, :, :SLOTS_PER_DAY - length + 1]) == length
+    fits &= np.array([(starts_allowed >> s) & 1 for s in range(SLOTS_PER_DAY)], dtype=bool)
+
+    counts = fits.sum(axis=0)
+    for day, slot in zip(*np.nonzero(counts >= required)):
+        yield int(day), int(slot), np.flatnonzero(fits[:, day, slot]).tolist()
+
+
+def _find_with_bitmasks(grid, length, starts_allowed, required):
+    """Yield (day, slot, owner indexes) hits by intersecting the integer day masks."""
+    everyone = list(range(len(grid)))
+    for day in range(len(grid[0])):
+        fits = [run_starts(masks[day], length) & starts_allowed for masks in grid]
+        if required == len(grid):
+            common = starts_allowed
+            for mask in fits:
+                common &= mask
+            for slot in iter_bits(common):
+                yield day, slot, everyone
+            continue
+
+        candidates = 0
+        for mask in fits:
+            candidates |= mask
+        for slot in iter_bits(candidates):
+            attendees = [i for i, mask in enumerate(fits) if (mask >> slot) & 1]
+            if len(attendees) >= required:
+                yield day, slot, attendees
@@ -0,0 +1,154 @@
+"""
+A small stdlib-only HTTP/JSON endpoint over AsyncSchedulingService, meant for load testing.
+
+Routes:
+    GET  /owners/<owner_id>/slots?days=7&duration=60&start=YYYY-MM-DD
+    GET  /owners/<owner_id>/appointments
+    POST /owners/<owner_id>/appointments  {"invitee", "date", "start_time", "end_time"}
+
+Run with: python -m services.http_server --port 8080 --demo-owners 100
+"""
+import argparse
+import asyncio
+import json
+from datetime import date
+from urllib.parse import parse_qs, urlsplit
+
+from services.async_service import AsyncSchedulingService
+from utils.utils import format_minutes
+
+_REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            409: "Conflict", 500: "Internal Server Error"}
+
+
+async def handle_request(service: AsyncSchedulingService, method: str, target: str, body: bytes):
+    """
+    Route one request to the service.
+
+    Args:
+        service (AsyncSchedulingService): The service answering the request.
+        method (str): The HTTP method.
+        target (str): The request target, path and query string.
+        body (bytes): The request body.
+
+    Returns:
+        tuple: (status code, JSON-serializable payload).
+    """
+    url = urlsplit(target)
+    parts = url.path.strip("/").split("/")
+    if len(parts) != 3 or parts[0] != "owners" or parts[2] not in ("slots", "appointments"):
+        return 404, {"error": f"No route for {url.path}"}
+    owner_id, resource = parts[1], parts[2]
+
+    try:
+        if resource == "slots" and method == "GET":
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            slots = await service.search_slots(
+                owner_id,
+                start_date=date.fromisoformat(query["start"]) if "start" in query else None,
+                days=int(query.get("days", 7)),
+                duration_minutes=int(query.get("duration", 60)),
+            )
+            return 200, {"slots": [{"date": slot.date.isoformat(), "start": format_minutes(slot.start_minutes),
+                                    "end": format_minutes(slot.end_minutes)} for slot in slots]}
+
+        if resource == "appointments" and method == "GET":
+            appointments = await service.list_appointments(owner_id)
+            return 200, {"appointments": [{"invitee": a.invitee_name, "date": a.date,
+                                           "start": format_minutes(a.start_minutes),
+                                           "end": format_minutes(a.end_minutes)} for a in appointments]}
+
+        if resource == "appointments" and method == "POST":
+            request = json.loads(body or b"{}")
+            result = await service.book(owner_id, request["invitee"], request["date"],
+                                        request["start_time"], request["end_time"])
+            return (201 if result["booked"] else 409), result
+    except (KeyError, ValueError) as e:  # Missing fields, bad JSON, dates or times (KeyError is a LookupError)
+        return 400, {"error": f"Invalid request: {e}"}
+    except LookupError as e:
+        return 404, {"error": str(e)}
+
+    return 405, {"error": f"{method} is not supported on {url.path}"}
+
+
+async def _serve_connection(service: AsyncSchedulingService, reader, writer):
+    """Serve keep-alive HTTP/1.1 requests on one connection until the client closes it."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break  # Client closed the connection
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+            try:
+                status, payload = await handle_request(service, method, target, body)
+            except Exception as e:  # Never let one bad request take the connection handler down
+                status, payload = 500, {"error": str(e)}
+            data = json.dumps(payload).encode()
+            keep_alive = headers.get("connection", "").lower() != "close"
+            writer.write(
+                f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                .encode("latin-1") + data)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass  # Malformed request or client went away mid-request
+    finally:
+        writer.close()
+
+
+async def start_server(service: AsyncSchedulingService = None, host: str = "127.0.0.1", port: int = 8080):
+    """
+    Start the HTTP endpoint.
+
+    Args:
+        service (AsyncSchedulingService): The service to expose, a new one over InMemoryDatabase by default.
+        host (str): Interface to bind, default is 127.0.0.1.
+        port (int): Port to bind, default is 8080. Use 0 to pick a free port.
+
+    Returns:
+        asyncio.Server: The running server.
+    """
+    service = service or AsyncSchedulingService()
+    return await asyncio.start_server(lambda r, w: _serve_connection(service, r, w), host, port)
+
+
+def main():
+    """Command line entry point: serve the InMemoryDatabase, optionally seeded with demo owners."""
+    from database.in_memory_database import InMemoryDatabase
+    from models.availability_rule import AvailabilityRule
+    from models.calendar_owner import CalendarOwner
+
+    parser = argparse.ArgumentParser(description="Serve the meeting scheduler over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-concurrency", type=int, default=256)
+    parser.add_argument("--demo-owners", type=int, default=0, help="Seed owners with IDs 0..N-1 for load tests.")
+    args = parser.parse_args()
+
+    db = InMemoryDatabase.get_instance()
+    for number in range(args.demo_owners):
+        db.add_calendar_owner(str(number), CalendarOwner(f"Owner {number}", AvailabilityRule(), str(number)))
+
+    async def serve():
+        server = await start_server(AsyncSchedulingService(db, args.max_concurrency), args.host, args.port)
+        print(f"Serving on http://{args.host}:{args.port}")
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Import historical appointments from CSV or JSONL files through CalendarOwner.bulk_book.
+
+Both formats carry the fields owner_id, invitee, date, start and end. start and end are times such
+as '9:30 AM' or '14:30'. CSV files need a header row naming the columns.
+"""
+import csv
+import json
+from collections import Counter
+from itertools import islice
+
+
+def import_rows(rows, database, batch_size: int = 50000) -> Counter:
+    """
+    Book rows in batches, grouped by owner.
+
+    Args:
+        rows (iterable): Mappings with owner_id, invitee, date, start and end.
+        database: Any object with get_calendar_owner(owner_id), e.g. InMemoryDatabase.
+        batch_size (int): Rows read per batch, default is 50000.
+
+    Returns:
+        Counter: Number of rows per outcome: booked, conflict, unavailable, invalid or unknown_owner.
+    """
+    totals = Counter()
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return totals
+        by_owner = {}
+        for row in batch:
+            by_owner.setdefault(row["owner_id"], []).append(
+                (row["invitee"], row["date"], row["start"], row["end"]))
+        for owner_id, requests in by_owner.items():
+            owner = database.get_calendar_owner(owner_id)
+            if owner is None:
+                totals["unknown_owner"] += len(requests)
+                continue
+            totals.update(result.status for result in owner.bulk_book(requests))
+
+
+def import_csv(path: str, database, batch_size: int = 50000) -> Counter:
+    """
+    Import appointments from a CSV file with a header row.
+
+    Args:
+        path (str): Path of the CSV file.
+        database: Any object with get_calendar_owner(owner_id).
+        batch_size (int): Rows read per batch, default is 50000.
+
+    Returns:
+        Counter: Number of rows per outcome, see import_rows.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        return import_rows(csv.DictReader(f), database, batch_size)
+
+
+def import_jsonl(path: str, database, batch_size: int = 50000) -> Counter:
+    """
+    Import appointments from a JSON Lines file, one object per line.
+
+    Args:
+        path (str): Path of the JSONL file.
+        database: Any object with get_calendar_owner(owner_id).
+        batch_size (int): Rows read per batch, default is 50000.
+
+    Returns:
+        Counter: Number of rows per outcome, see import_rows.
+    """
+    with open(path, encoding="utf-8") as f:
+        return import_rows((json.loads(line) for line in f if line.strip()), database, batch_size)
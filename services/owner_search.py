@@ -0,0 +1,99 @@
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+import heapq
+
+from services.free_busy import FreeBusyEngine
+from utils.timezones import convert
+from utils.utils import WEEKDAYS, format_minutes
+
+MAX_WORKERS = 8  # Threads evaluating owners at once, per search
+
+
+class OwnerSlot(namedtuple("OwnerSlot", ["calendar_owner", "date", "start_minutes", "end_minutes"])):
+    """
+    A free slot in one of several calendar owners' calendars.
+
+    Attributes:
+        calendar_owner (CalendarOwner): The owner who is free.
+        date (datetime.date): The date of the slot.
+        start_minutes (int): Start of the slot in minutes since midnight.
+        end_minutes (int): End of the slot in minutes since midnight.
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        """Render the slot as e.g. '2024-12-09 Monday Time: 9:00 - 10:00 with Owner 1'."""
+        return (f"{self.date.isoformat()} {WEEKDAYS[self.date.weekday()]} "
+                f"Time: {format_minutes(self.start_minutes)} - {format_minutes(self.end_minutes)} "
+                f"with {self.calendar_owner.name}")
+
+
+def search_across_owners(calendar_owners, date_range, duration_minutes: int = 60, step_minutes: int = None,
+                         engine: FreeBusyEngine = None, timezone: str = None, max_workers: int = MAX_WORKERS):
+    """
+    Stream the free slots of several calendar owners in one chronological order.
+
+    Each owner is searched one date at a time on a thread pool: the first date of every owner is
+    submitted up front, and an owner's next date is submitted as soon as its current one is taken.
+    The per-owner streams are merged lazily with heapq.merge, so the first slots are available
+    once every owner's first date is searched, and closing the generator stops the search.
+
+    Args:
+        calendar_owners (list): The CalendarOwner objects to search.
+        date_range (tuple): (start_date, end_date), inclusive, as datetime.date or YYYY-MM-DD strings.
+        duration_minutes (int): Length of the meeting, a multiple of utils.SLOT_MINUTES. Default is 60.
+        step_minutes (int): Spacing of candidate start times, see FreeBusyEngine.start_mask.
+        engine (FreeBusyEngine): Engine used to compute free slots. A new one is used if omitted.
+        timezone (str): IANA zone of date_range and of the slots. Owners in another zone have their
+            slots converted; None leaves every owner's slots in its own local time.
+        max_workers (int): Threads evaluating owners at once, default is MAX_WORKERS.
+
+    Yields:
+        OwnerSlot: Free slots ordered by date and start time, ties in the order of calendar_owners.
+    """
+    engine = engine or FreeBusyEngine()
+    start_date, end_date = (d if isinstance(d, date) else date.fromisoformat(d) for d in date_range)
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(calendar_owners))),
+                                  thread_name_prefix="owner-search")
+    try:
+        streams = [_owner_stream(executor, engine, owner, start_date, end_date, duration_minutes, step_minutes,
+                                 timezone) for owner in calendar_owners]
+        for stream in streams:
+            next(stream)  # Submit every owner's first date before waiting on any of them
+        yield from heapq.merge(*streams, key=_chronological)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _owner_stream(executor, engine, calendar_owner, start_date, end_date, duration_minutes, step_minutes, timezone):
+    """
+    Yield None once the first date is submitted, then an owner's slots in chronological order.
+
+    Owners in another zone are searched from one day before to one day after the range, and their
+    slots are converted and clipped to the range.
+    """
+    owner_zone = calendar_owner.timezone
+    converting = timezone is not None and owner_zone is not None and owner_zone != timezone
+    day, last_day = (start_date - timedelta(days=1), end_date + timedelta(days=1)) if converting else (start_date, end_date)
+    first, last = start_date.toordinal(), end_date.toordinal()
+
+    future = executor.submit(engine.day_slots, calendar_owner, day, duration_minutes, step_minutes)
+    yield None
+    while future is not None:
+        slots = future.result()
+        day += timedelta(days=1)
+        future = (executor.submit(engine.day_slots, calendar_owner, day, duration_minutes, step_minutes)
+                  if day <= last_day else None)  # Prefetch the next date while this one is consumed
+        for slot in slots:
+            if not converting:
+                yield OwnerSlot(calendar_owner, slot.date, slot.start_minutes, slot.end_minutes)
+                continue
+            ordinal, start = convert(owner_zone, timezone, slot.date.toordinal(), slot.start_minutes)
+            if first <= ordinal <= last:
+                yield OwnerSlot(calendar_owner, date.fromordinal(ordinal), start, start + duration_minutes)
+
+
+def _chronological(slot):
+    """Sort key of an OwnerSlot: date, then start time."""
+    return slot.date, slot.start_minutes
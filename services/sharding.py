@@ -0,0 +1,302 @@
+"""
+Run the scheduler across several worker processes, partitioned by CalendarOwner ID.
+
+Each shard is a separate process with its own InMemoryDatabase, so shards book and search on
+their own cores without sharing the GIL. A ShardedScheduler in the calling process routes each
+call to the shard owning the owner ID (a stable CRC-32 hash of it) over a pipe. Batched calls and
+group searches are scattered to every shard involved at once and gathered afterwards.
+
+Example:
+    with ShardedScheduler(shards=4) as scheduler:
+        scheduler.add_calendar_owner(owner)
+        scheduler.book(owner.id, "Alice", "2024-12-09", "10 AM", "11 AM")
+"""
+from datetime import date, timedelta
+import multiprocessing
+import os
+import threading
+import zlib
+
+from services.group_finder import common_slots
+
+_STOP = "stop"  # Request that ends a shard's loop
+
+
+def shard_for(owner_id: str, shards: int) -> int:
+    """Return the shard index of an owner ID. The hash is stable across processes and restarts."""
+    return zlib.crc32(owner_id.encode("utf-8")) % shards
+
+
+class ShardedScheduler:
+    """
+    Route search, book and list calls to worker processes partitioned by CalendarOwner ID.
+
+    Thread safety: each shard's pipe carries one request at a time under its own lock, so threads
+    calling into different shards run in parallel and calls into the same shard are serialized.
+
+    Attributes:
+        shards (int): Number of worker processes.
+    """
+
+    def __init__(self, shards: int = None):
+        """
+        Start the worker processes.
+
+        Args:
+            shards (int): Number of worker processes, defaults to the number of CPUs.
+        """
+        self.shards = shards or os.cpu_count() or 1
+        context = multiprocessing.get_context("spawn")  # Fresh interpreters, so no parent state is copied
+        self._connections = []
+        self._locks = []
+        self._processes = []
+        for index in range(self.shards):
+            connection, child_connection = context.Pipe()
+            process = context.Process(target=_serve_shard, args=(child_connection,), daemon=True,
+                                      name=f"scheduler-shard-{index}")
+            process.start()
+            child_connection.close()  # The child holds its own copy
+            self._connections.append(connection)
+            self._locks.append(threading.Lock())
+            self._processes.append(process)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add_calendar_owner(self, calendar_owner):
+        """
+        Copy a CalendarOwner, with its rule, time zone, retention policy and appointments, archived
+        ones included, to the shard that owns it.
+
+        Later changes to the local object are not forwarded; book through the scheduler instead.
+        """
+        calendar = calendar_owner.calendar
+        policy = calendar.retention_policy
+        state = {"name": calendar_owner.name, "timezone": calendar_owner.timezone,
+                 "rule": calendar_owner.availability_rule.to_dict(),
+                 "retention": None if policy is None else tuple(policy),
+                 "appointments": [(a.invitee_name, a.date, a.start_minutes, a.end_minutes)
+                                  for a in calendar.archived_appointments() + list(calendar.list_upcoming_appointments())]}
+        self._call(shard_for(calendar_owner.id, self.shards), ("add_owner", calendar_owner.id, state))
+
+    def search_slots(self, owner_id: str, start_date: date = None, days: int = 7, duration_minutes: int = 60):
+        """
+        Search an owner's free slots, see AsyncSchedulingService.search_slots.
+
+        Returns:
+            list: FreeSlot tuples in chronological order.
+
+        Raises:
+            LookupError: If the owner does not exist.
+        """
+        request = ("search", owner_id, start_date or date.today(), days, duration_minutes)
+        return self._call(shard_for(owner_id, self.shards), request)
+
+    def book(self, owner_id: str, invitee_name: str, date_str: str, start_time: str, end_time: str):
+        """
+        Book a slot with an owner, see AsyncSchedulingService.book.
+
+        Returns:
+            dict: {"booked": bool, "message": str} as reported by Invitee.book_slot.
+
+        Raises:
+            LookupError: If the owner does not exist.
+            ValueError: If the date or times are invalid.
+        """
+        request = ("book", owner_id, invitee_name, date_str, start_time, end_time)
+        return self._call(shard_for(owner_id, self.shards), request)
+
+    def list_appointments(self, owner_id: str):
+        """
+        List an owner's appointments.
+
+        Returns:
+            list: (invitee_name, date, start_minutes, end_minutes) tuples in booking order.
+
+        Raises:
+            LookupError: If the owner does not exist.
+        """
+        return self._call(shard_for(owner_id, self.shards), ("list", owner_id))
+
+    def book_many(self, requests):
+        """
+        Book a batch of requests, every shard working on its part at the same time.
+
+        Args:
+            requests (list): (owner_id, invitee_name, date, start_time, end_time) tuples.
+
+        Returns:
+            list: One {"booked", "message"} dict per request, in order. Requests for unknown owners
+                or with invalid times get {"booked": False, "message": <the error>}.
+        """
+        return self._scatter_by_owner("book_many", requests)
+
+    def search_many(self, requests):
+        """
+        Run a batch of slot searches, every shard working on its part at the same time.
+
+        Args:
+            requests (list): (owner_id, start_date, days, duration_minutes) tuples.
+
+        Returns:
+            list: One list of FreeSlot tuples per request, in order; empty for unknown owners.
+        """
+        return self._scatter_by_owner("search_many", requests)
+
+    def find_common_slots(self, owner_ids, date_range, duration: int = 60, min_attendees: int = None,
+                          timezone: str = None):
+        """
+        Find slots in which several owners are free together, wherever their shards are.
+
+        Every shard involved computes the free masks of its owners at the same time. The masks are
+        gathered and intersected here, see services.group_finder.find_common_slots.
+
+        Raises:
+            LookupError: If an owner ID is unknown.
+            ValueError: If min_attendees is out of range.
+        """
+        start_date, end_date = (d if isinstance(d, date) else date.fromisoformat(d) for d in date_range)
+        by_shard = {}
+        for owner_id in owner_ids:
+            by_shard.setdefault(shard_for(owner_id, self.shards), []).append(owner_id)
+        masks = {}
+        for result in self._scatter({shard: ("free_masks", ids, start_date, end_date, timezone)
+                                     for shard, ids in by_shard.items()}).values():
+            masks.update(result)
+        return common_slots([masks[owner_id] for owner_id in owner_ids], list(owner_ids), start_date, duration,
+                            min_attendees)
+
+    def close(self):
+        """Stop the worker processes."""
+        for connection, lock in zip(self._connections, self._locks):
+            with lock:
+                try:
+                    connection.send((_STOP,))
+                except (BrokenPipeError, OSError):
+                    pass  # Already gone
+                connection.close()
+        for process in self._processes:
+            process.join(timeout=5)
+        self._connections, self._locks, self._processes = [], [], []
+
+    def _call(self, shard: int, request: tuple):
+        """Send one request to a shard and return its result, re-raising the shard's exception."""
+        with self._locks[shard]:
+            self._connections[shard].send(request)
+            status, result = self._connections[shard].recv()
+        if status == "error":
+            raise result
+        return result
+
+    def _scatter(self, requests_by_shard: dict) -> dict:
+        """Send one request to each shard, then gather every result. Maps a shard to its result."""
+        shards = sorted(requests_by_shard)  # Fixed lock order, so concurrent scatters cannot deadlock
+        for shard in shards:
+            self._locks[shard].acquire()
+        try:
+            for shard in shards:
+                self._connections[shard].send(requests_by_shard[shard])
+            replies = {shard: self._connections[shard].recv() for shard in shards}
+        finally:
+            for shard in shards:
+                self._locks[shard].release()
+        for status, result in replies.values():
+            if status == "error":
+                raise result
+        return {shard: result for shard, (_, result) in replies.items()}
+
+    def _scatter_by_owner(self, operation: str, requests):
+        """Split requests by the shard of their first field (the owner ID), scatter them, and restore the order."""
+        positions, by_shard = {}, {}
+        for position, request in enumerate(requests):
+            shard = shard_for(request[0], self.shards)
+            positions.setdefault(shard, []).append(position)
+            by_shard.setdefault(shard, []).append(request)
+        results = [None] * len(requests)
+        gathered = self._scatter({shard: (operation, batch) for shard, batch in by_shard.items()})
+        for shard, batch_results in gathered.items():
+            for position, result in zip(positions[shard], batch_results):
+                results[position] = result
+        return results
+
+
+def _serve_shard(connection):
+    """Answer requests on a pipe until told to stop. Runs in the worker process."""
+    # Imported here so the parent only pays for them if it uses the models itself
+    from database.in_memory_database import InMemoryDatabase
+    from models.appointment import Appointment
+    from models.availability_rule import AvailabilityRule
+    from models.calendar import RetentionPolicy
+    from models.calendar_owner import CalendarOwner
+    from models.invitee import SEARCH_CACHE_SIZE, Invitee
+    from services.free_busy import FreeBusyEngine
+    from services.group_finder import owner_free_masks
+    from utils.utils import WEEKDAYS
+
+    database = InMemoryDatabase.get_instance()
+    engine = FreeBusyEngine(cache_size=SEARCH_CACHE_SIZE)
+
+    def owner(owner_id):
+        calendar_owner = database.get_calendar_owner(owner_id)
+        if calendar_owner is None:
+            raise LookupError(f"Unknown CalendarOwner ID: {owner_id}")
+        return calendar_owner
+
+    def add_owner(owner_id, state):
+        calendar_owner = CalendarOwner(state["name"], AvailabilityRule.from_dict(state["rule"]), owner_id,
+                                       state["timezone"])
+        calendar_owner.calendar.bulk_try_book([Appointment(name, day, start // 60, end // 60, start % 60, end % 60)
+                                               for name, day, start, end in state["appointments"]])
+        if state["retention"] is not None:
+            calendar_owner.calendar.set_retention_policy(RetentionPolicy(*state["retention"]))  # Archives the past again
+        database.add_calendar_owner(owner_id, calendar_owner)
+
+    def search(owner_id, start_date, days, duration_minutes):
+        return engine.find_slots(owner(owner_id), start_date, start_date + timedelta(days=days - 1), duration_minutes)
+
+    def book(owner_id, invitee_name, date_str, start_time, end_time):
+        day = WEEKDAYS[date.fromisoformat(date_str).weekday()]
+        message = Invitee(invitee_name, owner(owner_id)).book_slot(date_str, start_time, end_time, day)
+        return {"booked": message.startswith("Successfully"), "message": message}
+
+    def book_many(requests):
+        results = []
+        for request in requests:
+            try:
+                results.append(book(*request))
+            except (LookupError, ValueError) as e:
+                results.append({"booked": False, "message": str(e)})
+        return results
+
+    def search_many(requests):
+        results = []
+        for owner_id, start_date, days, duration_minutes in requests:
+            calendar_owner = database.get_calendar_owner(owner_id)
+            results.append([] if calendar_owner is None else search(owner_id, start_date, days, duration_minutes))
+        return results
+
+    def list_appointments(owner_id):
+        return [(a.invitee_name, a.date, a.start_minutes, a.end_minutes)
+                for a in owner(owner_id).calendar.list_upcoming_appointments()]
+
+    def free_masks(owner_ids, start_date, end_date, timezone):
+        return {owner_id: owner_free_masks(owner(owner_id), start_date, end_date, timezone, engine)
+                for owner_id in owner_ids}
+
+    handlers = {"add_owner": add_owner, "search": search, "book": book, "book_many": book_many,
+                "search_many": search_many, "list": list_appointments, "free_masks": free_masks}
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            break  # The router went away
+        if request[0] == _STOP:
+            break
+        try:
+            connection.send(("ok", handlers[request[0]](*request[1:])))
+        except Exception as e:
+            connection.send(("error", e))
+    connection.close()
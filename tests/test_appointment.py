@@ -20,5 +20,29 @@ class TestAppointment(unittest.TestCase):
         expected_str = "Date: 2024-12-06, Time: 10:00 - 11:00, Invitee: Invitee 1"
         self.assertEqual(str(self.appointment), expected_str)
 
+    def test_appointment_minutes(self):
+        """Test appointments that start or end part way through an hour."""
+        appointment = Appointment("Invitee 1", "2024-12-06", 10, 12, 30, 0)
+        self.assertEqual(appointment.start_minutes, 630)
+        self.assertEqual(appointment.end_minutes, 720)
+        self.assertEqual(str(appointment), "Date: 2024-12-06, Time: 10:30 - 12:00, Invitee: Invitee 1")
+
+    def test_appointment_compact_storage(self):
+        """Test that appointments use slots, interned invitee IDs and date ordinals."""
+        other = Appointment("Invitee 1", "2024-12-07", 14, 15)
+        self.assertFalse(hasattr(self.appointment, "__dict__"))
+        self.assertEqual(self.appointment.invitee_id, other.invitee_id)
+        self.assertEqual(other.date_ordinal - self.appointment.date_ordinal, 1)
+        with self.assertRaises(ValueError):
+            Appointment("Invitee 1", "not a date", 10, 11)
+
+    def test_appointment_times_out_of_range(self):
+        """Test that negative and past-midnight times raise ValueError instead of wrapping or IndexError."""
+        for start_hour, end_hour, start_minute, end_minute in ((-1, 10, 0, 0), (10, 25, 0, 0), (23, 24, 0, 30),
+                                                               (9, 10, 60, 0), (9, 10, -15, 0)):
+            with self.assertRaises(ValueError):
+                Appointment("Invitee 1", "2024-12-06", start_hour, end_hour, start_minute, end_minute)
+        self.assertEqual(Appointment("Invitee 1", "2024-12-06", 23, 24).end_minutes, 24 * 60)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+from models.appointment import Appointment
+from models.appointment_store import AppointmentColumns
+
+class TestAppointmentColumns(unittest.TestCase):
+
+    def setUp(self):
+        """Setup a store with two appointments."""
+        self.store = AppointmentColumns([Appointment("Invitee 1", "2024-12-06", 10, 11),
+                                         Appointment("Invitee 2", "2024-12-07", 14, 15, 30, 0)])
+
+    def test_views(self):
+        """Test that rows are exposed as appointment-like views."""
+        self.assertEqual(len(self.store), 2)
+        view = self.store[1]
+        self.assertEqual(view.invitee_name, "Invitee 2")
+        self.assertEqual(view.date, "2024-12-07")
+        self.assertEqual((view.start_hour, view.start_minute, view.end_hour), (14, 30, 15))
+        self.assertEqual(str(self.store[-2]), "Date: 2024-12-06, Time: 10:00 - 11:00, Invitee: Invitee 1")
+        with self.assertRaises(IndexError):
+            self.store[2]
+
+    def test_iteration(self):
+        """Test iterating yields views in insertion order."""
+        self.store.append(Appointment("Invitee 3", "2024-12-08", 9, 10))
+        self.assertEqual([view.invitee_name for view in self.store], ["Invitee 1", "Invitee 2", "Invitee 3"])
+        self.assertEqual(self.store.ids.itemsize + self.store.dates.itemsize * 4, 24)  # int64 ID, four int32 columns
+
+    def test_compress_round_trip(self):
+        """Test that compressed stores come back with the same rows and appointment IDs."""
+        restored = AppointmentColumns.decompress(self.store.compress())
+        self.assertEqual([(v.id, str(v)) for v in restored], [(v.id, str(v)) for v in self.store])
+        appointment = restored[0].to_appointment()
+        self.assertEqual((appointment.id, appointment.start_minutes), (self.store[0].id, 600))
+
+if __name__ == '__main__':
+    unittest.main()
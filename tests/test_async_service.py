@@ -0,0 +1,71 @@
+import asyncio
+import json
+import unittest
+from datetime import date
+from database.in_memory_database import InMemoryDatabase
+from models.availability_rule import AvailabilityRule
+from models.calendar_owner import CalendarOwner
+from services.async_service import AsyncSchedulingService
+from services.http_server import start_server
+
+class TestAsyncSchedulingService(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        """Setup an owner available 9 AM - 5 PM on Mondays."""
+        self.owner = CalendarOwner("Owner 1", AvailabilityRule(9, 17, {"Monday"}), "async-1")
+        InMemoryDatabase.get_instance().add_calendar_owner(self.owner.id, self.owner)
+        self.service = AsyncSchedulingService(max_concurrency=8)
+
+    async def test_concurrent_bookings_same_slot(self):
+        """Test that only one of many concurrent bookings for a slot succeeds."""
+        results = await asyncio.gather(*(
+            self.service.book("async-1", f"Invitee {n}", "2024-12-09", "10 AM", "11 AM") for n in range(50)))
+        self.assertEqual(sum(result["booked"] for result in results), 1)
+        self.assertEqual(len(await self.service.list_appointments("async-1")), 1)
+
+    async def test_search_slots(self):
+        """Test searching slots excludes booked time."""
+        await self.service.book("async-1", "Invitee 1", "2024-12-09", "10 AM", "11 AM")
+        slots = await self.service.search_slots("async-1", date(2024, 12, 9), days=7)
+        self.assertEqual([s.start_minutes // 60 for s in slots], [9, 11, 12, 13, 14, 15, 16])
+
+    async def test_unknown_owner(self):
+        """Test that unknown owners raise LookupError."""
+        with self.assertRaises(LookupError):
+            await self.service.list_appointments("missing")
+
+    async def test_http_endpoint(self):
+        """Test booking and listing through the HTTP/JSON endpoint."""
+        server = await start_server(self.service, port=0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        async def request(method, path, payload=None):
+            body = json.dumps(payload).encode() if payload is not None else b""
+            writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n"
+                         .encode() + body)
+            status = int((await reader.readline()).split()[1])
+            headers = {}
+            while (line := await reader.readline()) != b"\r\n":
+                name, _, value = line.decode().partition(":")
+                headers[name.lower()] = value.strip()
+            return status, json.loads(await reader.readexactly(int(headers["content-length"])))
+
+        try:
+            booking = {"invitee": "Invitee 1", "date": "2024-12-09", "start_time": "9:30", "end_time": "10:00"}
+            self.assertEqual((await request("POST", "/owners/async-1/appointments", booking))[0], 201)
+            self.assertEqual((await request("POST", "/owners/async-1/appointments", booking))[0], 409)
+            status, payload = await request("GET", "/owners/async-1/appointments")
+            self.assertEqual(payload["appointments"],
+                             [{"invitee": "Invitee 1", "date": "2024-12-09", "start": "9:30", "end": "10:00"}])
+            status, payload = await request("GET", "/owners/async-1/slots?start=2024-12-09&days=1")
+            self.assertEqual(payload["slots"][0], {"date": "2024-12-09", "start": "10:00", "end": "11:00"})
+            self.assertEqual((await request("GET", "/owners/missing/slots"))[0], 404)
+            self.assertEqual((await request("POST", "/owners/async-1/appointments", {"date": "x"}))[0], 400)
+        finally:
+            writer.close()
+            server.close()
+            await server.wait_closed()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+from datetime import date
 from models.availability_rule import AvailabilityRule
 
 class TestAvailabilityRule(unittest.TestCase):
@@ -48,5 +49,66 @@ class TestAvailabilityRule(unittest.TestCase):
         with self.assertRaises(ValueError):
             rule.update_rule(17, 10, {"Monday"})
 
+    def test_multiple_windows(self):
+        """Test a day split into a morning and an afternoon window."""
+        rule = AvailabilityRule()
+        rule.set_windows({"Monday"}, [("9 AM", "12 PM"), (13 * 60, 17 * 60)])
+        self.assertTrue(rule.is_valid_slot("Monday", 9, 12))
+        self.assertTrue(rule.is_valid_slot("Monday", 16, 17))
+        self.assertFalse(rule.is_valid_slot("Monday", 11, 14))  # Spans the lunch break
+        self.assertTrue(rule.is_valid_slot("Tuesday", 10, 17))  # Other days keep start_hour - end_hour
+
+    def test_date_override(self):
+        """Test that a holiday override only affects its date."""
+        rule = AvailabilityRule()
+        rule.set_override("2024-12-25", [])
+        self.assertFalse(rule.is_available("Wednesday", 600, 660, "2024-12-25"))
+        self.assertTrue(rule.is_available("Wednesday", 600, 660, date(2024, 12, 18)))
+
+        rule.remove_override(date(2024, 12, 25))
+        self.assertTrue(rule.is_available("Wednesday", 600, 660, "2024-12-25"))
+
+    def test_recurrence_every_other_week(self):
+        """Test that the weekly pattern can apply every other week."""
+        rule = AvailabilityRule()
+        rule.set_recurrence(2, anchor="2024-12-11")  # The week of Monday 2024-12-09
+        self.assertNotEqual(rule.date_mask(date(2024, 12, 9)), 0)
+        self.assertEqual(rule.date_mask(date(2024, 12, 16)), 0)
+        self.assertNotEqual(rule.date_mask(date(2024, 12, 27)), 0)
+
+    def test_update_rule_resets_windows_and_notifies(self):
+        """Test that update_rule replaces the weekly pattern and every change bumps the generation."""
+        rule = AvailabilityRule()
+        events = []
+        rule.add_observer(lambda event, payload: events.append(event))
+        rule.set_windows({"Monday"}, [])
+        rule.update_rule(9, 18, {"Monday"})
+        self.assertTrue(rule.is_valid_slot("Monday", 9, 18))
+        self.assertEqual(events, ["rule_updated", "rule_updated"])
+        self.assertEqual(rule.generation, 2)
+
+    def test_serialization(self):
+        """Test that to_dict and from_dict round-trip every part of the rule."""
+        rule = AvailabilityRule(9, 17, {"Monday", "Friday"})
+        rule.set_windows({"Friday"}, [("9 AM", "11 AM")])
+        rule.set_override("2024-12-24", [("10 AM", "12 PM")])
+        rule.set_recurrence(2, "2024-12-09")
+
+        copy = AvailabilityRule.from_dict(rule.to_dict())
+        self.assertEqual(copy.to_dict(), rule.to_dict())
+        self.assertEqual(copy.date_mask(date(2024, 12, 24)), rule.date_mask(date(2024, 12, 24)))
+
+    def test_invalid_window(self):
+        """Test that reversed windows and windows off the quarter hours are rejected."""
+        rule = AvailabilityRule()
+        with self.assertRaises(ValueError):
+            rule.set_windows({"Monday"}, [("5 PM", "9 AM")])
+        with self.assertRaises(ValueError):
+            rule.set_windows({"Monday"}, [("9:10", "10:50")])
+        with self.assertRaises(ValueError):
+            rule.set_override("2024-12-16", [(540, 605)])
+        self.assertEqual(rule.windows, {})
+
+
 if __name__ == '__main__':
     unittest.main()
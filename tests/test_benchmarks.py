@@ -0,0 +1,46 @@
+import json
+import unittest
+from datetime import date
+
+from benchmarks.datagen import generate_dataset
+from benchmarks.suite import find_regressions, run_suite
+
+
+class TestDatagen(unittest.TestCase):
+
+    def test_generate_dataset(self):
+        """Test that datasets have the requested size and are reproducible."""
+        first = generate_dataset(5, 20, 200, start_date=date(2024, 12, 9), seed=3)
+        second = generate_dataset(5, 20, 200, start_date=date(2024, 12, 9), seed=3)
+
+        self.assertEqual((len(first.owners), len(first.invitees)), (5, 20))
+        self.assertEqual(sum(len(owner.list_appointments()) for owner in first.owners), first.booked)
+        self.assertTrue(0 < first.booked <= 200)
+        self.assertEqual([str(a) for owner in first.owners for a in owner.list_appointments()],
+                         [str(a) for owner in second.owners for a in owner.list_appointments()])
+
+
+class TestSuite(unittest.TestCase):
+
+    def test_run_suite(self):
+        """Test that every scenario is timed and the results are JSON-serializable."""
+        results = run_suite({"tiny": (3, 10, 50)}, iterations=5)
+
+        self.assertEqual(set(results["results"]["tiny"]),
+                         {"search_available_slots", "book_slot", "list_appointments", "group_slots", "db_lookup",
+                          "dataset"})
+        json.dumps(results)
+
+    def test_find_regressions(self):
+        """Test that only slowdowns beyond the threshold are reported."""
+        baseline = {"results": {"small": {"search": {"p50_us": 100.0}, "book": {"p50_us": 10.0}}}}
+        current = {"results": {"small": {"search": {"p50_us": 120.0}, "book": {"p50_us": 15.0},
+                                         "new": {"p50_us": 1.0}}}}
+
+        self.assertEqual(find_regressions(current, baseline, threshold=0.25), [("small", "book", 10.0, 15.0)])
+        self.assertEqual(find_regressions(current, baseline, threshold=0.1),
+                         [("small", "search", 100.0, 120.0), ("small", "book", 10.0, 15.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
+import time
 import unittest
+from datetime import date
 from models.appointment import Appointment
-from models.calendar import Calendar
+from models.calendar import Calendar, RetentionPolicy
 
 class TestCalendar(unittest.TestCase):
 
@@ -40,5 +42,246 @@ class TestCalendar(unittest.TestCase):
         self.assertEqual(appointments[0].invitee_name, "Invitee 1")
         self.assertEqual(appointments[1].invitee_name, "Invitee 2")
 
+    def test_is_booked(self):
+        """Test that booked hours are reported by the booked-slot index."""
+        calendar = Calendar()
+        calendar.add_appointment(Appointment("Invitee 1", "2024-12-06", 10, 12))
+
+        # Assert that every covered hour is booked and nothing else is
+        self.assertTrue(calendar.is_booked("2024-12-06", 10))
+        self.assertTrue(calendar.is_booked("2024-12-06", 11))
+        self.assertFalse(calendar.is_booked("2024-12-06", 12))
+        self.assertFalse(calendar.is_booked("2024-12-06", 9))
+        self.assertFalse(calendar.is_booked("2024-12-07", 10))
+
+    def test_overlaps_minute_granular(self):
+        """Test overlap detection for bookings that are not whole hours."""
+        calendar = Calendar()
+        calendar.add_appointment(Appointment("Invitee 1", "2024-12-06", 10, 11, 30, 0))  # 10:30 - 11:00
+        calendar.add_appointment(Appointment("Invitee 2", "2024-12-06", 13, 14, 0, 30))  # 13:00 - 14:30
+
+        # Assert that partial overlaps are detected and adjacent ranges are not
+        self.assertTrue(calendar.overlaps("2024-12-06", 10 * 60 + 45, 11 * 60 + 15))
+        self.assertTrue(calendar.overlaps("2024-12-06", 14 * 60, 14 * 60 + 15))
+        self.assertTrue(calendar.is_booked("2024-12-06", 10))
+        self.assertFalse(calendar.overlaps("2024-12-06", 10 * 60, 10 * 60 + 30))
+        self.assertFalse(calendar.overlaps("2024-12-06", 11 * 60, 13 * 60))
+        self.assertFalse(calendar.overlaps("2024-12-06", 14 * 60 + 30, 15 * 60))
+
+    def test_overlaps_nested_bookings(self):
+        """Test that a booking nested inside a longer one does not hide the longer one."""
+        calendar = Calendar()
+        outer = Appointment("Invitee 1", "2024-12-06", 9, 12)
+        calendar.add_appointment(outer)
+        nested = Appointment("Invitee 2", "2024-12-06", 10, 10, 0, 30)  # Inside 9:00 - 12:00
+        calendar.add_appointment(nested)
+
+        self.assertTrue(calendar.overlaps("2024-12-06", 11 * 60, 11 * 60 + 30))
+        self.assertTrue(calendar.is_booked("2024-12-06", 11))
+        self.assertFalse(calendar.try_book(Appointment("Invitee 3", "2024-12-06", 11, 12)))
+        self.assertFalse(calendar.overlaps("2024-12-06", 12 * 60, 13 * 60))
+        self.assertFalse(calendar.reschedule(nested.id, ("2024-12-06", 660, 690)))  # Still inside the outer booking
+        self.assertTrue(calendar.reschedule(outer.id, ("2024-12-06", 630, 720)))  # Only its own old slot is in the way
+
+        calendar.cancel(outer.id)
+        self.assertFalse(calendar.overlaps("2024-12-06", 11 * 60, 11 * 60 + 30))
+        self.assertTrue(calendar.try_book(Appointment("Invitee 3", "2024-12-06", 11, 12)))
+
+    def test_appointments_between(self):
+        """Test range scans by date return appointments in chronological order."""
+        calendar = Calendar()
+        calendar.add_appointment(Appointment("Invitee 1", "2024-12-08", 9, 10))
+        calendar.add_appointment(Appointment("Invitee 2", "2024-12-06", 14, 15))
+        calendar.add_appointment(Appointment("Invitee 3", "2024-12-06", 10, 11))
+        calendar.add_appointment(Appointment("Invitee 4", "2024-12-10", 10, 11))
+
+        appointments = calendar.appointments_between("2024-12-06", "2024-12-08")
+
+        # Assert that only appointments in range are listed, ordered by date and start time
+        self.assertEqual([a.invitee_name for a in appointments], ["Invitee 3", "Invitee 2", "Invitee 1"])
+        self.assertEqual([a.invitee_name for a in calendar.appointments_on("2024-12-06")], ["Invitee 3", "Invitee 2"])
+
+    def test_try_book(self):
+        """Test that try_book refuses overlapping appointments."""
+        calendar = Calendar()
+        self.assertTrue(calendar.try_book(Appointment("Invitee 1", "2024-12-06", 10, 11)))
+        self.assertFalse(calendar.try_book(Appointment("Invitee 2", "2024-12-06", 10, 11, 30, 30)))
+        self.assertTrue(calendar.try_book(Appointment("Invitee 2", "2024-12-06", 11, 12)))
+        self.assertEqual(len(calendar.appointments), 2)
+
+class TestCancelAndReschedule(unittest.TestCase):
+
+    def setUp(self):
+        """Setup a calendar with two back-to-back appointments on 2024-12-06."""
+        self.calendar = Calendar()
+        self.first = Appointment("Invitee 1", "2024-12-06", 10, 11)
+        self.second = Appointment("Invitee 2", "2024-12-06", 11, 12)
+        self.calendar.add_appointment(self.first)
+        self.calendar.add_appointment(self.second)
+
+    def test_cancel_frees_slot(self):
+        """Test that cancelling removes the appointment from every index."""
+        events = []
+        self.calendar.add_observer(lambda event, payload: events.append(event))
+        generation = self.calendar.day_generation("2024-12-06")
+        self.assertTrue(self.calendar.cancel(self.first.id))
+        self.assertFalse(self.calendar.cancel(self.first.id))
+
+        self.assertEqual(list(self.calendar.appointments), [self.second])
+        self.assertIsNone(self.calendar.get_appointment(self.first.id))
+        self.assertFalse(self.calendar.overlaps("2024-12-06", 600, 660))
+        self.assertEqual(self.calendar.busy_mask("2024-12-06"), 0b1111 << 44)
+        self.assertGreater(self.calendar.day_generation("2024-12-06"), generation)
+        self.assertEqual(events, ["appointment_cancelled"])
+
+        self.calendar.cancel(self.second.id)
+        self.assertEqual((self.calendar.appointments_on("2024-12-06"), self.calendar.busy_mask("2024-12-06")), ([], 0))
+        self.assertEqual(self.calendar.appointments_between("2024-12-01", "2024-12-31"), [])
+
+    def test_reschedule_keeps_id(self):
+        """Test moving an appointment, including onto part of its own old slot."""
+        self.assertTrue(self.calendar.reschedule(self.first.id, ("2024-12-06", 570, 630)))
+        moved = self.calendar.get_appointment(self.first.id)
+        self.assertEqual((moved.invitee_name, moved.date, moved.start_minutes, moved.end_minutes),
+                         ("Invitee 1", "2024-12-06", 570, 630))
+        self.assertEqual([a.id for a in self.calendar.appointments], [self.first.id, self.second.id])
+        self.assertTrue(self.calendar.overlaps("2024-12-06", 570, 600))
+        self.assertFalse(self.calendar.overlaps("2024-12-06", 630, 660))
+
+        self.assertTrue(self.calendar.reschedule(self.first.id, (date(2024, 12, 9), 600, 660)))
+        self.assertEqual(self.calendar.appointments_on("2024-12-06"), [self.second])
+
+    def test_reschedule_conflict_keeps_old_slot(self):
+        """Test that a move onto a taken slot changes nothing."""
+        self.assertFalse(self.calendar.reschedule(self.first.id, ("2024-12-06", 690, 750)))
+        self.assertIs(self.calendar.get_appointment(self.first.id), self.first)
+        self.assertTrue(self.calendar.overlaps("2024-12-06", 600, 660))
+        with self.assertRaises(LookupError):
+            self.calendar.reschedule(-1, ("2024-12-06", 600, 660))
+
+    def test_reschedule_rejects_invalid_slots(self):
+        """Test that reversed, empty, out-of-day and unaligned slots raise and change nothing."""
+        for slot in ((700, 650), (600, 600), (1400, 1500), (-15, 60), (605, 660)):
+            with self.assertRaises(ValueError):
+                self.calendar.reschedule(self.first.id, ("2030-01-07",) + slot)
+        self.assertIs(self.calendar.get_appointment(self.first.id), self.first)
+
+    def test_thawed_appointments_keep_ids(self):
+        """Test that archiving and thawing a month keeps appointment IDs, so they can still be cancelled."""
+        self.calendar.compact(today=date(2025, 1, 15))
+        self.assertEqual([a.id for a in self.calendar.archived_appointments()], [self.first.id, self.second.id])
+        self.assertTrue(self.calendar.try_book(Appointment("Invitee 3", "2024-12-09", 10, 11)))  # Thaws December
+        self.assertEqual(self.calendar.get_appointment(self.first.id).start_minutes, 600)
+        self.assertTrue(self.calendar.cancel(self.first.id))
+
+class TestHolds(unittest.TestCase):
+
+    def setUp(self):
+        """Setup an empty calendar and a clock reading."""
+        self.calendar = Calendar()
+        self.now = time.monotonic()
+
+    def test_hold_blocks_then_confirms(self):
+        """Test that a hold blocks other bookings and becomes an appointment on confirm."""
+        held = Appointment("Invitee 1", "2024-12-06", 10, 11)
+        self.assertTrue(self.calendar.hold(held, ttl_seconds=60, now=self.now))
+        self.assertFalse(self.calendar.try_book(Appointment("Invitee 2", "2024-12-06", 10, 11, 30, 30)))
+        self.assertFalse(self.calendar.hold(Appointment("Invitee 2", "2024-12-06", 10, 11), now=self.now))
+        self.assertEqual((len(self.calendar.appointments), self.calendar.appointments_on("2024-12-06")), (0, []))
+
+        self.assertTrue(self.calendar.confirm(held.id, now=self.now + 30))
+        self.assertEqual(list(self.calendar.appointments), [held])
+        self.assertFalse(self.calendar.confirm(held.id, now=self.now + 30))
+        self.assertEqual(self.calendar.expire_holds(now=self.now + 120), 0)  # Booked, so no longer held
+        self.assertTrue(self.calendar.overlaps("2024-12-06", 600, 660))
+
+    def test_release_and_expiry_free_slot(self):
+        """Test that released and expired holds free their slots."""
+        first = Appointment("Invitee 1", "2024-12-06", 10, 11)
+        second = Appointment("Invitee 1", "2024-12-06", 11, 12)
+        self.calendar.hold(first, ttl_seconds=60, now=self.now)
+        self.calendar.hold(second, ttl_seconds=600, now=self.now)
+        self.assertTrue(self.calendar.release(first.id))
+        self.assertFalse(self.calendar.release(first.id))
+        self.assertEqual(self.calendar.busy_mask("2024-12-06"), 0b1111 << 44)
+
+        self.assertFalse(self.calendar.confirm(second.id, now=self.now + 600))  # TTL passed, wheel not ticked yet
+        self.assertEqual(self.calendar.busy_mask("2024-12-06"), 0)
+
+    def test_expired_holds_stop_blocking_searches(self):
+        """Test that searches release holds whose TTL passed on the real clock."""
+        from models.availability_rule import AvailabilityRule
+        from models.calendar_owner import CalendarOwner
+        from services.free_busy import FreeBusyEngine
+        owner = CalendarOwner("Owner 1", AvailabilityRule(10, 12, {"Friday"}), "hold-owner")
+        engine = FreeBusyEngine(cache_size=8)
+        owner.calendar.hold(Appointment("Invitee 1", "2024-12-06", 11, 12), ttl_seconds=5, now=self.now - 100)
+        owner.calendar.hold(Appointment("Invitee 2", "2024-12-06", 10, 11), ttl_seconds=600, now=self.now - 100)
+        self.assertEqual([s.start_minutes for s in engine.find_slots(owner, date(2024, 12, 6), date(2024, 12, 6))], [660])
+
+class TestCalendarTiering(unittest.TestCase):
+
+    def setUp(self):
+        """Setup a calendar with appointments in October, November and December 2024."""
+        self.calendar = Calendar()
+        for day in ("2024-10-07", "2024-11-04", "2024-11-05", "2024-12-02"):
+            self.calendar.add_appointment(Appointment("Invitee 1", day, 10, 11))
+        self.calendar.add_appointment(Appointment("Invitee 2", "2024-11-04", 14, 15, 0, 30))
+
+    def test_compact_archives_past_months(self):
+        """Test that months before the hot window leave the hot tier but still block bookings."""
+        self.assertEqual(self.calendar.compact(today=date(2024, 12, 15)), (4, 0))  # The default policy
+
+        self.assertEqual([a.date for a in self.calendar.list_upcoming_appointments()], ["2024-12-02"])
+        self.assertEqual([(a.date, a.start_minutes) for a in self.calendar.archived_appointments("2024-11-01")],
+                         [("2024-11-04", 600), ("2024-11-04", 840), ("2024-11-05", 600)])
+        self.assertTrue(self.calendar.overlaps("2024-11-04", 870, 900))
+        self.assertFalse(self.calendar.overlaps("2024-11-04", 930, 960))
+        self.assertEqual(self.calendar.busy_mask("2024-10-07"), 0b1111 << 40)
+        self.assertEqual([a.invitee_name for a in self.calendar.appointments_between("2024-11-04", "2024-12-02")],
+                         ["Invitee 1", "Invitee 2", "Invitee 1", "Invitee 1"])
+
+    def test_booking_thaws_archived_month(self):
+        """Test that booking into an archived month brings it back to the hot tier."""
+        self.calendar.compact(today=date(2024, 12, 15))
+        self.assertFalse(self.calendar.try_book(Appointment("Invitee 3", "2024-11-05", 10, 11)))
+        self.assertTrue(self.calendar.try_book(Appointment("Invitee 3", "2024-11-05", 11, 12)))
+
+        self.assertEqual(sorted(a.date for a in self.calendar.list_upcoming_appointments()),
+                         ["2024-11-04", "2024-11-04", "2024-11-05", "2024-11-05", "2024-12-02"])
+        self.assertEqual([a.date for a in self.calendar.archived_appointments()], ["2024-10-07"])
+
+    def test_retention_drops_old_months(self):
+        """Test that archived months past retention are deleted."""
+        self.calendar.retention_policy = RetentionPolicy(hot_months=1, retention_months=2)
+        generation = self.calendar.generation
+        self.assertEqual(self.calendar.compact(today=date(2025, 1, 10)), (4, 1))
+
+        self.assertEqual([a.date for a in self.calendar.list_upcoming_appointments()], ["2024-12-02"])
+        self.assertEqual({a.date[:7] for a in self.calendar.archived_appointments()}, {"2024-11"})
+        self.assertEqual(self.calendar.busy_mask("2024-10-07"), 0)
+        self.assertGreater(self.calendar.day_generation("2024-10-07"), generation)
+
+    def test_tiering_moves_are_announced(self):
+        """Test that archiving, thawing and dropping months notify observers."""
+        events = []
+        self.calendar.add_observer(lambda event, payload: events.append((event, payload)))
+        self.calendar.retention_policy = RetentionPolicy(hot_months=0, retention_months=1)
+        self.calendar.compact(today=date(2024, 12, 15))
+        self.calendar.retention_policy = None  # Or the booking compacts again against the real date
+        self.calendar.try_book(Appointment("Invitee 3", "2024-11-05", 11, 12))
+
+        self.assertEqual([event for event, _ in events],
+                         ["appointments_archived", "appointments_dropped", "appointments_thawed", "appointment_added"])
+        self.assertEqual([a.date for a in events[0][1]], ["2024-10-07", "2024-11-04", "2024-11-05", "2024-11-04"])
+        self.assertEqual(events[1][1], "2024-11")
+        self.assertEqual(sorted(a.date for a in events[2][1]), ["2024-11-04", "2024-11-04", "2024-11-05"])
+
+    def test_policy_compacts_automatically(self):
+        """Test that setting a policy compacts against today without an explicit call."""
+        self.calendar.set_retention_policy(RetentionPolicy())
+        self.assertEqual(self.calendar.list_upcoming_appointments(), [])
+        self.assertEqual(len(self.calendar.archived_appointments()), 5)
+
 if __name__ == '__main__':
     unittest.main()
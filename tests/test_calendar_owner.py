@@ -1,6 +1,7 @@
 import unittest
 from models.appointment import Appointment
 from models.invitee import Invitee
+from models.availability_rule import AvailabilityRule
 from models.calendar_owner import CalendarOwner
 
 class TestCalendarOwner(unittest.TestCase):
@@ -98,5 +99,46 @@ class TestCalendarOwner(unittest.TestCase):
         self.assertEqual(appointments[0].start_hour, 10)
         self.assertEqual(appointments[0].end_hour, 11)
 
+
+class TestBulkBook(unittest.TestCase):
+
+    def setUp(self):
+        # 2024-12-09 is a Monday, 2024-12-14 a Saturday
+        self.calendar_owner = CalendarOwner("Owner 1", AvailabilityRule(9, 17, {"Monday", "Tuesday"}), "bulk-owner")
+
+    def test_bulk_book_statuses(self):
+        """Test that each request gets its own outcome, in input order."""
+        results = self.calendar_owner.bulk_book([
+            ("Invitee 1", "2024-12-09", "9 AM", "10 AM"),
+            ("Invitee 2", "2024-12-09", "9:30", "10:30"),       # Overlaps the first request
+            ("Invitee 3", "2024-12-14", "9 AM", "10 AM"),       # Saturday
+            ("Invitee 4", "2024-12-09", "4:30 PM", "5:30 PM"),  # Ends after 5 PM
+            ("Invitee 5", "2024-12-09", "10:10", "11 AM"),      # Not on a quarter hour
+            ("Invitee 6", "not-a-date", "9 AM", "10 AM"),
+            ("Invitee 7", "2024-12-09", 600, 630),              # Minutes since midnight
+        ])
+
+        self.assertEqual([result.status for result in results],
+                         ["booked", "conflict", "unavailable", "unavailable", "invalid", "invalid", "booked"])
+        self.assertEqual(results[6].appointment.start_minutes, 600)
+        self.assertEqual(len(self.calendar_owner.list_appointments()), 2)
+
+    def test_bulk_book_rejects_minutes_outside_the_day(self):
+        """Test that integer times outside the day are invalid rather than errors."""
+        results = self.calendar_owner.bulk_book([("Invitee 1", "2030-01-07", -15, 60),
+                                                 ("Invitee 1", "2030-01-07", 1425, 1455),
+                                                 ("Invitee 1", "2030-01-07", 540, 600)])
+        self.assertEqual([result.status for result in results], ["invalid", "invalid", "booked"])
+
+    def test_bulk_book_skips_existing_bookings(self):
+        """Test that bulk bookings conflict with appointments already in the calendar."""
+        self.calendar_owner.calendar.add_appointment(Appointment("Invitee 1", "2024-12-10", 14, 15))
+
+        results = self.calendar_owner.bulk_book([("Invitee 2", "2024-12-10", "2 PM", "3 PM"),
+                                                 ("Invitee 2", "2024-12-10", "3 PM", "4 PM")])
+
+        self.assertEqual([result.status for result in results], ["conflict", "booked"])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+from datetime import date
+from unittest import mock
+from models.appointment import Appointment
+from models.availability_rule import AvailabilityRule
+from models.calendar_owner import CalendarOwner
+from services import free_busy
+from services.free_busy import FreeBusyEngine, FreeSlot, run_starts
+
+class TestFreeBusyEngine(unittest.TestCase):
+
+    def setUp(self):
+        """Setup an owner available 9 AM - 12 PM on Mondays and Tuesdays."""
+        self.engine = FreeBusyEngine()
+        self.owner = CalendarOwner("Owner 1", AvailabilityRule(9, 12, {"Monday", "Tuesday"}), "1")
+        self.monday = date(2024, 12, 9)
+
+    def test_run_starts(self):
+        """Test finding the start of runs of consecutive set bits."""
+        self.assertEqual(run_starts(0b0111100, 1), 0b0111100)
+        self.assertEqual(run_starts(0b0111100, 3), 0b0001100)
+        self.assertEqual(run_starts(0b0111100, 4), 0b0000100)
+        self.assertEqual(run_starts(0b0111100, 5), 0)
+
+    def test_free_mask(self):
+        """Test that a day's free mask is availability minus bookings."""
+        self.owner.calendar.add_appointment(Appointment("Invitee 1", "2024-12-09", 10, 10, 0, 30))
+        available = self.owner.availability_rule.slot_mask("Monday")
+        self.assertEqual(bin(available).count("1"), 12)  # Three hours of quarter-hour slots
+        self.assertEqual(self.engine.free_mask(self.owner, self.monday), available & ~(0b11 << 40))
+        self.assertEqual(self.engine.free_mask(self.owner, date(2024, 12, 11)), 0)  # Wednesday
+
+    def test_find_slots_over_range(self):
+        """Test searching a multi-week range returns chronological structured slots."""
+        self.owner.calendar.add_appointment(Appointment("Invitee 1", "2024-12-10", 10, 11))
+        slots = self.engine.find_slots(self.owner, self.monday, date(2024, 12, 22))
+
+        self.assertEqual(len(slots), 3 + 2 + 3 + 3)  # Two weeks of Mondays and Tuesdays
+        self.assertEqual(slots[0], FreeSlot(self.monday, 540, 600))
+        self.assertNotIn(FreeSlot(date(2024, 12, 10), 600, 660), slots)
+        self.assertEqual(str(slots[0]), "2024-12-09 Monday Time: 9:00 - 10:00")
+
+    def test_find_slots_duration_and_step(self):
+        """Test custom durations and start spacing."""
+        slots = self.engine.find_slots(self.owner, self.monday, self.monday, 90, step_minutes=30)
+        self.assertEqual([(s.start_minutes, s.end_minutes) for s in slots], [(540, 630), (570, 660), (600, 690), (630, 720)])
+
+        with self.assertRaises(ValueError):
+            self.engine.find_slots(self.owner, self.monday, self.monday, 20)
+
+
+    def test_iter_slots_open_ended(self):
+        """Test that an open-ended search is lazy and gives up on owners who are never free."""
+        slots = self.engine.iter_slots(self.owner, self.monday)
+        self.assertEqual([next(slots) for _ in range(7)][-1], FreeSlot(date(2024, 12, 16), 540, 600))
+        never = CalendarOwner("Owner 2", AvailabilityRule(9, 12, set()), "2")
+        with mock.patch.object(free_busy, "MAX_SEARCH_DAYS", 30):
+            self.assertEqual(list(self.engine.iter_slots(never, self.monday)), [])
+
+class TestFreeSlotCache(unittest.TestCase):
+
+    def setUp(self):
+        """Setup a caching engine and an owner available 9 AM - 12 PM on Mondays and Tuesdays."""
+        self.engine = FreeBusyEngine(cache_size=2)
+        self.owner = CalendarOwner("Owner 1", AvailabilityRule(9, 12, {"Monday", "Tuesday"}), "1")
+        self.monday, self.sunday = date(2024, 12, 9), date(2024, 12, 15)
+        self.searched = []
+        search_day = self.engine._day_slots
+        self.engine._day_slots = lambda owner, day, *args: self.searched.append(day) or search_day(owner, day, *args)
+
+    def test_repeated_search_is_cached(self):
+        """Test that an unchanged calendar is not searched again."""
+        first = self.engine.find_slots(self.owner, self.monday, self.sunday)
+        self.searched.clear()
+        self.assertEqual(self.engine.find_slots(self.owner, self.monday, self.sunday), first)
+        self.assertEqual(self.searched, [])
+
+    def test_booking_patches_only_its_day(self):
+        """Test that a booking re-searches only the booked date."""
+        self.engine.find_slots(self.owner, self.monday, self.sunday)
+        self.searched.clear()
+        self.owner.calendar.try_book(Appointment("Invitee 1", "2024-12-10", 10, 11))
+
+        slots = self.engine.find_slots(self.owner, self.monday, self.sunday)
+        self.assertEqual(self.searched, [date(2024, 12, 10)])
+        self.assertNotIn(FreeSlot(date(2024, 12, 10), 600, 660), slots)
+        self.assertEqual(len(slots), 5)
+
+    def test_rule_update_invalidates_owner(self):
+        """Test that a rule update re-searches the whole range."""
+        self.engine.find_slots(self.owner, self.monday, self.sunday)
+        self.searched.clear()
+        self.owner.availability_rule.update_rule(9, 10, {"Monday"})
+
+        self.assertEqual(self.engine.find_slots(self.owner, self.monday, self.sunday),
+                         [FreeSlot(self.monday, 540, 600)])
+        self.assertEqual(len(self.searched), 7)
+
+    def test_lru_eviction(self):
+        """Test that the cache holds at most cache_size searches."""
+        for duration in (15, 30, 60):
+            self.engine.find_slots(self.owner, self.monday, self.sunday, duration)
+        self.assertEqual(len(self.engine._cache), 2)
+        self.searched.clear()
+        self.engine.find_slots(self.owner, self.monday, self.sunday, 15)  # Evicted first
+        self.assertEqual(len(self.searched), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+from datetime import date
+from unittest import mock
+from database.in_memory_database import InMemoryDatabase
+from models.appointment import Appointment
+from models.availability_rule import AvailabilityRule
+from models.calendar_owner import CalendarOwner
+from services import group_finder
+from services.group_finder import GroupSlot, find_common_slots
+
+class TestFindCommonSlots(unittest.TestCase):
+
+    def setUp(self):
+        """Setup three owners with partly overlapping Monday availability."""
+        self.owner_a = CalendarOwner("Owner A", AvailabilityRule(9, 12, {"Monday"}), "a")
+        self.owner_b = CalendarOwner("Owner B", AvailabilityRule(10, 13, {"Monday"}), "b")
+        self.owner_c = CalendarOwner("Owner C", AvailabilityRule(11, 17, {"Monday"}), "c")
+        self.owner_b.calendar.add_appointment(Appointment("Invitee 1", "2024-12-09", 10, 11))
+        self.owners = [self.owner_a, self.owner_b, self.owner_c]
+        self.date_range = ("2024-12-09", "2024-12-15")
+
+    def check_all_attendees(self):
+        slots = find_common_slots(self.owners, self.date_range)
+        self.assertEqual(slots, [GroupSlot(date(2024, 12, 9), 660, 720, ("a", "b", "c"))])
+
+    def check_min_attendees(self):
+        slots = find_common_slots(self.owners, self.date_range, 60, min_attendees=2)
+        self.assertEqual([(s.start_minutes, s.owner_ids) for s in slots],
+                         [(660, ("a", "b", "c")), (720, ("b", "c"))])
+
+    def check_duration(self):
+        slots = find_common_slots(self.owners[:2], self.date_range, 30, step_minutes=15)
+        self.assertEqual([s.start_minutes for s in slots], [660, 675, 690])
+
+    def check_longer_than_a_day(self):
+        self.assertEqual(find_common_slots(self.owners, self.date_range, 25 * 60), [])
+
+    @unittest.skipIf(group_finder.np is None, "NumPy is not installed")
+    def test_numpy(self):
+        """Test the vectorized NumPy intersection."""
+        self.check_all_attendees()
+        self.check_min_attendees()
+        self.check_duration()
+        self.check_longer_than_a_day()
+
+    def test_bitmask_fallback(self):
+        """Test the integer bitmask intersection used without NumPy."""
+        with mock.patch.object(group_finder, "np", None):
+            self.check_all_attendees()
+            self.check_min_attendees()
+            self.check_duration()
+            self.check_longer_than_a_day()
+
+    def test_invalid_min_attendees(self):
+        """Test that impossible attendee counts are rejected."""
+        with self.assertRaises(ValueError):
+            find_common_slots(self.owners, self.date_range, min_attendees=4)
+
+    def test_database_lookup(self):
+        """Test finding common slots by owner ID through the database."""
+        db = InMemoryDatabase.get_instance()
+        for owner in self.owners:
+            db.add_calendar_owner(owner.id, owner)
+        self.assertEqual(len(db.find_common_slots(["a", "b", "c"], self.date_range)), 1)
+        with self.assertRaises(ValueError):
+            db.find_common_slots(["a", "missing"], self.date_range)
+
+class TestCrossZoneSlots(unittest.TestCase):
+
+    def setUp(self):
+        """Setup owners in New York, London and Tokyo, each available 9 AM - 5 PM local time."""
+        days = {"Monday", "Tuesday", "Wednesday", "Thursday", "Friday"}
+        self.new_york = CalendarOwner("New York", AvailabilityRule(9, 17, days), "ny", "America/New_York")
+        self.london = CalendarOwner("London", AvailabilityRule(9, 17, days), "ldn", "Europe/London")
+        self.tokyo = CalendarOwner("Tokyo", AvailabilityRule(9, 17, days), "tyo", "Asia/Tokyo")
+        self.date_range = ("2026-06-01", "2026-06-01")  # A Monday
+
+    def test_overlap_in_utc(self):
+        """Test that working hours are intersected in UTC by default."""
+        slots = find_common_slots([self.new_york, self.london], self.date_range)
+        # 9 AM EDT is 13:00 UTC, 5 PM BST is 16:00 UTC
+        self.assertEqual([s.start_minutes for s in slots], [780, 840, 900])
+
+    def test_output_zone(self):
+        """Test that slots are reported on the days and clock of the requested zone."""
+        slots = find_common_slots([self.new_york, self.london], self.date_range, timezone="America/New_York")
+        self.assertEqual([(s.date, s.start_minutes) for s in slots],
+                         [(date(2026, 6, 1), 540), (date(2026, 6, 1), 600), (date(2026, 6, 1), 660)])
+
+    def test_no_overlap(self):
+        """Test that New York and Tokyo working hours never meet."""
+        self.assertEqual(find_common_slots([self.new_york, self.tokyo], ("2026-06-01", "2026-06-05")), [])
+        slots = find_common_slots([self.new_york, self.tokyo], self.date_range, min_attendees=1)
+        # On a UTC Monday, Tokyo works 0:00 - 8:00 and New York 13:00 - 21:00
+        self.assertEqual({(s.start_minutes, s.owner_ids) for s in slots},
+                         {(hour * 60, ("tyo",)) for hour in range(8)} | {(hour * 60, ("ny",)) for hour in range(13, 21)})
+
+if __name__ == '__main__':
+    unittest.main()
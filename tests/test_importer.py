@@ -0,0 +1,67 @@
+import json
+import os
+import tempfile
+import unittest
+
+from models.availability_rule import AvailabilityRule
+from models.calendar_owner import CalendarOwner
+from services.importer import import_csv, import_jsonl, import_rows
+
+
+class _Database:
+    """A minimal store so the tests do not touch the InMemoryDatabase singleton."""
+
+    def __init__(self, *owners):
+        self.owners = {owner.id: owner for owner in owners}
+
+    def get_calendar_owner(self, owner_id):
+        return self.owners.get(owner_id)
+
+
+class TestImporter(unittest.TestCase):
+
+    def setUp(self):
+        self.owner = CalendarOwner("Owner 1", AvailabilityRule(9, 17, {"Monday"}), "importer-owner")
+        self.database = _Database(self.owner)
+        self.rows = [
+            {"owner_id": "importer-owner", "invitee": "Invitee 1", "date": "2024-12-09", "start": "9 AM", "end": "10 AM"},
+            {"owner_id": "importer-owner", "invitee": "Invitee 2", "date": "2024-12-09", "start": "9:30", "end": "10:30"},
+            {"owner_id": "importer-owner", "invitee": "Invitee 3", "date": "2024-12-09", "start": "10:30", "end": "11:00"},
+            {"owner_id": "missing-owner", "invitee": "Invitee 4", "date": "2024-12-09", "start": "9 AM", "end": "10 AM"},
+        ]
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_import_rows_in_batches(self):
+        """Test that rows split across batches still conflict with each other."""
+        totals = import_rows(self.rows, self.database, batch_size=1)
+
+        self.assertEqual(totals, {"booked": 2, "conflict": 1, "unknown_owner": 1})
+        self.assertEqual(len(self.owner.list_appointments()), 2)
+
+    def test_import_csv(self):
+        """Test importing a CSV file with a header row."""
+        path = os.path.join(self.directory.name, "appointments.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("owner_id,invitee,date,start,end\n")
+            f.writelines(",".join(row.values()) + "\n" for row in self.rows)
+
+        totals = import_csv(path, self.database)
+
+        self.assertEqual(totals, {"booked": 2, "conflict": 1, "unknown_owner": 1})
+
+    def test_import_jsonl(self):
+        """Test importing a JSON Lines file."""
+        path = os.path.join(self.directory.name, "appointments.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(row) + "\n" for row in self.rows)
+
+        totals = import_jsonl(path, self.database)
+
+        self.assertEqual(totals, {"booked": 2, "conflict": 1, "unknown_owner": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
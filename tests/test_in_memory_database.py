@@ -0,0 +1,113 @@
+import unittest
+from datetime import date
+from database.in_memory_database import InMemoryDatabase
+from models.appointment import Appointment
+from models.availability_rule import AvailabilityRule
+from models.calendar import RetentionPolicy
+from models.calendar_owner import CalendarOwner
+from models.invitee import Invitee
+
+class TestSecondaryIndexes(unittest.TestCase):
+
+    def setUp(self):
+        """Setup two stored owners available 9 AM - 5 PM on Mondays, sharing an invitee name."""
+        self.db = InMemoryDatabase.get_instance()
+        self.owner_a = CalendarOwner("Index Owner", AvailabilityRule(9, 17, {"Monday"}), "index-a")
+        self.owner_b = CalendarOwner("Index Owner", AvailabilityRule(9, 17, {"Monday"}), "index-b")
+        self.db.add_calendar_owner(self.owner_a.id, self.owner_a)
+        self.db.add_calendar_owner(self.owner_b.id, self.owner_b)
+        self.invitee_a = Invitee("Index Invitee", self.owner_a)
+        self.invitee_b = Invitee("Index Invitee", self.owner_b, invitee_id="index-invitee-b")
+        self.owner_a.add_invitee(self.invitee_a)
+        self.owner_b.add_invitee(self.invitee_b)
+
+    def tearDown(self):
+        """Replace the test owners with empty ones, so other tests see clean indexes."""
+        for owner_id in ("index-a", "index-b"):
+            self.db.add_calendar_owner(owner_id, CalendarOwner("Removed", AvailabilityRule(), owner_id))
+
+    def test_owner_and_invitee_lookup(self):
+        """Test finding owners by name and invitees by name and ID."""
+        self.assertEqual({owner.id for owner in self.db.find_calendar_owners_by_name("Index Owner")},
+                         {"index-a", "index-b"})
+        self.assertEqual(self.db.find_calendar_owners_by_name("Nobody"), [])
+        self.assertEqual(len(self.db.find_invitees_by_name("Index Invitee")), 2)
+        self.assertIs(self.db.get_invitee("index-invitee-b"), self.invitee_b)
+        self.assertIsNone(self.db.get_invitee("missing"))
+
+    def test_appointments_by_invitee_and_date(self):
+        """Test that bookings on stored owners are indexed as they happen."""
+        self.invitee_b.book_slot("2030-01-14", "9 AM", "10 AM", "Monday")
+        self.invitee_a.book_slot("2030-01-07", "2 PM", "3 PM", "Monday")
+        self.owner_a.calendar.add_appointment(Appointment("Someone Else", "2030-01-07", 9, 10))
+
+        bookings = self.db.list_invitee_appointments("Index Invitee")
+        self.assertEqual([(owner_id, a.date) for owner_id, a in bookings],
+                         [("index-a", "2030-01-07"), ("index-b", "2030-01-14")])
+        bookings = self.db.list_appointments_between("2030-01-07", "2030-01-08")
+        self.assertEqual([(a.invitee_name, a.start_hour) for _, a in bookings],
+                         [("Someone Else", 9), ("Index Invitee", 14)])
+
+    def test_cancel_and_reschedule_update_indexes(self):
+        """Test that cancelled and moved bookings leave the indexes."""
+        self.invitee_a.book_slot("2030-01-07", "9 AM", "10 AM", "Monday")
+        self.invitee_a.book_slot("2030-01-07", "11 AM", "12 PM", "Monday")
+        first, second = self.owner_a.calendar.appointments
+        self.owner_a.calendar.cancel(first.id)
+        self.owner_a.calendar.reschedule(second.id, ("2030-01-14", 600, 660))
+
+        bookings = self.db.list_invitee_appointments("Index Invitee")
+        self.assertEqual([(a.date, a.start_minutes) for _, a in bookings], [("2030-01-14", 600)])
+        self.assertEqual(self.db.list_appointments_between("2030-01-07", "2030-01-07"), [])
+
+    def test_archived_and_dropped_months(self):
+        """Test that archived bookings are read from the cold tier and dropped ones disappear."""
+        calendar = self.owner_a.calendar
+        calendar.add_appointment(Appointment("Index Invitee", "2020-01-06", 9, 10))
+        calendar.add_appointment(Appointment("Index Invitee", "2020-02-03", 9, 10))
+        calendar.retention_policy = RetentionPolicy(hot_months=0, retention_months=1)
+        self.assertEqual(calendar.compact(today=date(2020, 3, 10)), (2, 1))
+
+        self.assertNotIn(date(2020, 2, 3).toordinal(), self.db._data["appointments_by_date"])  # Out of the hot index
+        self.assertEqual([(owner_id, a.date) for owner_id, a in self.db.list_invitee_appointments("Index Invitee")],
+                         [("index-a", "2020-02-03")])
+        self.assertEqual([a.date for _, a in self.db.list_appointments_between("2020-01-01", "2020-02-29")],
+                         ["2020-02-03"])
+
+        calendar.retention_policy = None  # Or the booking compacts again against the real date
+        calendar.try_book(Appointment("Index Invitee", "2020-02-03", 11, 12))  # Thaws February
+        self.assertEqual([(a.date, a.start_hour) for _, a in self.db.list_invitee_appointments("Index Invitee")],
+                         [("2020-02-03", 9), ("2020-02-03", 11)])
+
+    def test_cancelling_thawed_appointment(self):
+        """Test that an appointment cancelled after its month was archived and thawed leaves the indexes."""
+        calendar = self.owner_a.calendar
+        booking = Appointment("Bob", "2020-01-06", 9, 10)
+        calendar.add_appointment(booking)
+        calendar.compact(today=date(2020, 3, 10))
+        calendar.try_book(Appointment("Index Invitee", "2020-01-07", 9, 10))  # Thaws January
+        self.assertTrue(calendar.cancel(booking.id))
+
+        self.assertEqual(self.db.list_invitee_appointments("Bob"), [])
+        self.assertEqual([a.invitee_name for _, a in self.db.list_appointments_between("2020-01-01", "2020-01-31")],
+                         ["Index Invitee"])
+
+    def test_replacing_owner_drops_old_entries(self):
+        """Test that replacing an owner removes its invitees and appointments from the indexes."""
+        self.invitee_a.book_slot("2030-01-07", "2 PM", "3 PM", "Monday")
+        replacement = CalendarOwner("Renamed Owner", AvailabilityRule(9, 17, {"Monday"}), "index-a")
+        replacement.calendar.add_appointment(Appointment("New Invitee", "2030-01-07", 10, 11))
+        self.db.add_calendar_owner("index-a", replacement)
+
+        self.assertEqual([owner.id for owner in self.db.find_calendar_owners_by_name("Index Owner")], ["index-b"])
+        self.assertEqual(self.db.find_calendar_owners_by_name("Renamed Owner"), [replacement])
+        self.assertEqual(self.db.find_invitees_by_name("Index Invitee"), [self.invitee_b])
+        self.assertEqual(self.db.list_invitee_appointments("Index Invitee"), [])
+        self.assertEqual([a.invitee_name for _, a in self.db.list_appointments_between("2030-01-07", "2030-01-07")],
+                         ["New Invitee"])
+
+        self.invitee_a.book_slot("2030-01-07", "3 PM", "4 PM", "Monday")  # The old owner is no longer observed
+        self.assertEqual(self.db.list_invitee_appointments("Index Invitee"), [])
+
+if __name__ == '__main__':
+    unittest.main()
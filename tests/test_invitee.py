@@ -1,7 +1,12 @@
+from datetime import date, datetime
+import sys
+import threading
 import unittest
 from models.appointment import Appointment
 from models.invitee import Invitee
 from models.calendar_owner import CalendarOwner
+from models.availability_rule import AvailabilityRule
+from services.free_busy import FreeSlot
 from utils.utils import convert_to_24_hour
 
 class TestInvitee(unittest.TestCase):
@@ -31,5 +36,138 @@ class TestInvitee(unittest.TestCase):
         result = self.invitee.book_slot("Monday", "10 AM", "11 AM", "Monday")
         self.assertEqual(result, "Successfully booked slot: Monday 10 AM - 11 AM.")
 
+class TestInviteeTimezones(unittest.TestCase):
+
+    def setUp(self):
+        """Setup a New York owner available 9 AM - 5 PM on Mondays, and an invitee in Berlin."""
+        self.calendar_owner = CalendarOwner("Owner 1", AvailabilityRule(9, 17, {"Monday"}), "1", "America/New_York")
+        self.invitee = Invitee("Invitee 1", self.calendar_owner, "Europe/Berlin")
+
+    def test_book_slot_converts_to_owner_time(self):
+        """Test that a Berlin booking is stored at the owner's local time."""
+        self.assertEqual(self.invitee.book_slot("2026-06-01", "3 PM", "4 PM", "Monday"),
+                         "Successfully booked slot: 2026-06-01 3 PM - 4 PM.")
+        appointment = self.calendar_owner.calendar.appointments[0]
+        self.assertEqual((appointment.date, appointment.start_minutes), ("2026-06-01", 540))
+        start, _ = self.calendar_owner.appointment_times(appointment)
+        self.assertEqual((start.hour, start.utcoffset().total_seconds()), (13, 0))
+        unavailable = "Invalid availability: The owner is unavailable at this time."
+        self.assertEqual(self.invitee.book_slot("2026-06-01", "2 PM", "3 PM", "Monday"), unavailable)  # 8 AM EDT
+
+    def test_search_available_slots_in_invitee_zone(self):
+        """Test that slots are shown on the invitee's clock."""
+        slots = self.invitee.search_available_slots(horizon_days=7)
+        self.assertEqual(len(slots), 8)
+        self.assertTrue(slots[0].endswith("Monday Time: 15:00 - 16:00"))
+        self.assertTrue(slots[-1].endswith("Monday Time: 22:00 - 23:00"))
+
+class TestInviteeBooking(unittest.TestCase):
+
+    def setUp(self):
+        """Setup an owner available 9 AM - 5 PM on Mondays."""
+        self.calendar_owner = CalendarOwner("Owner 1", AvailabilityRule(9, 17, {"Monday"}), "1")
+        self.invitee = Invitee("Invitee 1", self.calendar_owner)
+
+    def test_book_slot_sub_hour_durations(self):
+        """Test booking 15, 30 and 90 minute slots."""
+        self.assertEqual(self.invitee.book_slot("2024-12-09", "9 AM", "9:15 AM", "Monday"),
+                         "Successfully booked slot: 2024-12-09 9 AM - 9:15 AM.")
+        self.assertEqual(self.invitee.book_slot("2024-12-09", "9:30", "10:00", "Monday"),
+                         "Successfully booked slot: 2024-12-09 9:30 - 10:00.")
+        self.assertEqual(self.invitee.book_slot("2024-12-09", "1 PM", "2:30 PM", "Monday"),
+                         "Successfully booked slot: 2024-12-09 1 PM - 2:30 PM.")
+        self.assertEqual(len(self.calendar_owner.calendar.appointments), 3)
+
+    def test_book_slot_respects_windows_and_overrides(self):
+        """Test that lunch breaks and holidays cannot be booked."""
+        self.calendar_owner.availability_rule.set_windows({"Monday"}, [("9 AM", "12 PM"), ("1 PM", "5 PM")])
+        self.calendar_owner.availability_rule.set_override("2024-12-16", [])
+        unavailable = "Invalid availability: The owner is unavailable at this time."
+
+        self.assertEqual(self.invitee.book_slot("2024-12-09", "12 PM", "1 PM", "Monday"), unavailable)
+        self.assertEqual(self.invitee.book_slot("2024-12-16", "10 AM", "11 AM", "Monday"), unavailable)
+        self.assertTrue(self.invitee.book_slot("2024-12-09", "1 PM", "2 PM", "Monday").startswith("Successfully"))
+
+    def test_book_slot_overlapping(self):
+        """Test that a booking overlapping a longer appointment is rejected."""
+        self.invitee.book_slot("2024-12-09", "10 AM", "11:30 AM", "Monday")
+        result = self.invitee.book_slot("2024-12-09", "11 AM", "12 PM", "Monday")
+        self.assertEqual(result, "Slot already booked for 2024-12-09 11 AM - 12 PM.")
+
+    def test_book_slot_invalid_duration(self):
+        """Test that unaligned or empty slots are rejected."""
+        with self.assertRaises(ValueError):
+            self.invitee.book_slot("2024-12-09", "10 AM", "10:10 AM", "Monday")
+        with self.assertRaises(ValueError):
+            self.invitee.book_slot("2024-12-09", "11 AM", "10 AM", "Monday")
+
+    def test_search_available_slots_duration(self):
+        """Test searching for slots of a custom duration."""
+        slots = self.invitee.search_available_slots(duration_minutes=90)
+        self.assertEqual(len(slots), 7)  # Hourly starts from 9:00 to 15:00
+        self.assertTrue(slots[1].endswith("Monday Time: 10:00 - 11:30"))
+
+    def test_search_available_slots_excludes_bookings(self):
+        """Test that booked time is not offered and results are chronological."""
+        slots = self.invitee.search_available_slots(horizon_days=14)
+        self.assertEqual(len(slots), 16)  # Two Mondays of eight hours each
+        first_monday = slots[0].split(" ")[0]
+        self.invitee.book_slot(first_monday, "10:30 AM", "11 AM", "Monday")
+
+        slots = self.invitee.search_available_slots(horizon_days=14)
+        self.assertEqual(len(slots), 15)
+        self.assertNotIn(f"{first_monday} Monday Time: 10:00 - 11:00", slots)
+        self.assertEqual(slots[1], f"{first_monday} Monday Time: 11:00 - 12:00")  # Chronological order
+
+    def test_iter_available_slots_pages(self):
+        """Test paging through an open-ended search with limit and cursor."""
+        first_page = list(self.invitee.iter_available_slots(not_before=date(2024, 12, 9), limit=3))
+        self.assertEqual(first_page, [FreeSlot(date(2024, 12, 9), start, start + 60) for start in (540, 600, 660)])
+        self.assertEqual(first_page[-1].cursor, "2024-12-09T11:00")
+
+        second_page = list(self.invitee.iter_available_slots(not_before=date(2024, 12, 9), limit=3,
+                                                             cursor=first_page[-1].cursor))
+        self.assertEqual([slot.start_minutes for slot in second_page], [720, 780, 840])
+        across_weeks = list(self.invitee.iter_available_slots(not_before=date(2024, 12, 9), limit=10))
+        self.assertEqual(across_weeks[-1], FreeSlot(date(2024, 12, 16), 600, 660))  # Eight slots per Monday
+        with self.assertRaises(ValueError):
+            next(self.invitee.iter_available_slots(cursor="not a cursor"))
+
+    def test_iter_available_slots_not_before_and_horizon(self):
+        """Test starting mid-day and stopping at the end of a bounded horizon."""
+        slots = list(self.invitee.iter_available_slots(not_before=datetime(2024, 12, 9, 15, 30), horizon_days=7))
+        self.assertEqual(slots, [FreeSlot(date(2024, 12, 9), 960, 1020)])  # Only 4 PM is left that week
+        self.invitee.book_slot("2024-12-09", "4 PM", "5 PM", "Monday")
+        self.assertEqual(list(self.invitee.iter_available_slots(not_before=datetime(2024, 12, 9, 15, 30),
+                                                                horizon_days=7)), [])
+
+    def test_book_slot_concurrent_no_double_booking(self):
+        """Stress test: many threads racing for the same slots never double-book."""
+        date, threads, attempts = "2024-12-09", 16, []
+        barrier = threading.Barrier(threads)
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # Switch threads as often as possible to provoke races
+
+        def book_every_hour(number):
+            invitee = Invitee(f"Invitee {number}", self.calendar_owner)
+            barrier.wait()
+            for hour in range(9, 17):
+                attempts.append(invitee.book_slot(date, str(hour), str(hour + 1), "Monday"))
+
+        try:
+            workers = [threading.Thread(target=book_every_hour, args=(n,)) for n in range(threads)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        # Every hour is booked exactly once and every other attempt was refused
+        booked = self.calendar_owner.calendar.appointments_on(date)
+        self.assertEqual([a.start_hour for a in booked], list(range(9, 17)))
+        self.assertEqual(sum(result.startswith("Successfully") for result in attempts), 8)
+        self.assertEqual(len(attempts), threads * 8)
+
 if __name__ == '__main__':
     unittest.main()
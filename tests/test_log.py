@@ -0,0 +1,59 @@
+import contextlib
+import io
+import logging
+import unittest
+
+from models.appointment import Appointment
+from models.calendar import Calendar
+from utils.log import LOGGER_NAME, start_queue_logging, stop_queue_logging
+
+
+class _ListHandler(logging.Handler):
+    """Collects emitted records."""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class TestLogging(unittest.TestCase):
+
+    def tearDown(self):
+        logging.getLogger(LOGGER_NAME).setLevel(logging.NOTSET)
+
+    def test_silent_by_default(self):
+        """Test that booking writes nothing to stdout or stderr."""
+        out, err = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            Calendar().try_book(Appointment("Invitee 1", "2024-12-09", 10, 11))
+
+        self.assertEqual(out.getvalue() + err.getvalue(), "")
+
+    def test_booking_event(self):
+        """Test that bookings are logged with their event name."""
+        with self.assertLogs(LOGGER_NAME, level="INFO") as logs:
+            Calendar().try_book(Appointment("Invitee 1", "2024-12-09", 10, 11))
+
+        self.assertEqual(logs.records[0].event, "appointment_added")
+        self.assertIn("Invitee: Invitee 1", logs.records[0].getMessage())
+
+    def test_queue_logging(self):
+        """Test that records reach the handlers through the background listener."""
+        handler = _ListHandler()
+        listener = start_queue_logging(handler)
+        try:
+            Calendar().bulk_try_book([Appointment("Invitee 1", "2024-12-09", 10, 11),
+                                      Appointment("Invitee 2", "2024-12-09", 10, 11)])
+        finally:
+            stop_queue_logging(listener)
+
+        events = [record.event for record in handler.records]
+        self.assertEqual(events, ["bulk_booked"])
+        self.assertEqual(handler.records[-1].getMessage(), "1 of 2 appointments added in bulk.")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+
+from models.availability_rule import AvailabilityRule
+from models.calendar_owner import CalendarOwner
+from models.invitee import Invitee
+from utils.metrics import disable_metrics, enable_metrics, metrics, prometheus_text, reset_metrics, write_prometheus
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        reset_metrics()
+        # 2024-12-09 is a Monday
+        self.calendar_owner = CalendarOwner("Owner 1", AvailabilityRule(9, 17, {"Monday"}), "metrics-owner")
+        self.invitee = Invitee("Invitee 1", self.calendar_owner)
+
+    def tearDown(self):
+        disable_metrics()
+        reset_metrics()
+
+    def test_disabled_by_default(self):
+        """Test that nothing is collected until metrics are enabled."""
+        self.invitee.book_slot("2024-12-09", "9 AM", "10 AM", "Monday")
+
+        self.assertEqual(metrics(), {"counters": {}, "gauges": {}, "histograms": {}, "rates": {}})
+
+    def test_booking_metrics(self):
+        """Test booking outcomes, rates, latencies and calendar sizes."""
+        enable_metrics()
+        self.invitee.book_slot("2024-12-09", "9 AM", "10 AM", "Monday")
+        self.invitee.book_slot("2024-12-09", "9 AM", "10 AM", "Monday")
+        self.invitee.book_slot("2024-12-09", "7 AM", "8 AM", "Monday")
+        with self.assertRaises(ValueError):
+            self.invitee.book_slot("2024-12-09", "10:10", "11 AM", "Monday")
+
+        snapshot = metrics()
+        self.assertEqual(snapshot["counters"]["bookings_total"],
+                         {"booked": 1, "conflict": 1, "unavailable": 1, "invalid": 1})
+        self.assertEqual(snapshot["counters"]["book_slot_errors_total"], 1)
+        self.assertEqual(snapshot["rates"]["bookings_total"]["conflict"], 0.25)
+        self.assertEqual(snapshot["gauges"]["calendar_appointments"], {"metrics-owner": 1})
+        latency = snapshot["histograms"]["book_slot"]
+        self.assertEqual(latency["count"], 4)
+        self.assertLessEqual(latency["p50"], latency["p99"])
+
+    def test_validation_metrics(self):
+        """Test that slot validations are counted by outcome."""
+        enable_metrics()
+        self.calendar_owner.validate_slot_booking("Monday", "10 AM", "11 AM")
+        self.calendar_owner.validate_slot_booking("Monday", "8 AM", "9 AM")
+
+        snapshot = metrics()
+        self.assertEqual(snapshot["counters"]["slot_validations_total"], {"valid": 1, "invalid": 1})
+        self.assertEqual(snapshot["histograms"]["validate_slot_booking"]["count"], 2)
+
+    def test_prometheus_dump(self):
+        """Test the Prometheus text file."""
+        enable_metrics()
+        self.invitee.book_slot("2024-12-09", "9 AM", "10 AM", "Monday")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scheduler.prom")
+            write_prometheus(path)
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+
+        self.assertEqual(text, prometheus_text())
+        self.assertIn('scheduler_bookings_total{outcome="booked"} 1', text)
+        self.assertIn("# TYPE scheduler_book_slot_seconds histogram", text)
+        self.assertIn('scheduler_book_slot_seconds_bucket{le="+Inf"} 1', text)
+        self.assertIn("scheduler_book_slot_seconds_count 1", text)
+
+
+if __name__ == '__main__':
+    unittest.main()
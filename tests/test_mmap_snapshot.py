@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from types import SimpleNamespace
+from database.mmap_snapshot import CalendarSnapshot, SnapshotPublisher, write_snapshot
+from models.appointment import Appointment
+from models.availability_rule import AvailabilityRule
+from models.calendar_owner import CalendarOwner
+from services.free_busy import FreeBusyEngine
+
+class TestCalendarSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        """Setup two owners available 9 AM - 12 PM on Mondays and a snapshot path."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "calendars.snap")
+        self.owners = [CalendarOwner(name, AvailabilityRule(9, 12, {"Monday"}), name) for name in ("owner-b", "a")]
+        self.owners[0].calendar.add_appointment(Appointment("Invitee 1", "2024-12-09", 10, 11))
+        self.week = (date(2024, 12, 9), date(2024, 12, 15))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_queries_match_engine(self):
+        """Test that searches on the mapped file give the same slots as the live engine."""
+        write_snapshot(self.path, self.owners, date(2024, 12, 1), 31, generation=1)
+        engine = FreeBusyEngine()
+        with CalendarSnapshot(self.path) as snapshot:
+            self.assertEqual(snapshot.owner_ids(), ["a", "owner-b"])
+            self.assertEqual(snapshot.date_range, (date(2024, 12, 1), date(2024, 12, 31)))
+            for owner in self.owners:
+                self.assertEqual(snapshot.find_slots(owner.id, *self.week, duration_minutes=30),
+                                 engine.find_slots(owner, *self.week, duration_minutes=30))
+                self.assertEqual(snapshot.free_masks(owner.id, *self.week), engine.free_masks(owner, *self.week))
+            self.assertEqual(snapshot.busy_mask("owner-b", date(2024, 12, 9)),
+                             self.owners[0].calendar.busy_mask("2024-12-09"))
+            with self.assertRaises(LookupError):
+                snapshot.free_mask("missing", date(2024, 12, 9))
+            with self.assertRaises(ValueError):
+                snapshot.free_mask("a", date(2025, 1, 1))
+
+    def test_rejects_other_files(self):
+        """Test that a file without the snapshot header is refused."""
+        with open(self.path, "wb") as f:
+            f.write(b"not a snapshot at all, just some bytes")
+        with self.assertRaises(ValueError):
+            CalendarSnapshot(self.path)
+
+    def test_publisher_swaps_generations(self):
+        """Test that new generations are only written on change and readers switch on refresh."""
+        publisher = SnapshotPublisher(SimpleNamespace(list_calendar_owners=lambda: self.owners), self.path, days=7)
+        self.assertTrue(publisher.publish(date(2024, 12, 9)))
+        self.assertFalse(publisher.publish(date(2024, 12, 9)))
+
+        snapshot = CalendarSnapshot(self.path)
+        old_slots = snapshot.find_slots("a", *self.week)
+        self.owners[1].calendar.add_appointment(Appointment("Invitee 2", "2024-12-09", 9, 10))
+        self.assertFalse(snapshot.refresh())
+        self.assertTrue(publisher.publish(date(2024, 12, 9)))
+
+        self.assertTrue(snapshot.refresh())
+        self.assertEqual(snapshot.generation, 2)
+        self.assertEqual(len(snapshot.find_slots("a", *self.week)), len(old_slots) - 1)
+        snapshot.close()
+        self.assertEqual(SnapshotPublisher(publisher.database, self.path).generation, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from datetime import date
+from unittest import mock
+from models.appointment import Appointment
+from models.availability_rule import AvailabilityRule
+from models.calendar_owner import CalendarOwner
+from models.invitee import Invitee
+from services.free_busy import FreeBusyEngine
+from services.owner_search import OwnerSlot, search_across_owners
+
+class TestSearchAcrossOwners(unittest.TestCase):
+
+    def setUp(self):
+        """Setup a Monday-morning owner and a Monday/Tuesday-afternoon owner."""
+        self.morning = CalendarOwner("Morning", AvailabilityRule(9, 11, {"Monday"}), "morning")
+        self.afternoon = CalendarOwner("Afternoon", AvailabilityRule(13, 15, {"Monday", "Tuesday"}), "afternoon")
+        self.afternoon.calendar.add_appointment(Appointment("Invitee 1", "2024-12-09", 13, 14))
+        self.date_range = (date(2024, 12, 9), date(2024, 12, 15))
+
+    def test_merged_chronologically(self):
+        """Test that slots from every owner come back in one chronological stream."""
+        slots = list(search_across_owners([self.afternoon, self.morning], self.date_range))
+        self.assertEqual([(s.calendar_owner.id, s.date.day, s.start_minutes) for s in slots],
+                         [("morning", 9, 540), ("morning", 9, 600), ("afternoon", 9, 840),
+                          ("afternoon", 10, 780), ("afternoon", 10, 840)])
+        self.assertEqual(str(slots[0]), "2024-12-09 Monday Time: 9:00 - 10:00 with Morning")
+
+    def test_lazy(self):
+        """Test that taking the first slot only searches the first dates."""
+        engine = FreeBusyEngine()
+        with mock.patch.object(engine, "day_slots", wraps=engine.day_slots) as day_slots:
+            stream = search_across_owners([self.morning, self.afternoon], self.date_range, engine=engine)
+            self.assertEqual(next(stream), OwnerSlot(self.morning, date(2024, 12, 9), 540, 600))
+            stream.close()
+        self.assertLessEqual(day_slots.call_count, 4)  # The first date of each owner plus one prefetched date each
+
+    def test_converts_time_zones(self):
+        """Test that owners in other zones are shown on the requested clock."""
+        self.morning.timezone = "Europe/London"
+        slots = list(search_across_owners([self.morning], self.date_range, timezone="America/New_York"))
+        self.assertEqual([(s.date.day, s.start_minutes) for s in slots], [(9, 240), (9, 300)])  # 4 and 5 AM EST
+
+class TestInviteeAcrossOwners(unittest.TestCase):
+
+    def test_link_and_book_with_several_owners(self):
+        """Test linking an invitee to a second owner, searching both and booking with either."""
+        first = CalendarOwner("First", AvailabilityRule(9, 10, {"Monday"}), "first")
+        second = CalendarOwner("Second", AvailabilityRule(9, 10, {"Monday"}), "second")
+        invitee = Invitee("Invitee 1", first)
+        invitee.link_owner(second)
+        invitee.link_owner(second)
+        self.assertEqual(invitee.calendar_owners, [first, second])
+        self.assertEqual(second.invitees, [invitee])
+
+        slots = list(invitee.search_across_owners(horizon_days=7))
+        self.assertEqual([s.calendar_owner for s in slots], [first, second])
+
+        self.assertTrue(invitee.book_slot("2024-12-09", "9 AM", "10 AM", "Monday", second).startswith("Successfully"))
+        self.assertEqual((len(first.calendar.appointments), len(second.calendar.appointments)), (0, 1))
+        with self.assertRaises(ValueError):
+            invitee.book_slot("2024-12-09", "9 AM", "10 AM", "Monday", CalendarOwner("Stranger", AvailabilityRule(), "x"))
+
+if __name__ == '__main__':
+    unittest.main()
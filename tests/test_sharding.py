@@ -0,0 +1,71 @@
+import unittest
+from datetime import date
+from models.appointment import Appointment
+from models.availability_rule import AvailabilityRule
+from models.calendar_owner import CalendarOwner
+from services.free_busy import FreeSlot
+from services.sharding import ShardedScheduler, shard_for
+
+class TestShardFor(unittest.TestCase):
+
+    def test_stable_and_in_range(self):
+        """Test that an owner always maps to the same shard within range."""
+        self.assertEqual(shard_for("owner-1", 4), shard_for("owner-1", 4))
+        self.assertEqual({shard_for(f"owner-{n}", 3) for n in range(50)}, {0, 1, 2})
+
+class TestShardedScheduler(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Start two shards and spread owners available 9 - 11 AM on Mondays across both."""
+        cls.scheduler = ShardedScheduler(shards=2)
+        cls.owner_ids = [f"shard-owner-{n}" for n in range(6)]
+        assert {shard_for(owner_id, 2) for owner_id in cls.owner_ids} == {0, 1}
+        for owner_id in cls.owner_ids:
+            owner = CalendarOwner(owner_id, AvailabilityRule(9, 11, {"Monday"}), owner_id)
+            if owner_id == "shard-owner-0":
+                owner.calendar.add_appointment(Appointment("Existing", "2024-12-09", 9, 10))
+            cls.scheduler.add_calendar_owner(owner)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.scheduler.close()
+
+    def test_search_book_and_list(self):
+        """Test that calls reach the owner's shard and keep its state."""
+        self.assertEqual(self.scheduler.search_slots("shard-owner-0", date(2024, 12, 9), days=1),
+                         [FreeSlot(date(2024, 12, 9), 600, 660)])
+        result = self.scheduler.book("shard-owner-1", "Alice", "2024-12-09", "9 AM", "10 AM")
+        self.assertTrue(result["booked"])
+        self.assertFalse(self.scheduler.book("shard-owner-1", "Bob", "2024-12-09", "9 AM", "10 AM")["booked"])
+        self.assertEqual(self.scheduler.list_appointments("shard-owner-1"), [("Alice", "2024-12-09", 540, 600)])
+        self.assertEqual(self.scheduler.list_appointments("shard-owner-0"), [("Existing", "2024-12-09", 540, 600)])
+        with self.assertRaises(LookupError):
+            self.scheduler.search_slots("missing", date(2024, 12, 9))
+
+    def test_archived_appointments_reach_the_shard(self):
+        """Test that an owner's archived months still block slots once copied to its shard."""
+        owner = CalendarOwner("archived-owner", AvailabilityRule(9, 11, {"Monday"}), "archived-owner")
+        owner.calendar.add_appointment(Appointment("Existing", "2020-01-06", 9, 10))
+        owner.calendar.compact(today=date(2020, 3, 1))
+        self.scheduler.add_calendar_owner(owner)
+        self.assertEqual(self.scheduler.search_slots("archived-owner", date(2020, 1, 6), days=1),
+                         [FreeSlot(date(2020, 1, 6), 600, 660)])
+
+    def test_batches_keep_request_order(self):
+        """Test that batched calls scattered across shards come back in request order."""
+        results = self.scheduler.book_many([(owner_id, "Carol", "2024-12-16", "10 AM", "11 AM")
+                                            for owner_id in self.owner_ids[2:]] + [("missing", "Carol", "2024-12-16",
+                                                                                    "10 AM", "11 AM")])
+        self.assertEqual([r["booked"] for r in results], [True] * 4 + [False])
+        searches = self.scheduler.search_many([(owner_id, date(2024, 12, 16), 1, 60) for owner_id in self.owner_ids[2:]])
+        self.assertEqual(searches, [[FreeSlot(date(2024, 12, 16), 540, 600)]] * 4)
+
+    def test_group_search_across_shards(self):
+        """Test that a group search gathers free masks from every shard."""
+        slots = self.scheduler.find_common_slots(self.owner_ids[2:], (date(2024, 12, 23), date(2024, 12, 29)))
+        self.assertEqual([(s.date, s.start_minutes) for s in slots], [(date(2024, 12, 23), 540), (date(2024, 12, 23), 600)])
+        self.assertEqual(slots[0].owner_ids, tuple(self.owner_ids[2:]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import os
+import tempfile
+import threading
+import unittest
+from datetime import date
+from database.sqlite_database import SQLiteDatabase
+from models.appointment import Appointment
+from models.availability_rule import AvailabilityRule
+from models.calendar import RetentionPolicy
+from models.calendar_owner import CalendarOwner
+from models.invitee import Invitee
+
+class TestSQLiteDatabase(unittest.TestCase):
+
+    def setUp(self):
+        """Setup a database file with one owner available 9 AM - 5 PM on Mondays."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.db = SQLiteDatabase(os.path.join(self.directory.name, "scheduler.db"))
+        owner = CalendarOwner("Owner 1", AvailabilityRule(9, 17, {"Monday"}), "1")
+        owner.add_invitee(Invitee("Invitee 1", owner))
+        owner.calendar.add_appointment(Appointment("Invitee 1", "2024-12-09", 9, 10))
+        self.db.add_calendar_owner(owner.id, owner)
+
+    def tearDown(self):
+        self.db.close()
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        """Test that owners are stored and loaded with rules, invitees and appointments."""
+        owner = self.db.get_calendar_owner("1")
+        self.assertEqual(owner.name, "Owner 1")
+        self.assertEqual(owner.get_availability(), {"start_hour": 9, "end_hour": 17, "days_of_week": {"Monday"}})
+        self.assertEqual(owner.list_invitees(), ["Invitee 1"])
+        self.assertEqual([str(a) for a in owner.calendar.appointments],
+                         ["Date: 2024-12-09, Time: 9:00 - 10:00, Invitee: Invitee 1"])
+        self.assertIsNone(self.db.get_calendar_owner("missing"))
+        self.assertEqual([o.id for o in self.db.list_calendar_owners()], ["1"])
+
+    def test_write_through(self):
+        """Test that bookings and rule updates on a loaded owner are saved."""
+        owner = self.db.get_calendar_owner("1")
+        Invitee("Invitee 2", owner).book_slot("2024-12-09", "10 AM", "10:30 AM", "Monday")
+        owner.setup_availability("8 AM", "6 PM", {"Monday", "Friday"})
+
+        reloaded = self.db.get_calendar_owner("1")
+        self.assertEqual(len(reloaded.calendar.appointments), 2)
+        self.assertEqual(reloaded.availability_rule.start_hour, 8)
+
+    def test_invitees_round_trip(self):
+        """Test that invitees added later are saved and that invitee IDs survive reloads."""
+        stored_id = self.db.get_calendar_owner("1").invitees[0].id
+        self.assertEqual(self.db.get_calendar_owner("1").invitees[0].id, stored_id)
+
+        owner = self.db.get_calendar_owner("1")
+        owner.add_invitee(Invitee("Invitee 2", owner, invitee_id="invitee-2"))
+        reloaded = self.db.get_calendar_owner("1")
+        self.assertEqual(sorted((i.name, i.id) for i in reloaded.invitees),
+                         [("Invitee 1", stored_id), ("Invitee 2", "invitee-2")])
+
+    def test_write_through_cancel_and_reschedule(self):
+        """Test that cancellations and moves on a loaded owner are saved."""
+        owner = self.db.get_calendar_owner("1")
+        Invitee("Invitee 2", owner).book_slot("2024-12-09", "10 AM", "11 AM", "Monday")
+        first, second = owner.calendar.appointments
+        owner.calendar.cancel(first.id)
+        owner.calendar.reschedule(second.id, ("2024-12-09", 690, 750))
+
+        self.assertEqual([str(a) for a in self.db.get_calendar_owner("1").calendar.appointments],
+                         ["Date: 2024-12-09, Time: 11:30 - 12:30, Invitee: Invitee 2"])
+
+    def test_loaded_copies_cannot_double_book(self):
+        """Test that two loaded copies of one owner cannot both book a slot, nor move into a taken one."""
+        first, second = self.db.get_calendar_owner("1"), self.db.get_calendar_owner("1")
+        self.assertTrue(first.calendar.try_book(Appointment("Invitee 2", "2030-01-07", 10, 11)))
+        self.assertFalse(second.calendar.try_book(Appointment("Invitee 3", "2030-01-07", 10, 11)))
+        self.assertEqual(len(second.calendar.appointments), 1)  # Refused in memory too
+        self.assertTrue(second.calendar.try_book(Appointment("Invitee 3", "2030-01-07", 11, 12)))
+        self.assertFalse(first.calendar.reschedule(first.calendar.appointments[1].id, ("2030-01-07", 660, 720)))
+        self.assertTrue(first.calendar.reschedule(first.calendar.appointments[1].id, ("2030-01-07", 600, 630)))
+        self.assertEqual(len(self.db.list_appointments("1", "2030-01-07", "2030-01-07")), 2)
+        self.assertEqual(self.db.list_appointments("1", "2030-01-07", "2030-01-07")[0].end_minutes, 630)
+
+    def test_readding_owner_writes_once(self):
+        """Test that adding an owner again keeps a single write-through subscription."""
+        owner = self.db.get_calendar_owner("1")
+        self.db.add_calendar_owner("1", owner)
+        self.db.add_calendar_owner("1", owner)
+        Invitee("Invitee 2", owner).book_slot("2024-12-09", "10 AM", "11 AM", "Monday")
+        self.assertEqual(len(self.db.list_appointments("1")), 2)
+
+    def test_retention_drops_are_deleted(self):
+        """Test that months deleted by a retention policy are deleted from SQLite, archived ones kept."""
+        owner = self.db.get_calendar_owner("1")
+        owner.calendar.try_book(Appointment("Invitee 1", "2024-11-04", 9, 10))
+        owner.calendar.retention_policy = RetentionPolicy(hot_months=0, retention_months=1)
+        self.assertEqual(owner.calendar.compact(today=date(2025, 1, 15)), (2, 1))  # November is past retention
+
+        self.assertEqual([a.date for a in self.db.list_appointments("1")], ["2024-12-09"])
+
+    def test_try_book_and_overlaps(self):
+        """Test indexed conflict detection."""
+        self.assertTrue(self.db.overlaps("1", "2024-12-09", 9 * 60 + 30, 10 * 60 + 30))
+        self.assertFalse(self.db.overlaps("1", "2024-12-09", 10 * 60, 11 * 60))
+        self.assertFalse(self.db.try_book("1", Appointment("Invitee 2", "2024-12-09", 9, 10, 45, 15)))
+        self.assertTrue(self.db.try_book("1", Appointment("Invitee 2", "2024-12-09", 10, 11)))
+
+    def test_find_slots(self):
+        """Test slot search computed from the appointments in range only."""
+        slots = self.db.find_slots("1", date(2024, 12, 9), date(2024, 12, 15))
+        self.assertEqual([s.start_minutes // 60 for s in slots], [10, 11, 12, 13, 14, 15, 16])
+
+    def test_concurrent_try_book(self):
+        """Test that threads with their own pooled connections never double-book."""
+        results = []
+
+        def book():
+            results.append(self.db.try_book("1", Appointment("Invitee 3", "2024-12-09", 12, 13)))
+
+        threads = [threading.Thread(target=book) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results.count(True), 1)
+
+    def test_bulk_insert(self):
+        """Test batched inserts."""
+        appointments = [Appointment("Invitee 1", f"2025-01-{day:02d}", 9, 10) for day in range(1, 32)]
+        self.db.bulk_insert_appointments("1", appointments, batch_size=10)
+        self.assertEqual(len(self.db.list_appointments("1", "2025-01-01", "2025-01-31")), 31)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import random
+import unittest
+from utils.timer_wheel import TimerWheel
+
+class TestTimerWheel(unittest.TestCase):
+
+    def test_expires_on_the_deadline_tick(self):
+        """Test that keys expire once their deadline tick passes, never before."""
+        wheel = TimerWheel(tick=1.0, slots=4, levels=2, now=0)
+        wheel.add("a", 2.5)
+        wheel.add("b", 10)
+        self.assertEqual(wheel.advance(2.9), [])
+        self.assertEqual(wheel.advance(3.0), ["a"])
+        self.assertFalse(wheel.due(3.5))
+        self.assertEqual(wheel.advance(9.9), [])
+        self.assertEqual(wheel.advance(10), ["b"])
+        self.assertEqual(len(wheel), 0)
+
+    def test_cancel_and_reschedule(self):
+        """Test that cancelled keys never fire and re-adding a key moves it."""
+        wheel = TimerWheel(tick=1.0, slots=4, levels=2)
+        wheel.add("a", 5)
+        wheel.add("b", 5)
+        self.assertTrue(wheel.cancel("a"))
+        self.assertFalse(wheel.cancel("a"))
+        wheel.add("b", 7)
+        self.assertEqual(wheel.advance(6), [])
+        self.assertEqual(wheel.advance(7), ["b"])
+
+    def test_cascades_and_overflow(self):
+        """Test random deadlines across every level and beyond the top one, advanced in random steps."""
+        rng = random.Random(7)
+        wheel = TimerWheel(tick=1.0, slots=4, levels=3, now=13)
+        deadlines = {key: 13 + rng.uniform(0.5, 300) for key in range(200)}
+        for key, deadline in deadlines.items():
+            wheel.add(key, deadline)
+        now, fired = 13, {}
+        while now < 320:
+            now += rng.uniform(0, 20)
+            for key in wheel.advance(now):
+                fired[key] = now
+        self.assertEqual(set(fired), set(deadlines))
+        self.assertTrue(all(deadlines[key] <= now for key, now in fired.items()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from datetime import date
+from utils.timezones import (convert, from_utc_masks, get_zone, local_to_utc, to_utc_masks, utc_day_offsets,
+                             utc_to_local)
+from utils.utils import slot_range_mask
+
+class TestTimezones(unittest.TestCase):
+
+    def test_day_offsets(self):
+        """Test offset tables on plain days and on a DST transition day."""
+        self.assertEqual(utc_day_offsets("Asia/Kolkata", date(2026, 3, 8).toordinal()), ((0, 1440, 330),))
+        # New York springs forward at 2 AM EST, 7:00 UTC
+        self.assertEqual(utc_day_offsets("America/New_York", date(2026, 3, 8).toordinal()),
+                         ((0, 420, -300), (420, 1440, -240)))
+
+    def test_unknown_zone(self):
+        """Test that unknown zones are rejected with a ValueError."""
+        with self.assertRaises(ValueError):
+            get_zone("Mars/Olympus_Mons")
+
+    def test_convert(self):
+        """Test converting wall-clock times between zones."""
+        june_first = date(2026, 6, 1).toordinal()
+        self.assertEqual(convert("America/New_York", "Europe/Berlin", june_first, 9 * 60), (june_first, 15 * 60))
+        self.assertEqual(convert("America/Los_Angeles", "Asia/Tokyo", june_first, 17 * 60), (june_first + 1, 9 * 60))
+        self.assertEqual(utc_to_local("Asia/Kolkata", june_first, 20 * 60), (june_first + 1, 90))
+        self.assertEqual(local_to_utc("Asia/Kolkata", june_first + 1, 90), (june_first, 20 * 60))
+
+    def test_mask_round_trip(self):
+        """Test re-slicing day masks through UTC, including across a DST change."""
+        monday = date(2026, 3, 2)
+        masks = [slot_range_mask(9 * 60, 17 * 60)] * 14  # Two weeks, New York switches to EDT on the 8th
+        first_utc, utc_masks = to_utc_masks(masks, monday, "America/New_York")
+        self.assertEqual(first_utc, date(2026, 3, 1))
+        self.assertEqual(utc_masks[1], slot_range_mask(14 * 60, 22 * 60))  # EST, UTC-5
+        self.assertEqual(utc_masks[8], slot_range_mask(13 * 60, 21 * 60))  # EDT, UTC-4
+        self.assertEqual(from_utc_masks(utc_masks, first_utc, "America/New_York", monday, 14), masks)
+        berlin = from_utc_masks(utc_masks, first_utc, "Europe/Berlin", monday, 14)
+        self.assertEqual(berlin[0], slot_range_mask(15 * 60, 23 * 60))
+        self.assertEqual(berlin[7], slot_range_mask(14 * 60, 22 * 60))
+
+if __name__ == '__main__':
+    unittest.main()
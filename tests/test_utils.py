@@ -1,5 +1,6 @@
+import gc
 import pytest
-from utils.utils import convert_to_24_hour
+from utils.utils import convert_to_24_hour, convert_to_minutes, format_minutes, gc_paused
 
 
 def test_convert_to_24_hour_12_hour_format_am():
@@ -44,3 +45,63 @@ def test_convert_to_24_hour_edge_cases():
     """Test edge cases like noon and midnight."""
     assert convert_to_24_hour("12 AM") == 0  # Midnight should be 0
     assert convert_to_24_hour("12 PM") == 12  # Noon should be 12
+
+
+def test_convert_to_minutes():
+    """Test converting hour and minute times to minutes since midnight."""
+    assert convert_to_minutes("9 AM") == 540
+    assert convert_to_minutes("9:30 PM") == 21 * 60 + 30
+    assert convert_to_minutes("12:15 AM") == 15
+    assert convert_to_minutes("14") == 840
+    assert convert_to_minutes("14:45") == 885
+
+
+def test_convert_to_minutes_invalid_format():
+    """Test invalid times are rejected."""
+    for time_str in ("13 PM", "9:60", "25", "AB CD", "9:5"):
+        with pytest.raises(ValueError):
+            convert_to_minutes(time_str)
+
+
+def test_format_minutes():
+    """Test formatting minutes since midnight."""
+    assert format_minutes(540) == "9:00"
+    assert format_minutes(1305) == "21:45"
+
+
+def test_convert_to_minutes_whitespace_and_case():
+    """Test that spacing and AM/PM case do not matter."""
+    assert convert_to_minutes("9AM") == 540
+    assert convert_to_minutes(" 9:30 pm ") == 21 * 60 + 30
+    assert convert_to_minutes("24:00") == 24 * 60  # End of day
+
+
+def test_convert_to_minutes_is_cached():
+    """Test that repeated times are served from the LRU cache."""
+    convert_to_minutes.cache_clear()
+    convert_to_minutes("10:45 AM")
+    convert_to_minutes("10:45 AM")
+    assert convert_to_minutes.cache_info().hits == 1
+
+
+def test_convert_to_24_hour_rejects_end_of_day():
+    """Test that 24 is not an hour of the day."""
+    with pytest.raises(ValueError):
+        convert_to_24_hour("24")
+
+
+def test_gc_paused_overlapping_pauses():
+    """Test that the collector stays off until the last overlapping pause ends."""
+    was_enabled = gc.isenabled()
+    gc.enable()
+    try:
+        first, second = gc_paused(), gc_paused()
+        first.__enter__()
+        second.__enter__()
+        first.__exit__(None, None, None)  # Another batch is still running
+        assert not gc.isenabled()
+        second.__exit__(None, None, None)
+        assert gc.isenabled()
+    finally:
+        if not was_enabled:
+            gc.disable()
@@ -0,0 +1,139 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import date
+from database.wal_database import WriteAheadLogDatabase
+from models.appointment import Appointment
+from models.availability_rule import AvailabilityRule
+from models.calendar import RetentionPolicy
+from models.calendar_owner import CalendarOwner
+from models.invitee import Invitee
+
+class TestWriteAheadLogDatabase(unittest.TestCase):
+
+    def setUp(self):
+        """Setup a store in a temporary directory with one owner."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.db = WriteAheadLogDatabase(self.directory.name, sync_policy="always")
+        self.owner = CalendarOwner("Owner 1", AvailabilityRule(9, 17, {"Monday"}), "1")
+        self.db.add_calendar_owner(self.owner.id, self.owner)
+
+    def tearDown(self):
+        self.db.close()
+        self.directory.cleanup()
+
+    def reopen(self, **options):
+        self.db.close()
+        self.db = WriteAheadLogDatabase(self.directory.name, **options)
+        return self.db.get_calendar_owner("1")
+
+    def test_replay_after_restart(self):
+        """Test that bookings and rule changes survive a restart."""
+        Invitee("Invitee 1", self.owner).book_slot("2024-12-09", "10 AM", "10:30 AM", "Monday")
+        self.owner.setup_availability("8 AM", "6 PM", {"Monday", "Friday"})
+
+        owner = self.reopen()
+        self.assertEqual(owner.name, "Owner 1")
+        self.assertEqual(owner.get_availability(), {"start_hour": 8, "end_hour": 18, "days_of_week": {"Monday", "Friday"}})
+        self.assertEqual([str(a) for a in owner.calendar.appointments],
+                         ["Date: 2024-12-09, Time: 10:00 - 10:30, Invitee: Invitee 1"])
+
+        # The recovered owner keeps logging
+        Invitee("Invitee 2", owner).book_slot("2024-12-09", "11 AM", "12 PM", "Monday")
+        self.assertEqual(len(self.reopen().calendar.appointments), 2)
+
+    def test_cancel_and_reschedule_survive_restart(self):
+        """Test that cancellations and moves are logged and replayed."""
+        invitee = Invitee("Invitee 1", self.owner)
+        invitee.book_slot("2024-12-09", "9 AM", "10 AM", "Monday")
+        invitee.book_slot("2024-12-09", "10 AM", "11 AM", "Monday")
+        first, second = self.owner.calendar.appointments
+        self.owner.calendar.cancel(first.id)
+        self.owner.calendar.reschedule(second.id, ("2024-12-09", 630, 690))  # Overlaps its old slot
+
+        owner = self.reopen()
+        self.assertEqual([str(a) for a in owner.calendar.appointments],
+                         ["Date: 2024-12-09, Time: 10:30 - 11:30, Invitee: Invitee 1"])
+
+    def test_retention_drops_survive_restart(self):
+        """Test that months deleted by a retention policy stay deleted after a restart."""
+        for day in ("2020-01-06", "2020-02-03", "2020-03-02"):
+            self.owner.calendar.try_book(Appointment("Invitee 1", day, 9, 10))
+        self.owner.calendar.retention_policy = RetentionPolicy(hot_months=0, retention_months=1)
+        self.assertEqual(self.owner.calendar.compact(today=date(2020, 3, 10)), (2, 1))
+
+        owner = self.reopen()
+        self.assertEqual([a.date for a in owner.calendar.appointments], ["2020-02-03", "2020-03-02"])
+
+    def test_rule_windows_and_overrides_survive_restart(self):
+        """Test that multi-window rules and date overrides are logged."""
+        self.owner.availability_rule.set_windows({"Monday"}, [("9 AM", "12 PM"), ("1 PM", "5 PM")])
+        self.owner.availability_rule.set_override("2024-12-16", [])
+
+        rule = self.reopen().availability_rule
+        self.assertEqual(rule.to_dict(), self.owner.availability_rule.to_dict())
+        self.assertFalse(rule.is_available("Monday", 600, 660, "2024-12-16"))
+
+    def test_snapshot_compacts_log(self):
+        """Test that automatic snapshots truncate the log and recovery combines both."""
+        self.db.close()
+        self.db = WriteAheadLogDatabase(self.directory.name, sync_policy="batch", snapshot_every=5)
+        owner = self.db.get_calendar_owner("1")
+        for hour in range(9, 16):
+            Invitee("Invitee 1", owner).book_slot("2024-12-09", str(hour), str(hour + 1), "Monday")
+
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, WriteAheadLogDatabase.SNAPSHOT_FILE)))
+        with open(os.path.join(self.directory.name, WriteAheadLogDatabase.LOG_FILE)) as f:
+            self.assertLess(len(f.readlines()), 5)
+        self.assertEqual(len(self.reopen().calendar.appointments), 7)
+
+    def test_torn_tail_is_ignored(self):
+        """Test that a partially written final record does not break recovery."""
+        Invitee("Invitee 1", self.owner).book_slot("2024-12-09", "10 AM", "11 AM", "Monday")
+        self.db.close()
+        with open(os.path.join(self.directory.name, WriteAheadLogDatabase.LOG_FILE), "a") as f:
+            f.write('{"op":"book","id":"1","appoi')
+        self.db = WriteAheadLogDatabase(self.directory.name)
+        self.assertEqual(len(self.db.get_calendar_owner("1").calendar.appointments), 1)
+
+    def test_batch_syncs_tail_when_idle(self):
+        """Test that the last records are fsynced within sync_interval even if no more records arrive."""
+        self.db.close()
+        self.db = WriteAheadLogDatabase(self.directory.name, sync_policy="batch", sync_interval=0.05)
+        owner = self.db.get_calendar_owner("1")
+        Invitee("Invitee 1", owner).book_slot("2024-12-09", "10 AM", "11 AM", "Monday")
+        Invitee("Invitee 1", owner).book_slot("2024-12-09", "11 AM", "12 PM", "Monday")
+        self.assertGreater(self.db._unsynced, 0)
+        deadline = time.monotonic() + 2
+        while self.db._unsynced and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.db._unsynced, 0)
+
+    def test_readding_owner_logs_once(self):
+        """Test that adding the same owner again does not log its bookings twice."""
+        self.db.add_calendar_owner(self.owner.id, self.owner)
+        Invitee("Invitee 1", self.owner).book_slot("2024-12-09", "10 AM", "11 AM", "Monday")
+        with open(os.path.join(self.directory.name, WriteAheadLogDatabase.LOG_FILE)) as f:
+            self.assertEqual(sum('"op":"book"' in line for line in f), 1)
+
+    def test_bookings_after_torn_tail_survive(self):
+        """Test that records appended after recovering from a torn tail are replayed on later restarts."""
+        Invitee("Invitee 1", self.owner).book_slot("2024-12-09", "9 AM", "10 AM", "Monday")
+        self.db.close()
+        with open(os.path.join(self.directory.name, WriteAheadLogDatabase.LOG_FILE), "a") as f:
+            f.write('{"op":"book","id":"1","appoi')
+        owner = self.reopen(sync_policy="always")
+        Invitee("Invitee 1", owner).book_slot("2024-12-09", "10 AM", "11 AM", "Monday")
+        Invitee("Invitee 1", owner).book_slot("2024-12-09", "11 AM", "12 PM", "Monday")
+
+        self.reopen(sync_policy="always")
+        self.assertEqual([a.start_hour for a in self.reopen().calendar.appointments], [9, 10, 11])
+
+    def test_invalid_sync_policy(self):
+        """Test that unknown sync policies are rejected."""
+        with self.assertRaises(ValueError):
+            WriteAheadLogDatabase(self.directory.name, sync_policy="sometimes")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Logging for scheduler events such as bookings, rule updates and new invitees.
+
+Every module logs to a child of the "scheduler" logger, which has only a NullHandler, so library
+use is silent until an application calls configure_logging or attaches its own handlers. Records
+carry the event name in the "event" attribute (e.g. "appointment_added") for structured handlers.
+"""
+import logging
+import logging.handlers
+import queue
+import sys
+
+LOGGER_NAME = "scheduler"  # Parent of every logger in the package
+
+logging.getLogger(LOGGER_NAME).addHandler(logging.NullHandler())
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Return the package logger for a module, e.g. get_logger("calendar") -> "scheduler.calendar"."""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+def configure_logging(level: int = logging.INFO, handler: logging.Handler = None,
+                      fmt: str = "%(message)s") -> logging.Handler:
+    """
+    Print scheduler events, e.g. for the command line demo.
+
+    Args:
+        level (int): The lowest level to emit, default is logging.INFO.
+        handler (logging.Handler): Where records go, a stdout StreamHandler by default.
+        fmt (str): Format for the handler, default is the bare message.
+
+    Returns:
+        logging.Handler: The attached handler, to pass to logging.getLogger(LOGGER_NAME).removeHandler later.
+    """
+    handler = handler or logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter(fmt))
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level)
+    logger.addHandler(handler)
+    return handler
+
+
+def start_queue_logging(*handlers: logging.Handler, level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """
+    Emit scheduler events from a background thread.
+
+    The calling thread only appends each record to an unbounded queue, which never blocks, so slow
+    handlers such as files or sockets stay off the booking path. The listener thread hands the
+    records to the given handlers.
+
+    Args:
+        *handlers (logging.Handler): Handlers the listener writes to, a stdout StreamHandler if none.
+        level (int): The lowest level to emit, default is logging.INFO.
+
+    Returns:
+        logging.handlers.QueueListener: The running listener. Call stop_queue_logging(listener) to flush it.
+    """
+    records = queue.SimpleQueue()
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level)
+    queue_handler = logging.handlers.QueueHandler(records)
+    logger.addHandler(queue_handler)
+    listener = logging.handlers.QueueListener(records, *(handlers or (logging.StreamHandler(sys.stdout),)),
+                                              respect_handler_level=True)
+    listener.queue_handler = queue_handler  # Remembered so stop_queue_logging can detach it
+    listener.start()
+    return listener
+
+
+def stop_queue_logging(listener: logging.handlers.QueueListener):
+    """Detach the queue handler and wait until the listener has emitted every queued record."""
+    logging.getLogger(LOGGER_NAME).removeHandler(listener.queue_handler)
+    listener.stop()
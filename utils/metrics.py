@@ -0,0 +1,220 @@
+"""
+Counters, gauges and latency histograms for the scheduler's hot paths.
+
+Collection is off by default. While disabled, a timed function costs one extra call and a flag
+check, and count/set_gauge return immediately. Call enable_metrics() to start collecting, then read
+metrics() for a snapshot or write_prometheus(path) for the Prometheus text exposition format.
+
+Series are identified by a name plus optional labels, e.g. count("bookings_total", outcome="conflict").
+"""
+from bisect import bisect_left
+import functools
+import os
+import threading
+import time
+
+PREFIX = "scheduler_"  # Prepended to every series name in the Prometheus dump
+LATENCY_BUCKETS = tuple(1e-6 * 2 ** i for i in range(24))  # Histogram upper bounds in seconds, 1 us to ~8 s
+
+_enabled = False
+_lock = threading.Lock()  # Guards every series below
+_counters = {}  # Maps (name, labels) to a count
+_gauges = {}  # Maps (name, labels) to the last value set
+_histograms = {}  # Maps (name, labels) to [bucket counts (one more than LATENCY_BUCKETS), count, sum]
+
+
+def enable_metrics():
+    """Start collecting metrics."""
+    global _enabled
+    _enabled = True
+
+
+def disable_metrics():
+    """Stop collecting metrics. Collected values are kept until reset_metrics."""
+    global _enabled
+    _enabled = False
+
+
+def metrics_enabled() -> bool:
+    """Return True while metrics are being collected."""
+    return _enabled
+
+
+def reset_metrics():
+    """Drop every collected value."""
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+        _histograms.clear()
+
+
+def count(name: str, amount: int = 1, **labels):
+    """Add amount to a counter, if metrics are enabled."""
+    if not _enabled:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def set_gauge(name: str, value, **labels):
+    """Set a gauge to value, if metrics are enabled."""
+    if not _enabled:
+        return
+    with _lock:
+        _gauges[(name, tuple(sorted(labels.items())))] = value
+
+
+def observe(name: str, seconds: float, **labels):
+    """Record one latency sample in a histogram, if metrics are enabled."""
+    if not _enabled:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    bucket = bisect_left(LATENCY_BUCKETS, seconds)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = [[0] * (len(LATENCY_BUCKETS) + 1), 0, 0.0]
+        histogram[0][bucket] += 1
+        histogram[1] += 1
+        histogram[2] += seconds
+
+
+def timed(name: str):
+    """
+    Decorate a function to count its calls and record their latency in the histogram called name.
+
+    Calls that raise are recorded too, and also counted in the "<name>_errors_total" counter.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                count(f"{name}_errors_total")
+                raise
+            finally:
+                observe(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def metrics() -> dict:
+    """
+    Take a snapshot of every collected value.
+
+    Returns:
+        dict: {"counters", "gauges", "histograms", "rates"}. Counters and gauges map a series name to
+            its value when it has no labels, else to a dict from the label values to the value.
+            Histograms map a name to {"count", "sum", "p50", "p99"}, in seconds; the percentiles are
+            the upper bound of the bucket they fall in. Rates give each outcome's share of every counter
+            with an "outcome" label, e.g. rates["bookings_total"]["conflict"].
+    """
+    with _lock:
+        counters = dict(_counters)
+        gauges = dict(_gauges)
+        histograms = {key: (list(buckets), total, seconds) for key, (buckets, total, seconds) in _histograms.items()}
+
+    snapshot = {"counters": _group(counters), "gauges": _group(gauges), "histograms": {}, "rates": {}}
+    for (name, labels), (buckets, total, seconds) in histograms.items():
+        summary = {"count": total, "sum": seconds, "p50": _percentile(buckets, total, 0.5),
+                   "p99": _percentile(buckets, total, 0.99)}
+        _insert(snapshot["histograms"], name, labels, summary)
+
+    outcomes = {}
+    for (name, labels), value in counters.items():
+        outcome = dict(labels).get("outcome")
+        if outcome is not None:
+            by_outcome = outcomes.setdefault(name, {})
+            by_outcome[outcome] = by_outcome.get(outcome, 0) + value
+    for name, by_outcome in outcomes.items():
+        total = sum(by_outcome.values())
+        snapshot["rates"][name] = {outcome: value / total for outcome, value in by_outcome.items()}
+    return snapshot
+
+
+def prometheus_text() -> str:
+    """Render every collected value in the Prometheus text exposition format."""
+    with _lock:
+        counters = sorted(_counters.items())
+        gauges = sorted(_gauges.items())
+        histograms = sorted((key, (list(buckets), total, seconds)) for key, (buckets, total, seconds) in _histograms.items())
+
+    lines = []
+    typed = set()
+    for kind, series in (("counter", counters), ("gauge", gauges)):
+        for (name, labels), value in series:
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+            lines.append(f"{PREFIX}{name}{_labels(labels)} {value}")
+    for (name, labels), (buckets, total, seconds) in histograms:
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {PREFIX}{name}_seconds histogram")
+        cumulative = 0
+        for bound, hits in zip(LATENCY_BUCKETS + (float("inf"),), buckets):
+            cumulative += hits
+            le = "+Inf" if bound == float("inf") else f"{bound:g}"
+            lines.append(f"{PREFIX}{name}_seconds_bucket{_labels(labels + (('le', le),))} {cumulative}")
+        lines.append(f"{PREFIX}{name}_seconds_count{_labels(labels)} {total}")
+        lines.append(f"{PREFIX}{name}_seconds_sum{_labels(labels)} {seconds}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str):
+    """
+    Write prometheus_text() to a file, e.g. for the node exporter's textfile collector.
+
+    The file is written next to its destination and renamed over it, so readers never see a partial dump.
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(temp_path, path)
+
+
+def _group(series: dict) -> dict:
+    """Nest {(name, labels): value} as {name: value} or {name: {label values: value}}."""
+    grouped = {}
+    for (name, labels), value in series.items():
+        _insert(grouped, name, labels, value)
+    return grouped
+
+
+def _insert(grouped: dict, name: str, labels: tuple, value):
+    """Store value under name, keyed by the label values if there are any."""
+    if not labels:
+        grouped[name] = value
+        return
+    key = labels[0][1] if len(labels) == 1 else tuple(label_value for _, label_value in labels)
+    grouped.setdefault(name, {})[key] = value
+
+
+def _percentile(buckets: list, total: int, quantile: float) -> float:
+    """Return the upper bound of the bucket holding the given quantile, or None without samples."""
+    if not total:
+        return None
+    rank = quantile * total
+    cumulative = 0
+    for bound, hits in zip(LATENCY_BUCKETS + (float("inf"),), buckets):
+        cumulative += hits
+        if cumulative >= rank:
+            return bound
+    return float("inf")
+
+
+def _labels(labels: tuple) -> str:
+    """Render labels as {key="value",...}, or nothing if there are none."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _escape(value) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,159 @@
+import math
+
+
+class TimerWheel:
+    """
+    A hierarchical timing wheel: deadlines for many keys, expired in O(1) amortized time each.
+
+    Time is counted in ticks of `tick` seconds. Level 0 has one bucket per tick for the next
+    `slots` ticks, level 1 one bucket per `slots` ticks for the next `slots ** 2`, and so on.
+    A timer sits in the lowest level whose range covers it and moves down a level each time the
+    level below wraps around, so it is touched at most `levels` times before it fires. Deadlines
+    beyond the top level wait in an overflow bucket that is re-placed once per top-level lap.
+
+    Nothing runs in the background: advance(now) walks the ticks since the last call and returns
+    what expired. Ticks are skipped in bulk while the lower levels are empty, so an idle wheel
+    catches up in a few steps.
+
+    Attributes:
+        tick (float): Seconds per tick. Deadlines fire up to one tick late, never early.
+        slots (int): Buckets per level, a power of two.
+        levels (int): Number of levels.
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 64, levels: int = 4, now: float = 0.0):
+        """
+        Initialize an empty wheel.
+
+        Args:
+            tick (float): Seconds per tick, default is 1.0.
+            slots (int): Buckets per level, a power of two. Default is 64.
+            levels (int): Number of levels, default is 4 (64 ** 4 ticks, about 190 days at 1 s).
+            now (float): The current time in seconds.
+
+        Raises:
+            ValueError: If slots is not a power of two or tick is not positive.
+        """
+        if slots < 2 or slots & (slots - 1) or tick <= 0:
+            raise ValueError("slots must be a power of two and tick positive.")
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._wheels = [[{} for _ in range(slots)] for _ in range(levels)]  # Buckets map a key to its deadline tick
+        self._counts = [0] * levels  # Timers per level, to skip empty stretches
+        self._overflow = {}  # Timers beyond the top level, key -> deadline tick
+        self._where = {}  # Maps a key to (bucket dict holding it, its level or None for the overflow)
+        self._current = math.floor(now / tick)  # Last tick processed
+
+    def __len__(self):
+        return len(self._where)
+
+    def __contains__(self, key):
+        return key in self._where
+
+    def add(self, key, deadline: float):
+        """
+        Schedule a key to expire at a deadline, replacing any earlier schedule of it.
+
+        Args:
+            key: Any hashable key.
+            deadline (float): Time in seconds, on the clock passed to advance.
+        """
+        self.cancel(key)
+        self._place(key, max(math.ceil(deadline / self.tick), self._current + 1))
+
+    def cancel(self, key) -> bool:
+        """
+        Unschedule a key.
+
+        Returns:
+            bool: True if it was scheduled.
+        """
+        location = self._where.pop(key, None)
+        if location is None:
+            return False
+        bucket, level = location
+        del bucket[key]
+        if level is not None:
+            self._counts[level] -= 1
+        return True
+
+    def due(self, now: float) -> bool:
+        """Return True if a tick has passed since the last advance, so advance(now) may expire keys."""
+        return bool(self._where) and math.floor(now / self.tick) > self._current
+
+    def advance(self, now: float):
+        """
+        Process every tick up to now.
+
+        Args:
+            now (float): The current time in seconds.
+
+        Returns:
+            list: The keys whose deadline passed, in deadline order.
+        """
+        target = math.floor(now / self.tick)
+        expired = []
+        while self._current < target:
+            if not self._where:
+                self._current = target  # Nothing scheduled: jump straight there
+                break
+            if not self._counts[0]:
+                # Nothing happens before the lowest non-empty level cascades, at a multiple of its span
+                level = 1
+                while level < self.levels and not self._counts[level]:
+                    level += 1
+                span = 1 << (self._bits * level)
+                boundary = (self._current // span + 1) * span
+                if boundary > target:
+                    self._current = target
+                    break
+                self._current = boundary - 1
+            self._current += 1
+            self._cascade(self._current)
+            bucket = self._wheels[0][self._current & self._mask]
+            if bucket:
+                expired.extend(bucket)
+                for key in bucket:
+                    del self._where[key]
+                self._counts[0] -= len(bucket)
+                bucket.clear()
+        return expired
+
+    def _cascade(self, current: int):
+        """Move the timers of the higher-level buckets that come due at this tick down a level."""
+        if current & self._mask:
+            return
+        if current % (1 << (self._bits * self.levels)) == 0 and self._overflow:
+            pending, self._overflow = self._overflow, {}
+            self._replace(pending)
+        for level in range(self.levels - 1, 0, -1):  # Highest first, so timers can fall through several levels
+            if current % (1 << (self._bits * level)):
+                continue
+            bucket = self._wheels[level][(current >> (self._bits * level)) & self._mask]
+            if bucket:
+                pending = dict(bucket)
+                self._counts[level] -= len(bucket)
+                bucket.clear()
+                self._replace(pending)
+
+    def _replace(self, pending: dict):
+        """Place timers taken out of a bucket again, relative to the current tick."""
+        for key, deadline in pending.items():
+            del self._where[key]
+            self._place(key, deadline)
+
+    def _place(self, key, deadline: int):
+        """Put a timer in the bucket of its deadline tick."""
+        delta = deadline - self._current
+        for level in range(self.levels):
+            if delta < 1 << (self._bits * (level + 1)):
+                bucket = self._wheels[level][(deadline >> (self._bits * level)) & self._mask]
+                self._counts[level] += 1
+                break
+        else:
+            bucket, level = self._overflow, None
+        bucket[key] = deadline
+        self._where[key] = (bucket, level)
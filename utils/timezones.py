@@ -0,0 +1,189 @@
+"""
+Time zone support built on zoneinfo.
+
+Conversions for whole searches go through per-zone UTC offset tables: for every UTC day the table
+lists the UTC minutes where the zone's offset changes, so converting a day mask or a slot is a
+table lookup and a shift instead of a zoneinfo call per slot. Tables are cached per zone and day.
+"""
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from utils.utils import SLOT_MINUTES, SLOTS_PER_DAY
+
+OFFSET_CACHE_SIZE = 65536  # (zone, UTC day) offset tables kept, about 180 years of days for one zone
+
+_DAY_MINUTES = 24 * 60
+_FULL_DAY = (1 << SLOTS_PER_DAY) - 1
+
+
+@lru_cache(maxsize=None)
+def get_zone(name: str) -> ZoneInfo:
+    """
+    Look up an IANA time zone such as 'Europe/Berlin'.
+
+    Raises:
+        ValueError: If the zone does not exist.
+    """
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown time zone: {name}.") from None
+
+
+@lru_cache(maxsize=OFFSET_CACHE_SIZE)
+def utc_day_offsets(zone_name: str, utc_ordinal: int) -> tuple:
+    """
+    Get the UTC offsets of a zone during one UTC day.
+
+    Args:
+        zone_name (str): The IANA zone name.
+        utc_ordinal (int): The UTC date as a proleptic Gregorian ordinal.
+
+    Returns:
+        tuple: (start_minute, end_minute, offset_minutes) segments covering the UTC day, where
+            local time = UTC + offset. Days without a transition have a single segment.
+
+    Raises:
+        ValueError: If an offset is not a whole number of booking slots.
+    """
+    zone = get_zone(zone_name)
+    day = date.fromordinal(utc_ordinal)
+    midnight = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+
+    def offset_at(minute):
+        offset = (midnight + timedelta(minutes=minute)).astimezone(zone).utcoffset()
+        minutes, seconds = divmod(int(offset.total_seconds()), 60)
+        if seconds or minutes % SLOT_MINUTES:
+            raise ValueError(f"{zone_name} is {offset} from UTC on {day}, not a multiple of {SLOT_MINUTES} minutes.")
+        return minutes
+
+    segments = []
+    start, offset = 0, offset_at(0)
+    while start < _DAY_MINUTES:
+        if offset_at(_DAY_MINUTES - 1) == offset:
+            segments.append((start, _DAY_MINUTES, offset))
+            break
+        # Binary search the first minute with a different offset
+        low, high = start, _DAY_MINUTES - 1
+        while low < high:
+            middle = (low + high) // 2
+            if offset_at(middle) == offset:
+                low = middle + 1
+            else:
+                high = middle
+        segments.append((start, low, offset))
+        start, offset = low, offset_at(low)
+    return tuple(segments)
+
+
+def to_utc_masks(masks, start_date: date, zone_name: str):
+    """
+    Re-slice consecutive local day masks into UTC day masks.
+
+    Args:
+        masks (list): Day masks of the local dates start_date, start_date + 1, ...
+        start_date (datetime.date): The local date of masks[0].
+        zone_name (str): The zone the masks are in.
+
+    Returns:
+        tuple: (first UTC date, masks) for the UTC days from start_date - 1 to the day after the
+            last local date, so slots pushed across midnight by the offset are kept.
+    """
+    pad = 2 * SLOTS_PER_DAY  # Room for offsets of up to a day in either direction
+    timeline = 0
+    for index, mask in enumerate(masks):
+        timeline |= mask << (pad + index * SLOTS_PER_DAY)
+
+    first = start_date.toordinal() - 1
+    utc_masks = []
+    for day in range(len(masks) + 2):
+        utc_mask = 0
+        for start, end, offset in utc_day_offsets(zone_name, first + day):
+            # Local minutes since start_date's midnight at the segment's start
+            local = (day - 1) * _DAY_MINUTES + start + offset
+            bits = (timeline >> (pad + local // SLOT_MINUTES)) & ((1 << ((end - start) // SLOT_MINUTES)) - 1)
+            utc_mask |= bits << (start // SLOT_MINUTES)
+        utc_masks.append(utc_mask & _FULL_DAY)
+    return date.fromordinal(first), utc_masks
+
+
+def from_utc_masks(utc_masks, first_utc_date: date, zone_name: str, start_date: date, days: int):
+    """
+    Re-slice consecutive UTC day masks into a zone's local day masks.
+
+    Args:
+        utc_masks (list): Day masks of the UTC dates first_utc_date, first_utc_date + 1, ...
+        first_utc_date (datetime.date): The UTC date of utc_masks[0].
+        zone_name (str): The zone to convert to.
+        start_date (datetime.date): The first local date to return.
+        days (int): Number of local dates to return.
+
+    Returns:
+        list: Day masks of the local dates start_date .. start_date + days - 1. Local slots skipped by
+            a forward transition stay clear; slots repeated by a backward one get both UTC slots.
+    """
+    pad = 2 * SLOTS_PER_DAY
+    timeline = 0
+    for index, mask in enumerate(utc_masks):
+        if not mask:
+            continue
+        utc_ordinal = first_utc_date.toordinal() + index
+        for start, end, offset in utc_day_offsets(zone_name, utc_ordinal):
+            bits = (mask >> (start // SLOT_MINUTES)) & ((1 << ((end - start) // SLOT_MINUTES)) - 1)
+            # Slot position on the local timeline, whose slot 0 is pad slots before start_date's midnight
+            local = (utc_ordinal - start_date.toordinal()) * _DAY_MINUTES + start + offset
+            position = pad + local // SLOT_MINUTES
+            timeline |= bits << position if position >= 0 else bits >> -position
+    return [(timeline >> (pad + day * SLOTS_PER_DAY)) & _FULL_DAY for day in range(days)]
+
+
+def utc_to_local(zone_name: str, utc_ordinal: int, minute: int):
+    """
+    Convert a UTC date and minute to a zone's local date and minute.
+
+    Returns:
+        tuple: (local ordinal, local minutes since midnight).
+    """
+    for start, end, offset in utc_day_offsets(zone_name, utc_ordinal):
+        if start <= minute < end:
+            break
+    ordinal, local = divmod(utc_ordinal * _DAY_MINUTES + minute + offset, _DAY_MINUTES)
+    return ordinal, local
+
+
+def local_to_utc(zone_name: str, local_ordinal: int, minute: int):
+    """
+    Convert a zone's local date and minute to UTC. Ambiguous times use the earlier offset.
+
+    Returns:
+        tuple: (UTC ordinal, UTC minutes since midnight).
+    """
+    local = local_ordinal * _DAY_MINUTES + minute
+    for utc_ordinal in (local_ordinal - 1, local_ordinal, local_ordinal + 1):
+        for start, end, offset in utc_day_offsets(zone_name, utc_ordinal):
+            utc = local - offset - utc_ordinal * _DAY_MINUTES
+            if start <= utc < end:
+                return utc_ordinal, utc
+    # A local time skipped by a forward transition: read it with the offset in force before the gap
+    offset = utc_day_offsets(zone_name, local_ordinal)[0][2]
+    return divmod(local - offset, _DAY_MINUTES)
+
+
+def convert(from_zone: str, to_zone: str, ordinal: int, minute: int):
+    """
+    Convert a local date and minute between two zones.
+
+    Returns:
+        tuple: (ordinal, minutes since midnight) in to_zone.
+    """
+    if from_zone == to_zone:
+        return ordinal, minute
+    return utc_to_local(to_zone, *local_to_utc(from_zone, ordinal, minute))
+
+
+def today_in(zone_name: str = None) -> date:
+    """Return today's date in a zone, or in the server's local time if zone_name is None."""
+    if zone_name is None:
+        return date.today()
+    return datetime.now(get_zone(zone_name)).date()
@@ -1,22 +1,149 @@
-from datetime import datetime
+from contextlib import contextmanager
+from datetime import date
+from functools import lru_cache
+import gc
+import threading
 import uuid
 
+SLOT_MINUTES = 15  # Booking granularity: appointments start and end on quarter hours
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES  # Number of booking slots (bits in a day mask) per day
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")  # Indexed by date.weekday()
+
+TIME_CACHE_SIZE = 1024  # Distinct time strings whose parsed value is kept by convert_to_minutes
+
+_ZERO = ord("0")
+_gc_pause_lock = threading.Lock()  # Guards the two counters below
+_gc_pauses = 0  # Number of gc_paused blocks currently running, across threads
+_gc_was_enabled = False  # Whether the collector was enabled when the first of them started
+
+
 def convert_to_24_hour(time_str: str) -> int:
     """Convert time from 12-hour format (AM/PM) or 24-hour format to 24-hour format."""
     try:
-        # Check if time is in 12-hour format with AM/PM (e.g., 9 AM or 4 PM)
-        if 'AM' in time_str or 'PM' in time_str:
-            time_obj = datetime.strptime(time_str, '%I %p')  # %I for 12-hour format with AM/PM
-            return time_obj.hour  # Return the hour in 24-hour format
-        else:
-            # For 24-hour format, it's just a number representing the hour (e.g., 14, 9)
-            time_obj = datetime.strptime(time_str, '%H')  # %H for 24-hour format (no minutes)
-            return time_obj.hour  # Return the hour in 24-hour format
+        if ":" in time_str:
+            raise ValueError  # Whole hours only; use convert_to_minutes for times with minutes
+        minutes = convert_to_minutes(time_str)
+        if minutes >= 24 * 60:
+            raise ValueError  # 24 is only valid as the end of a day in minutes
+        return minutes // 60  # Return the hour in 24-hour format
     except ValueError:
-        raise ValueError(f"Invalid time format: {time_str}. Expected format 'HH AM/PM' or 'HH'.")
+        raise ValueError(f"Invalid time format: {time_str}. Expected format 'HH AM/PM' or 'HH'.") from None
+
+
+@lru_cache(maxsize=TIME_CACHE_SIZE)
+def convert_to_minutes(time_str: str) -> int:
+    """
+    Convert a time such as '9 AM', '9:30 PM', '14' or '14:30' to minutes since midnight.
+
+    Results are kept in a bounded LRU cache, so repeated times cost a single dictionary lookup.
+    """
+    try:
+        return _parse_time(time_str)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid time format: {time_str}. {e}") from None
+
+
+def _parse_time(time_str: str) -> int:
+    """Parse 'H[H][:MM]' with an optional AM/PM suffix by scanning the characters once, without regexes."""
+    length = len(time_str)
+    i = 0
+    while i < length and time_str[i].isspace():
+        i += 1
+
+    # One or two hour digits
+    hour = digits = 0
+    while i < length and "0" <= time_str[i] <= "9" and digits < 2:
+        hour = hour * 10 + ord(time_str[i]) - _ZERO
+        i += 1
+        digits += 1
+    if not digits:
+        raise ValueError("Expected format 'HH[:MM] AM/PM' or 'HH[:MM]'.")
+
+    # Optional ':MM', exactly two minute digits
+    minute = 0
+    if i < length and time_str[i] == ":":
+        if i + 2 >= length or not ("0" <= time_str[i + 1] <= "9" and "0" <= time_str[i + 2] <= "9"):
+            raise ValueError("Expected format 'HH[:MM] AM/PM' or 'HH[:MM]'.")
+        minute = (ord(time_str[i + 1]) - _ZERO) * 10 + ord(time_str[i + 2]) - _ZERO
+        i += 3
+
+    while i < length and time_str[i].isspace():
+        i += 1
+
+    # Optional AM/PM, then nothing but trailing whitespace
+    meridiem = None
+    if i + 1 < length and time_str[i + 1] in "Mm" and time_str[i] in "AaPp":
+        meridiem = time_str[i] in "Pp"
+        i += 2
+        while i < length and time_str[i].isspace():
+            i += 1
+    if i != length:
+        raise ValueError("Expected format 'HH[:MM] AM/PM' or 'HH[:MM]'.")
+
+    if meridiem is not None:
+        # 12-hour clock: 12 AM is midnight and 12 PM is noon
+        if not 1 <= hour <= 12:
+            raise ValueError("Hour must be between 1 and 12.")
+        hour = hour % 12 + (12 if meridiem else 0)
+    elif hour > 24 or (hour == 24 and minute):
+        raise ValueError("Hour must be between 0 and 24.")
+
+    if minute > 59:
+        raise ValueError("Minutes must be between 0 and 59.")
+    return hour * 60 + minute
+
+
+def format_minutes(minutes: int) -> str:
+    """Format minutes since midnight as H:MM (e.g. 570 -> '9:30')."""
+    return f"{minutes // 60}:{minutes % 60:02d}"
+
+
+def slot_range_mask(start_minutes: int, end_minutes: int) -> int:
+    """Return a day mask with one bit set per slot touched by [start_minutes, end_minutes)."""
+    first = start_minutes // SLOT_MINUTES
+    last = -(-end_minutes // SLOT_MINUTES)  # Round the end up so partially covered slots count
+    return ((1 << (last - first)) - 1) << first if last > first else 0
+
+
+@lru_cache(maxsize=4096)
+def iso_to_ordinal(date_str: str) -> int:
+    """Convert a YYYY-MM-DD date to its proleptic Gregorian ordinal (cached)."""
+    return date.fromisoformat(date_str).toordinal()
+
+
+@lru_cache(maxsize=4096)
+def ordinal_to_iso(ordinal: int) -> str:
+    """Convert a proleptic Gregorian ordinal to a YYYY-MM-DD date (cached, so equal dates share one string)."""
+    return date.fromordinal(ordinal).isoformat()
+
+
+@contextmanager
+def gc_paused():
+    """
+    Pause the cyclic garbage collector for the duration of a bulk operation.
+
+    Bulk loads allocate many long-lived, acyclic objects, and the collector would otherwise scan the
+    growing heap over and over. Reference counting still frees memory as usual.
+
+    The collector is process-wide, so overlapping pauses from several threads are counted: it is
+    re-enabled only when the last one ends, and only if it was enabled before the first began.
+    """
+    global _gc_pauses, _gc_was_enabled
+    with _gc_pause_lock:
+        if not _gc_pauses:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pauses += 1
+    try:
+        yield
+    finally:
+        with _gc_pause_lock:
+            _gc_pauses -= 1
+            if not _gc_pauses and _gc_was_enabled:
+                gc.enable()
 
 
 def generate_uuid():
   """Randomly generated hex string"""
   uuid_str = str(uuid.uuid4())
-  return uuid_str
\ No newline at end of file
+  return uuid_str